@@ -0,0 +1,166 @@
+﻿"""
+Benchmark du calculateur de charge de travail
+
+Compare les méthodes vectorisées de WorkloadCalculator (clés factorisées une
+fois, sommes par bincount) à l'implémentation de référence en Python pur
+(une boucle sur les entrées par regroupement) sur des entrées synthétiques,
+appelées sur une liste d'entrées puis sur la table colonnaire équivalente
+(telle que la fournit WorkloadRepository.get_workload_table).
+
+Avant de mesurer, le script vérifie que les deux implémentations produisent
+les mêmes dictionnaires.
+
+Usage : python -m benchmarks.bench_calculator --entries 100000
+"""
+
+import argparse
+import math
+import random
+import statistics
+import time
+
+from benchmarks.workbook_factory import PROFILES
+from src.core.calculator import WorkloadCalculator
+from src.data.data_models import WorkloadEntry
+from src.data.workload_table import WorkloadTable
+
+
+def generate_entries(count: int, seed: int = 42):
+    """
+    Génère des entrées de charge de travail aléatoires
+    """
+    rng = random.Random(seed)
+    managers = [f"Chef de projet {i}" for i in range(1, 41)]
+    projects = [f"Projet {i}" for i in range(1, 1001)]
+    return [
+        WorkloadEntry(
+            project_manager=rng.choice(managers),
+            project=rng.choice(projects),
+            profile=rng.choice(PROFILES),
+            jira_ticket=f"PRJ-{i}" if rng.random() < 0.7 else None,
+            workload=rng.randint(0, 80) / 2,
+        )
+        for i in range(count)
+    ]
+
+
+def reference_statistics(entries):
+    """
+    Implémentation historique de calculate_workload_statistics
+    """
+    workload_by_project = {}
+    for entry in entries:
+        if entry.project not in workload_by_project:
+            workload_by_project[entry.project] = 0
+        workload_by_project[entry.project] += entry.workload
+
+    workload_by_project_manager = {}
+    for entry in entries:
+        if entry.project_manager not in workload_by_project_manager:
+            workload_by_project_manager[entry.project_manager] = 0
+        workload_by_project_manager[entry.project_manager] += entry.workload
+
+    workloads = [entry.workload for entry in entries]
+    return {
+        "total_workload": sum(entry.workload for entry in entries),
+        "average_workload": sum(workloads) / len(workloads),
+        "median_workload": statistics.median(workloads),
+        "min_workload": min(workloads),
+        "max_workload": max(workloads),
+        "workload_by_project": workload_by_project,
+        "workload_by_project_manager": workload_by_project_manager,
+    }
+
+
+def reference_distribution(entries):
+    """
+    Implémentation historique de analyze_workload_distribution
+    """
+    distributions = []
+    for attribute in ("profile", "project", "project_manager"):
+        distribution = {}
+        for entry in entries:
+            key = getattr(entry, attribute)
+            if key not in distribution:
+                distribution[key] = 0
+            distribution[key] += entry.workload
+        distributions.append(distribution)
+
+    return {
+        "total_workload": sum(entry.workload for entry in entries),
+        "profile_distribution": distributions[0],
+        "project_distribution": distributions[1],
+        "project_manager_distribution": distributions[2],
+    }
+
+
+def assert_same(actual, expected, name: str):
+    """
+    Compare deux résultats (dictionnaires imbriqués de nombres)
+    """
+    assert actual.keys() == expected.keys(), f"{name} : clés divergentes"
+    for key, value in expected.items():
+        if isinstance(value, dict):
+            assert list(actual[key]) == list(value), f"{name} : ordre de {key}"
+            assert all(
+                math.isclose(actual[key][k], v, rel_tol=1e-9) for k, v in value.items()
+            ), f"{name} : valeurs de {key}"
+        else:
+            assert math.isclose(actual[key], value, rel_tol=1e-9), f"{name} : {key}"
+
+
+def best_time(function, entries, repeat: int) -> float:
+    """
+    Meilleure durée d'exécution sur plusieurs essais
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(entries)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    entries = generate_entries(args.entries)
+    table = WorkloadTable.from_entries(entries)
+
+    cases = [
+        (
+            "statistiques",
+            reference_statistics,
+            WorkloadCalculator.calculate_workload_statistics,
+        ),
+        (
+            "distribution",
+            reference_distribution,
+            WorkloadCalculator.analyze_workload_distribution,
+        ),
+    ]
+
+    print(f"{args.entries} entrées")
+    print(
+        f"{'calcul':<16}{'référence (s)':>15}{'entrées (s)':>13}{'gain':>8}"
+        f"{'table (s)':>12}{'gain':>9}"
+    )
+    for name, reference, vectorized in cases:
+        expected = reference(entries)
+        assert_same(vectorized(entries), expected, name)
+        assert_same(vectorized(table), expected, name)
+        reference_time = best_time(reference, entries, args.repeat)
+        entries_time = best_time(vectorized, entries, args.repeat)
+        table_time = best_time(vectorized, table, args.repeat)
+        print(
+            f"{name:<16}{reference_time:>15.3f}{entries_time:>13.3f}"
+            f"{'x%.1f' % (reference_time / entries_time):>8}"
+            f"{table_time:>12.4f}{'x%.0f' % (reference_time / table_time):>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+﻿"""
+Benchmark des modes de lecture d'ExcelReader
+
+Compare le lecteur historique (classeur complet, accès cellule par cellule)
+au mode en flux (lecture seule, iter_rows projeté), au lecteur XML natif et
+au rechargement depuis le cache disque : durée et pic mémoire du chargement,
+de l'extraction des profils et de la lecture des entrées.
+
+Les modes doivent produire les mêmes entrées ; la conformité détaillée du
+lecteur natif au chemin openpyxl est vérifiée par
+tests/test_native_excel_reader.py.
+
+Usage : python -m benchmarks.bench_excel_reader --rows 1830
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.workbook_factory import (
+    generate_gantt_workbook,
+    convert_to_shared_strings,
+)
+from src.data.data_models import AnalysisConfiguration
+from src.data.excel_reader import ExcelReader
+from src.data.native_excel_reader import NativeExcelReader
+from src.data.workbook_cache import WorkbookCache
+
+
+def read_all(
+    file_path: str,
+    config: AnalysisConfiguration,
+    reader_class=ExcelReader,
+    **reader_options,
+):
+    """
+    Charge le classeur puis lit profils et entrées, comme l'interface
+    """
+    reader = reader_class(file_path, **reader_options)
+    reader.extract_unique_profiles(config)
+    entries = reader.read_workload_entries(config)
+    reader.close()
+    return entries
+
+
+def run_reader(file_path: str, config: AnalysisConfiguration, **options):
+    """
+    Mesure la durée (sans instrumentation) puis le pic mémoire (tracemalloc)
+
+    :return: Tuple (durée en secondes, pic mémoire en octets, entrées lues)
+    """
+    gc.collect()
+    start = time.perf_counter()
+    entries = read_all(file_path, config, **options)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    read_all(file_path, config, **options)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1830)
+    parser.add_argument("--last-column", default="Z")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = convert_to_shared_strings(
+            generate_gantt_workbook(
+                os.path.join(tmp_dir, "gantt.xlsx"),
+                rows=args.rows,
+                last_column=args.last_column,
+            ),
+            os.path.join(tmp_dir, "gantt_shared.xlsx"),
+        )
+        config = AnalysisConfiguration(
+            end_column=args.last_column, end_row=args.rows + 2
+        )
+
+        cache = WorkbookCache(os.path.join(tmp_dir, "cache"))
+        read_all(file_path, config, cache=cache)  # Remplissage du cache
+
+        modes = [
+            ("complet", {}),
+            ("flux", {"read_only": True}),
+            ("natif", {"reader_class": NativeExcelReader}),
+            ("cache", {"cache": cache}),
+        ]
+        results = [
+            (name, run_reader(file_path, config, **opts)) for name, opts in modes
+        ]
+
+    base_time, base_peak, base_entries = results[0][1]
+    for name, (_, _, entries) in results:
+        assert entries == base_entries, f"Le mode {name} diverge"
+
+    print(f"{len(base_entries)} entrées, {args.rows} lignes x {args.last_column}")
+    print(f"{'mode':<12}{'durée (s)':>12}{'pic mémoire (Mo)':>20}{'gain':>10}")
+    for name, (elapsed, peak, _) in results:
+        print(
+            f"{name:<12}{elapsed:>12.3f}{peak / 2**20:>20.1f}"
+            f"{'x%.1f' % (base_time / elapsed):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
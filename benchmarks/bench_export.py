@@ -0,0 +1,135 @@
+﻿"""
+Benchmark de l'export PDF d'ExportService
+
+Compare l'implémentation historique (un tableau et un TableStyle par
+projet, largeurs de colonnes mesurées cellule par cellule) à l'export
+actuel (longs tableaux par chef de projet, style et largeurs partagés), en
+rendu séquentiel puis réparti sur plusieurs processus, sur des résultats
+d'analyse construits à partir d'entrées synthétiques.
+
+Usage : python -m benchmarks.bench_export --entries 20000 --workers 4
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+
+from benchmarks.bench_calculator import generate_entries
+from src.data.repository import WorkloadRepository
+from src.data.workload_table import WorkloadTable
+from src.services.export_service import ExportService
+
+
+def reference_pdf(file_path: str, summary):
+    """
+    Implémentation historique d'export_pdf
+    """
+    styles = getSampleStyleSheet()
+    doc = SimpleDocTemplate(file_path, pagesize=A4)
+    elements = [Paragraph("Analyse de Charge de Travail", styles["Heading1"])]
+    elements.append(Spacer(1, 12))
+    elements.append(Paragraph("Résultats Globaux par Profil", styles["Heading2"]))
+    for profile in summary.profiles_workload:
+        elements.append(
+            Paragraph(
+                f"Profil: {profile.profile} - Charge totale: "
+                f"{profile.total_workload:.2f} heures",
+                styles["Normal"],
+            )
+        )
+    elements.append(Spacer(1, 12))
+    elements.append(
+        Paragraph("Résultats Détaillés par Chef de Projet", styles["Heading2"])
+    )
+
+    for pm, projects in summary.detailed_workload.items():
+        elements.append(Paragraph(f"Chef de projet: {pm}", styles["Heading2"]))
+        project_totals = summary.project_totals[pm]
+        for project, entries in projects.items():
+            elements.append(
+                Paragraph(
+                    f"Projet: {project} - Total: {project_totals[project]:.2f} heures",
+                    styles["Normal"],
+                )
+            )
+            table_data = [["Profil", "Charge (heures)", "Ticket JIRA"]]
+            for entry in entries:
+                table_data.append(
+                    [
+                        entry.profile,
+                        f"{entry.workload:.2f}",
+                        entry.jira_ticket or "N/A",
+                    ]
+                )
+            table = Table(table_data)
+            table.setStyle(
+                TableStyle(
+                    [
+                        ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+                        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+                        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                        ("FONTSIZE", (0, 0), (-1, 0), 12),
+                        ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+                        ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+                        ("GRID", (0, 0), (-1, -1), 1, colors.black),
+                    ]
+                )
+            )
+            elements.append(table)
+            elements.append(Spacer(1, 12))
+
+    doc.build(elements)
+
+
+def timed(function, *args, **kwargs) -> float:
+    """
+    Durée d'exécution d'un appel
+    """
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    entries = generate_entries(args.entries)
+    summary = WorkloadRepository.build_summary(WorkloadTable.from_entries(entries))
+    service = ExportService()
+
+    print(f"{args.entries} entrées, {len(summary.detailed_workload)} chefs de projet")
+    print(f"{'export':<28}{'durée (s)':>11}{'taille (Kio)':>14}{'gain':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        cases = [
+            ("référence", reference_pdf, {}),
+            ("séquentiel", service.export_pdf, {}),
+            (
+                f"{args.workers} processus",
+                service.export_pdf,
+                {"workers": args.workers},
+            ),
+        ]
+        reference_time = None
+        for index, (name, function, options) in enumerate(cases):
+            file_path = os.path.join(directory, f"export{index}.pdf")
+            duration = timed(function, file_path, summary, **options)
+            reference_time = reference_time or duration
+            print(
+                f"{name:<28}{duration:>11.2f}"
+                f"{os.path.getsize(file_path) / 1024:>14.0f}"
+                f"{'x%.1f' % (reference_time / duration):>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
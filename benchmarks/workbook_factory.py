@@ -0,0 +1,137 @@
+﻿"""
+Génération de classeurs Gantt synthétiques pour les benchmarks
+
+Les classeurs reproduisent la structure attendue par l'application :
+chef de projet en colonne B, projet en D, profil en E, ticket JIRA en F
+et une colonne d'heures par semaine à partir de G.
+"""
+
+import random
+import re
+import zipfile
+from typing import Dict, Optional
+
+import openpyxl
+
+PROFILES = [
+    "Intégrateur",
+    "Designer",
+    "PMO",
+    "Web Backend",
+    "Mobile Cross",
+    "Mobile Android",
+    "Mobile iOS",
+    "Web front",
+    "DevOps",
+    "CTO",
+]
+
+FIRST_WEEK_COLUMN = 7  # Colonne G
+
+
+def generate_gantt_workbook(
+    file_path: str,
+    rows: int = 1830,
+    last_column: str = "Z",
+    project_managers: int = 12,
+    projects: int = 150,
+    seed: Optional[int] = 42,
+    empty_ratio: float = 0.4,
+) -> str:
+    """
+    Écrit un classeur Gantt synthétique
+
+    :param file_path: Chemin du fichier à créer
+    :param rows: Nombre de lignes de données (à partir de la ligne 3)
+    :param last_column: Dernière colonne de semaines
+    :param project_managers: Nombre de chefs de projet distincts
+    :param projects: Nombre de projets distincts
+    :param seed: Graine du générateur aléatoire
+    :param empty_ratio: Proportion de cellules d'heures laissées vides
+    :return: Chemin du fichier créé
+    """
+    rng = random.Random(seed)
+    last_col_idx = openpyxl.utils.column_index_from_string(last_column)
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Gantt"
+
+    ws.cell(row=1, column=1, value="Planning de charge")
+    headers = ["ID", "Chef de projet", "Client", "Projet", "Profil", "JIRA"]
+    for col_idx, header in enumerate(headers, start=1):
+        ws.cell(row=2, column=col_idx, value=header)
+    for col_idx in range(FIRST_WEEK_COLUMN, last_col_idx + 1):
+        ws.cell(row=2, column=col_idx, value=f"S{col_idx - FIRST_WEEK_COLUMN + 1}")
+
+    for offset in range(rows):
+        row = offset + 3
+        project_idx = rng.randrange(projects)
+        ws.cell(row=row, column=1, value=f"T{offset + 1}")
+        ws.cell(
+            row=row,
+            column=2,
+            value=f"Chef de projet {project_idx % project_managers + 1}",
+        )
+        ws.cell(row=row, column=3, value=f"Client {project_idx % 40 + 1}")
+        ws.cell(row=row, column=4, value=f"Projet {project_idx + 1}")
+        ws.cell(row=row, column=5, value=rng.choice(PROFILES))
+        if rng.random() < 0.7:
+            ws.cell(row=row, column=6, value=f"PRJ-{rng.randrange(1, 20000)}")
+        for col_idx in range(FIRST_WEEK_COLUMN, last_col_idx + 1):
+            if rng.random() >= empty_ratio:
+                ws.cell(row=row, column=col_idx, value=rng.choice([1, 2, 3.5, 4, 7]))
+
+    wb.save(file_path)
+    return file_path
+
+
+def convert_to_shared_strings(source_path: str, target_path: str) -> str:
+    """
+    Réécrit un classeur openpyxl (chaînes en ligne) avec une table de chaînes
+    partagées, comme les fichiers produits par Excel
+
+    :param source_path: Classeur d'origine
+    :param target_path: Classeur à créer
+    :return: Chemin du fichier créé
+    """
+    inline_cell = re.compile(
+        r'<c r="([A-Z]+[0-9]+)"((?: s="[0-9]+")?) t="inlineStr"><is><t>(.*?)</t></is></c>'
+    )
+    strings: Dict[str, int] = {}
+
+    def to_shared(match):
+        index = strings.setdefault(match.group(3), len(strings))
+        return f'<c r="{match.group(1)}"{match.group(2)} t="s"><v>{index}</v></c>'
+
+    with zipfile.ZipFile(source_path) as source, zipfile.ZipFile(
+        target_path, "w", zipfile.ZIP_DEFLATED
+    ) as target:
+        for item in source.infolist():
+            data = source.read(item.filename)
+            if item.filename.startswith("xl/worksheets/sheet"):
+                data = inline_cell.sub(to_shared, data.decode("utf-8")).encode("utf-8")
+            elif item.filename == "[Content_Types].xml":
+                data = data.replace(
+                    b"</Types>",
+                    b'<Override PartName="/xl/sharedStrings.xml" ContentType="'
+                    b"application/vnd.openxmlformats-officedocument."
+                    b'spreadsheetml.sharedStrings+xml"/></Types>',
+                )
+            elif item.filename == "xl/_rels/workbook.xml.rels":
+                data = data.replace(
+                    b"</Relationships>",
+                    b'<Relationship Id="rIdShared" Type="http://schemas.'
+                    b"openxmlformats.org/officeDocument/2006/relationships/"
+                    b'sharedStrings" Target="sharedStrings.xml"/></Relationships>',
+                )
+            target.writestr(item, data)
+
+        shared = "".join(f"<si><t>{text}</t></si>" for text in strings)
+        target.writestr(
+            "xl/sharedStrings.xml",
+            '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+            f' count="{len(strings)}" uniqueCount="{len(strings)}">{shared}</sst>',
+        )
+
+    return target_path
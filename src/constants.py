@@ -5,7 +5,14 @@ DEFAULT_START_COLUMN = "A"
 DEFAULT_END_COLUMN = "Z"
 DEFAULT_PROFILE_COLUMN = "E"
 DEFAULT_START_ROW = 3
-DEFAULT_END_ROW = 1831
+DEFAULT_END_ROW = None  # Détection automatique de la dernière ligne
+
+# Parsed Workbook Cache
+CACHE_DIR = "~/.cache/analyseur-charge"
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Snapshot History
+SNAPSHOT_DB_PATH = "~/.local/share/analyseur-charge/snapshots.sqlite3"
 
 # Export Options
 EXPORT_FORMATS = [
@@ -19,6 +26,9 @@ EXPORT_FORMATS = [
 APP_TITLE = "Analyseur de Charge de Travail par Profil"
 DEFAULT_WINDOW_SIZE = "800x600"
 
+# Background Analysis
+JOB_POLL_INTERVAL_MS = 100  # Intervalle de relève des messages du thread d'analyse
+
 # Logging Configuration
 LOG_FILE = "workload_analyzer.log"
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
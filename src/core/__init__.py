@@ -1,3 +1,8 @@
 ﻿from .analyzer import WorkloadAnalyzer
 from .calculator import WorkloadCalculator
 from .extractor import WorkloadExtractor
+from .batch_analyzer import BatchWorkloadAnalyzer, analyze_many
+from .cube import WorkloadCube
+from .forecasting import SeriesForecast, smooth_series
+from .statistics_accumulator import WorkloadStatisticsAccumulator
+from .capacity import CapacityReport, OverloadCell, detect_overloads
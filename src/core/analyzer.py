@@ -1,6 +1,18 @@
-﻿from typing import List, Dict, Any
+﻿from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from openpyxl.utils import column_index_from_string
+from src.core.calculator import WorkloadCalculator
+from src.core.capacity import CapacityReport, detect_overloads
+from src.core.cube import WorkloadCube
 from src.data.repository import WorkloadRepository
-from src.data.data_models import AnalysisConfiguration, ProfileWorkload, WorkloadEntry
+from src.data.data_models import (
+    AnalysisConfiguration,
+    CapacityModel,
+    ProfileWorkload,
+    WorkloadEntry,
+    WorkloadSummary,
+)
+from src.data.workload_table import WorkloadTable
 
 
 class WorkloadAnalyzer:
@@ -11,6 +23,9 @@ class WorkloadAnalyzer:
         :param repository: Dépôt de données de charge de travail
         """
         self.repository = repository
+        # Cube du classeur chargé et table hebdomadaire d'origine
+        self._cube: Optional[WorkloadCube] = None
+        self._cube_table: Optional[WorkloadTable] = None
 
     def analyze_global_workload(
         self, config: AnalysisConfiguration
@@ -34,6 +49,17 @@ class WorkloadAnalyzer:
         """
         return self.repository.get_detailed_workload_by_project_manager(config)
 
+    def analyze_workload_summary(
+        self, config: AnalysisConfiguration
+    ) -> WorkloadSummary:
+        """
+        Analyse en un seul passage les charges globales et détaillées
+
+        :param config: Configuration pour l'analyse
+        :return: Résultats d'analyse complets, sous-totaux compris
+        """
+        return self.repository.get_workload_summary(config)
+
     def filter_workload_by_profiles(
         self, config: AnalysisConfiguration, selected_profiles: List[str]
     ) -> List[ProfileWorkload]:
@@ -56,3 +82,172 @@ class WorkloadAnalyzer:
         """
         profiles_workload = self.analyze_global_workload(config)
         return sum(profile.total_workload for profile in profiles_workload)
+
+    def rewindow(self, config: AnalysisConfiguration) -> WorkloadSummary:
+        """
+        Analyse la charge sur la plage de colonnes de la configuration à partir
+        des sommes cumulées de la table hebdomadaire, sans relire le classeur
+
+        :param config: Configuration pour l'analyse
+        :return: Résultats d'analyse complets, sous-totaux compris
+        """
+        table, start, stop, rows = self._select_window(config)
+        windowed = table.window(start, stop)
+        if rows is not None:
+            windowed = windowed.take(rows)
+
+        return self.repository.build_summary(windowed)
+
+    def get_workload_cube(self, config: AnalysisConfiguration) -> WorkloadCube:
+        """
+        Retourne le cube de charge de travail du classeur chargé, construit
+        une seule fois à partir de la table hebdomadaire complète
+
+        Plage de semaines, profils sélectionnés et seuil de charge ne changent
+        pas le cube : ils s'appliquent à chaque requête (voir _cube_filters).
+
+        :param config: Configuration pour l'analyse
+        :return: Cube profil × chef de projet × projet × semaine
+        """
+        table = self.repository.get_weekly_table(config)
+        # Table comparée par identité : le dépôt renvoie la même table tant
+        # que le classeur et la configuration de lecture sont inchangés
+        if self._cube is None or self._cube_table is not table:
+            self._cube = WorkloadCube(table)
+            self._cube_table = table
+        return self._cube
+
+    def _cube_filters(self, config: AnalysisConfiguration) -> Dict[str, Any]:
+        """
+        Paramètres des requêtes du cube correspondant à la plage de colonnes
+        et aux filtres de la configuration
+        """
+        table = self.repository.get_weekly_table(config)
+        start, stop = self._week_positions(table, config)
+        return {
+            "weeks": slice(start, stop),
+            "where": (
+                {"profile": config.selected_profiles}
+                if config.selected_profiles
+                else None
+            ),
+            "min_workload": config.min_workload,
+        }
+
+    def forecast_workload(
+        self,
+        config: AnalysisConfiguration,
+        weeks_ahead: int = 4,
+        smoothing_factor: float = 0.5,
+        trend_factor: Optional[float] = None,
+        confidence: float = 0.95,
+    ) -> Dict[str, Any]:
+        """
+        Prédit la charge de travail des semaines suivant la plage de la
+        configuration (voir WorkloadCalculator.forecast_weekly_workload)
+
+        :param config: Configuration pour l'analyse
+        :param weeks_ahead: Nombre de semaines à prédire
+        :param smoothing_factor: Facteur de lissage du niveau
+        :param trend_factor: Facteur de lissage de la tendance (None : sans tendance)
+        :param confidence: Niveau de confiance des bandes
+        :return: Prédictions de charge de travail
+        """
+        return WorkloadCalculator.forecast_weekly_workload(
+            self._window_table(config),
+            weeks_ahead=weeks_ahead,
+            smoothing_factor=smoothing_factor,
+            trend_factor=trend_factor,
+            confidence=confidence,
+        )
+
+    def analyze_workload_distribution(
+        self, config: AnalysisConfiguration
+    ) -> Dict[str, Any]:
+        """
+        Analyse la distribution de la charge de travail à partir du cube
+
+        :param config: Configuration pour l'analyse
+        :return: Analyse de distribution
+        """
+        return self.get_workload_cube(config).distribution(**self._cube_filters(config))
+
+    def calculate_workload_statistics(
+        self, config: AnalysisConfiguration
+    ) -> Dict[str, Any]:
+        """
+        Calcule les statistiques de charge de travail à partir du cube
+
+        :param config: Configuration pour l'analyse
+        :return: Dictionnaire de statistiques
+        """
+        return self.get_workload_cube(config).statistics(**self._cube_filters(config))
+
+    def detect_overloads(
+        self,
+        config: AnalysisConfiguration,
+        capacity: CapacityModel,
+        threshold: float = 1.0,
+    ) -> CapacityReport:
+        """
+        Repère les semaines où la demande d'un profil dépasse sa capacité,
+        sur la plage et les filtres de la configuration (voir detect_overloads)
+
+        :param config: Configuration pour l'analyse
+        :param capacity: Modèle de capacité
+        :param threshold: Taux d'utilisation au-delà duquel signaler une surcharge
+        :return: Rapport de capacité
+        """
+        return detect_overloads(self._window_table(config), capacity, threshold)
+
+    def _window_table(self, config: AnalysisConfiguration) -> WorkloadTable:
+        """
+        Table hebdomadaire restreinte à la plage et aux filtres de la
+        configuration
+        """
+        table, start, stop, rows = self._select_window(config)
+        weekly = table.select_weeks(start, stop)
+        if rows is not None:
+            weekly = weekly.take(rows)
+        return weekly
+
+    def _select_window(
+        self, config: AnalysisConfiguration
+    ) -> Tuple[WorkloadTable, int, int, Optional[np.ndarray]]:
+        """
+        Repère, dans la table hebdomadaire, la plage de colonnes de la
+        configuration et les lignes retenues par ses filtres
+
+        Les profils sélectionnés et le seuil de charge sont appliqués par masque.
+
+        :param config: Configuration pour l'analyse
+        :return: Tuple (table hebdomadaire, début et fin de la plage,
+            indices des lignes retenues ou None si toutes le sont)
+        """
+        table = self.repository.get_weekly_table(config)
+        start, stop = self._week_positions(table, config)
+
+        rows = np.ones(len(table), dtype=bool)
+        if config.selected_profiles:
+            rows &= table.mask_for("profile", config.selected_profiles)
+        if config.min_workload is not None:
+            rows &= table.window_totals(start, stop) >= config.min_workload
+        if rows.all():
+            return table, start, stop, None
+        return table, start, stop, np.flatnonzero(rows)
+
+    @staticmethod
+    def _week_positions(
+        table: WorkloadTable, config: AnalysisConfiguration
+    ) -> Tuple[int, int]:
+        """
+        Positions [start, stop) de la plage de colonnes de la configuration
+        dans la table hebdomadaire
+        """
+        first_column = column_index_from_string(table.week_columns[0])
+        start = column_index_from_string(config.start_column) - first_column
+        stop = column_index_from_string(config.end_column) - first_column + 1
+        # Les colonnes au-delà des données ne contiennent aucune heure
+        stop = min(stop, len(table.week_columns))
+        start = min(start, stop)
+        return start, stop
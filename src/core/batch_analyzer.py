@@ -0,0 +1,166 @@
+﻿import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Type
+
+from src.data.excel_reader import ExcelReader
+from src.data.repository import WorkloadRepository
+from src.data.data_models import AnalysisConfiguration, BatchAnalysisResult
+from src.data.workload_table import WorkloadTable
+
+# Résultat d'un classeur : (chemin, table agrégée ou None, message d'erreur)
+_FileOutcome = Tuple[str, Optional[WorkloadTable], Optional[str]]
+
+
+def _analyze_chunk(
+    paths: List[str],
+    config: AnalysisConfiguration,
+    reader_class: Type[ExcelReader],
+    reader_options: Dict[str, Any],
+) -> List[_FileOutcome]:
+    """
+    Analyse un lot de classeurs dans un processus de travail
+
+    Chaque classeur est renvoyé sous forme de table agrégée par clé (chef de
+    projet, projet, profil, ticket) : des tableaux numpy et des listes de
+    catégories, bien plus compacts à transférer que des WorkloadEntry.
+
+    :param paths: Chemins des classeurs du lot
+    :param config: Configuration de lecture
+    :param reader_class: Classe du lecteur Excel
+    :param reader_options: Options passées au lecteur
+    :return: Résultat de chaque classeur, dans l'ordre du lot
+    """
+    outcomes = []
+    for path in paths:
+        try:
+            reader = reader_class(path, **reader_options)
+            try:
+                table = WorkloadRepository(reader).get_workload_table(config)
+            finally:
+                reader.close()
+            outcomes.append((path, table.aggregate(), None))
+        except Exception as e:
+            outcomes.append((path, None, str(e)))
+    return outcomes
+
+
+class BatchWorkloadAnalyzer:
+    """
+    Analyse de plusieurs classeurs répartie sur un pool de processus
+
+    Chaque processus lit et agrège ses classeurs ; le processus principal
+    fusionne les tables reçues puis construit les résultats combinés.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        chunksize: int = 1,
+        reader_class: Type[ExcelReader] = ExcelReader,
+        **reader_options,
+    ):
+        """
+        Initialise l'analyseur multi-classeurs
+
+        :param max_workers: Nombre de processus (nombre de CPU si None ; 1
+            pour tout analyser dans le processus courant)
+        :param chunksize: Nombre de classeurs confiés à chaque tâche
+        :param reader_class: Classe du lecteur Excel utilisée par les processus
+        :param reader_options: Options passées au lecteur (read_only, cache...)
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("Le nombre de processus doit être au moins 1")
+        if chunksize < 1:
+            raise ValueError("La taille des lots doit être au moins 1")
+
+        self.max_workers = max_workers
+        self.chunksize = chunksize
+        self.reader_class = reader_class
+        self.reader_options = reader_options
+
+    def analyze_many(
+        self, paths: List[str], config: AnalysisConfiguration
+    ) -> BatchAnalysisResult:
+        """
+        Analyse plusieurs classeurs avec la même configuration
+
+        Les lignes de même clé (chef de projet, projet, profil, ticket) sont
+        fusionnées, y compris d'un classeur à l'autre. Un classeur illisible
+        n'interrompt pas l'analyse : son erreur est rapportée dans le résultat.
+
+        :param paths: Chemins des classeurs à analyser
+        :param config: Configuration pour l'analyse
+        :return: Résultat combiné
+        """
+        chunks = [
+            paths[i : i + self.chunksize] for i in range(0, len(paths), self.chunksize)
+        ]
+
+        workers = min(self.max_workers or os.cpu_count() or 1, len(chunks))
+        if workers <= 1:
+            outcomes = [
+                _analyze_chunk(chunk, config, self.reader_class, self.reader_options)
+                for chunk in chunks
+            ]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        _analyze_chunk,
+                        chunk,
+                        config,
+                        self.reader_class,
+                        self.reader_options,
+                    )
+                    for chunk in chunks
+                ]
+                outcomes = [future.result() for future in futures]
+
+        return self._merge([outcome for chunk in outcomes for outcome in chunk])
+
+    @staticmethod
+    def _merge(outcomes: List[_FileOutcome]) -> BatchAnalysisResult:
+        """
+        Fusionne les tables agrégées des classeurs en un résultat combiné
+
+        :param outcomes: Résultat de chaque classeur
+        :return: Résultat combiné
+        """
+        result = BatchAnalysisResult()
+        tables = []
+        for path, table, error in outcomes:
+            if table is None:
+                result.errors[path] = error
+                continue
+            tables.append(table)
+            result.workload_by_file[path] = float(table.workload.sum())
+
+        combined = WorkloadTable.concatenate(tables).aggregate()
+        result.profiles_workload = WorkloadRepository.build_profiles_workload(combined)
+        result.detailed_workload = WorkloadRepository.build_detailed_workload(combined)
+        return result
+
+
+def analyze_many(
+    paths: List[str],
+    config: AnalysisConfiguration,
+    max_workers: Optional[int] = None,
+    chunksize: int = 1,
+    reader_class: Type[ExcelReader] = ExcelReader,
+    **reader_options,
+) -> BatchAnalysisResult:
+    """
+    Analyse plusieurs classeurs en parallèle (voir BatchWorkloadAnalyzer)
+
+    :param paths: Chemins des classeurs à analyser
+    :param config: Configuration pour l'analyse
+    :param max_workers: Nombre de processus
+    :param chunksize: Nombre de classeurs confiés à chaque tâche
+    :param reader_class: Classe du lecteur Excel
+    :param reader_options: Options passées au lecteur
+    :return: Résultat combiné
+    """
+    analyzer = BatchWorkloadAnalyzer(
+        max_workers, chunksize, reader_class, **reader_options
+    )
+    return analyzer.analyze_many(paths, config)
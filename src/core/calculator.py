@@ -1,12 +1,142 @@
-﻿from typing import List, Dict, Any, Optional
-import statistics
+﻿from operator import attrgetter
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Union
 
+import numpy as np
+
+from src.core.forecasting import smooth_series
+from src.core.statistics_accumulator import (
+    DEFAULT_BUCKET_WIDTH,
+    WorkloadStatisticsAccumulator,
+)
 from src.data.data_models import WorkloadEntry, ProfileWorkload
+from src.data.workload_table import WorkloadTable, factorize
+
+# Entrées acceptées par les calculs vectorisés : liste ou table colonnaire
+Entries = Union[List[WorkloadEntry], WorkloadTable]
+
+
+class _EntryColumns:
+    """
+    Colonnes d'entrées factorisées une seule fois : codes des dimensions
+    utiles et vecteur des charges
+
+    Pour une liste d'entrées, les résultats gardent le type des charges
+    d'origine, comme les sommes Python : une somme de charges entières reste
+    entière, un minimum est la charge d'une entrée.
+    """
+
+    def __init__(self, entries: Entries, dimensions: Sequence[str]):
+        """
+        :param entries: Liste d'entrées, ou table déjà factorisée
+        :param dimensions: Dimensions à factoriser (pour une liste d'entrées)
+        """
+        if isinstance(entries, WorkloadTable):
+            self.table: Optional[WorkloadTable] = entries
+            self.workloads = entries.workload
+            self.values: Optional[List[float]] = None
+            self.integral = False
+            self.float_rows: Optional[np.ndarray] = None
+            return
+
+        self.table = None
+        self.values = list(map(attrgetter("workload"), entries))
+        self.workloads = np.fromiter(
+            self.values, dtype=np.float64, count=len(self.values)
+        )
+        kinds = set(map(type, self.values))
+        # Toutes les charges sont entières ; lignes à charge décimale lorsque
+        # les deux types se mélangent (None sinon)
+        self.integral = kinds <= {int}
+        self.float_rows = None
+        if not self.integral and not kinds <= {float}:
+            self.float_rows = np.fromiter(
+                (not isinstance(value, int) for value in self.values),
+                dtype=bool,
+                count=len(self.values),
+            )
+        self.columns = {
+            dimension: factorize(list(map(attrgetter(dimension), entries)))
+            for dimension in dimensions
+        }
+
+    def value(self, row: int) -> float:
+        """
+        Charge d'une ligne, dans son type d'origine
+
+        :param row: Position de la ligne
+        :return: Charge de la ligne
+        """
+        if self.values is not None:
+            return self.values[row]
+        return float(self.workloads[row])
+
+    def total(self) -> float:
+        """
+        Charge totale (entière si toutes les charges le sont)
+        """
+        total = float(self.workloads.sum())
+        return int(total) if self.integral else total
+
+    def median(self) -> float:
+        """
+        Médiane des charges, comme statistics.median : charge de l'entrée
+        centrale, ou moyenne des deux charges centrales
+        """
+        if self.float_rows is None:
+            median = float(np.median(self.workloads))
+            if self.integral and len(self.workloads) % 2:
+                return int(median)
+            return median
+
+        order = np.argsort(self.workloads, kind="stable")
+        middle = len(order) // 2
+        if len(order) % 2:
+            return self.value(int(order[middle]))
+        return float(
+            (self.workloads[order[middle - 1]] + self.workloads[order[middle]]) / 2
+        )
+
+    def group_sum(self, dimension: str) -> Dict[str, float]:
+        """
+        Somme les charges par valeur d'une dimension (bincount)
+
+        :param dimension: Nom de la dimension
+        :return: Dictionnaire valeur -> charge, dans l'ordre de première apparition
+        """
+        if self.table is not None:
+            return self.table.group_sum(dimension)
+
+        codes, categories = self.columns[dimension]
+        workloads = self.workloads
+        float_rows = self.float_rows
+        if len(categories) and codes.min() < 0:
+            present = codes >= 0
+            codes, workloads = codes[present], workloads[present]
+            if float_rows is not None:
+                float_rows = float_rows[present]
+        totals = np.bincount(codes, weights=workloads, minlength=len(categories))
+        if float_rows is None:
+            if self.integral:
+                return dict(zip(categories, map(int, totals.tolist())))
+            return dict(zip(categories, totals.tolist()))
+
+        # Types mélangés : seuls les groupes sans charge décimale restent entiers
+        has_float = np.bincount(codes, weights=float_rows, minlength=len(categories))
+        return {
+            category: total if floats else int(total)
+            for category, total, floats in zip(
+                categories, totals.tolist(), has_float.tolist()
+            )
+        }
 
 
 class WorkloadCalculator:
     """
     Calculateur avancé pour l'analyse de charge de travail
+
+    Les entrées sont converties une fois en table colonnaire (clés factorisées
+    en codes entiers) ; sommes par dimension et statistiques sont ensuite
+    calculées par des noyaux NumPy (bincount, median...).
     """
 
     @staticmethod
@@ -31,11 +161,14 @@ class WorkloadCalculator:
         )
 
     @staticmethod
-    def calculate_workload_statistics(entries: List[WorkloadEntry]) -> Dict[str, Any]:
+    def calculate_workload_statistics(entries: Entries) -> Dict[str, Any]:
         """
         Calcule des statistiques détaillées sur la charge de travail
 
-        :param entries: Liste des entrées de charge de travail
+        Toutes les charges sont chargées en mémoire pour la médiane ; pour un
+        long historique, voir calculate_streaming_statistics.
+
+        :param entries: Liste des entrées de charge de travail (ou table)
         :return: Dictionnaire de statistiques
         """
         if not entries:
@@ -49,40 +182,41 @@ class WorkloadCalculator:
                 "workload_by_project_manager": {},
             }
 
-        # Charge de travail totale
-        total_workload = sum(entry.workload for entry in entries)
-
-        # Calculer les charges de travail par projet
-        workload_by_project = {}
-        for entry in entries:
-            if entry.project not in workload_by_project:
-                workload_by_project[entry.project] = 0
-            workload_by_project[entry.project] += entry.workload
-
-        # Calculer les charges de travail par chef de projet
-        workload_by_project_manager = {}
-        for entry in entries:
-            if entry.project_manager not in workload_by_project_manager:
-                workload_by_project_manager[entry.project_manager] = 0
-            workload_by_project_manager[entry.project_manager] += entry.workload
-
-        # Calculs statistiques
-        workloads = [entry.workload for entry in entries]
+        columns = _EntryColumns(entries, ("project", "project_manager"))
+        workloads = columns.workloads
+        total_workload = columns.total()
 
         return {
             "total_workload": total_workload,
-            "average_workload": sum(workloads) / len(workloads) if workloads else 0,
-            "median_workload": statistics.median(workloads) if workloads else 0,
-            "min_workload": min(workloads) if workloads else 0,
-            "max_workload": max(workloads) if workloads else 0,
-            "workload_by_project": workload_by_project,
-            "workload_by_project_manager": workload_by_project_manager,
+            "average_workload": total_workload / len(workloads),
+            "median_workload": columns.median(),
+            "min_workload": columns.value(int(workloads.argmin())),
+            "max_workload": columns.value(int(workloads.argmax())),
+            "workload_by_project": columns.group_sum("project"),
+            "workload_by_project_manager": columns.group_sum("project_manager"),
         }
 
+    @staticmethod
+    def calculate_streaming_statistics(
+        chunks: Iterable[Entries], bucket_width: float = DEFAULT_BUCKET_WIDTH
+    ) -> Dict[str, Any]:
+        """
+        Calcule les statistiques de lots d'entrées successifs (par exemple un
+        historique d'instantanés hebdomadaires) à mémoire bornée
+
+        La médiane est estimée par histogramme, à une largeur de classe
+        près (voir WorkloadStatisticsAccumulator).
+
+        :param chunks: Lots d'entrées de charge de travail (listes ou tables)
+        :param bucket_width: Largeur des classes de l'histogramme
+        :return: Dictionnaire de statistiques, avec variance et écart-type
+        """
+        return WorkloadStatisticsAccumulator(bucket_width).push_all(chunks).result()
+
     @staticmethod
     def calculate_workload_variations(
-        previous_entries: List[WorkloadEntry],
-        current_entries: List[WorkloadEntry],
+        previous_entries: Entries,
+        current_entries: Entries,
         threshold_percentage: float = 10.0,
     ) -> Dict[str, Any]:
         """
@@ -93,9 +227,13 @@ class WorkloadCalculator:
         :param threshold_percentage: Seuil de variation en pourcentage
         :return: Variations de charge de travail
         """
-        # Grouper les entrées par profil
-        prev_by_profile = WorkloadCalculator._group_entries_by_profile(previous_entries)
-        curr_by_profile = WorkloadCalculator._group_entries_by_profile(current_entries)
+        # Totaliser les entrées par profil
+        prev_by_profile = _EntryColumns(previous_entries, ("profile",)).group_sum(
+            "profile"
+        )
+        curr_by_profile = _EntryColumns(current_entries, ("profile",)).group_sum(
+            "profile"
+        )
 
         # Résultats des variations
         variations = {
@@ -105,15 +243,13 @@ class WorkloadCalculator:
         }
 
         # Comparer les profils
-        all_profiles = set(list(prev_by_profile.keys()) + list(curr_by_profile.keys()))
+        all_profiles = list(prev_by_profile) + [
+            profile for profile in curr_by_profile if profile not in prev_by_profile
+        ]
 
         for profile in all_profiles:
-            prev_workload = sum(
-                entry.workload for entry in prev_by_profile.get(profile, [])
-            )
-            curr_workload = sum(
-                entry.workload for entry in curr_by_profile.get(profile, [])
-            )
+            prev_workload = prev_by_profile.get(profile, 0)
+            curr_workload = curr_by_profile.get(profile, 0)
 
             # Profils ajoutés
             if profile not in prev_by_profile:
@@ -144,23 +280,6 @@ class WorkloadCalculator:
 
         return variations
 
-    @staticmethod
-    def _group_entries_by_profile(
-        entries: List[WorkloadEntry],
-    ) -> Dict[str, List[WorkloadEntry]]:
-        """
-        Regroupe les entrées par profil
-
-        :param entries: Liste des entrées
-        :return: Dictionnaire d'entrées groupées par profil
-        """
-        grouped = {}
-        for entry in entries:
-            if entry.profile not in grouped:
-                grouped[entry.profile] = []
-            grouped[entry.profile].append(entry)
-        return grouped
-
     @staticmethod
     def predict_future_workload(
         entries: List[WorkloadEntry],
@@ -170,6 +289,9 @@ class WorkloadCalculator:
         """
         Prédit la charge de travail future basée sur les tendances historiques
 
+        Les charges des entrées tiennent lieu d'historique ; pour une prévision
+        sur l'axe réel des semaines, voir forecast_weekly_workload.
+
         :param entries: Liste des entrées de charge de travail
         :param weeks_ahead: Nombre de semaines à prédire
         :param smoothing_factor: Facteur de lissage pour la prédiction
@@ -228,11 +350,72 @@ class WorkloadCalculator:
         }
 
     @staticmethod
-    def analyze_workload_distribution(entries: List[WorkloadEntry]) -> Dict[str, Any]:
+    def forecast_weekly_workload(
+        table: WorkloadTable,
+        weeks_ahead: int = 4,
+        smoothing_factor: float = 0.5,
+        trend_factor: Optional[float] = None,
+        confidence: float = 0.95,
+    ) -> Dict[str, Any]:
+        """
+        Prédit la charge de travail semaine par semaine à partir des heures
+        hebdomadaires d'une table
+
+        Les séries de tous les profils et de tous les projets sont lissées
+        ensemble (voir smooth_series). Les prédictions par profil et par projet
+        reprennent le format de predict_future_workload (charge cumulée sur
+        l'horizon) ; le détail par semaine figure dans les entrées *_forecasts.
+
+        :param table: Table dont les colonnes de semaine forment l'axe du temps
+        :param weeks_ahead: Nombre de semaines à prédire
+        :param smoothing_factor: Facteur de lissage du niveau
+        :param trend_factor: Facteur de lissage de la tendance (None : sans tendance)
+        :param confidence: Niveau de confiance des bandes
+        :return: Prédictions de charge de travail
+        """
+        labels = {}
+        series = []
+        for dimension in ("profile", "project"):
+            labels[dimension], hours = table.group_hours(dimension)
+            series.append(hours)
+
+        forecast = smooth_series(
+            np.vstack(series),
+            weeks_ahead=weeks_ahead,
+            smoothing_factor=smoothing_factor,
+            trend_factor=trend_factor,
+            confidence=confidence,
+        )
+        predictions = forecast.forecasts.sum(axis=1).tolist()
+        bands = zip(
+            forecast.forecasts.tolist(),
+            forecast.lower.tolist(),
+            forecast.upper.tolist(),
+        )
+        details = [
+            {"forecast": values, "lower": lower, "upper": upper}
+            for values, lower, upper in bands
+        ]
+
+        profile_count = len(labels["profile"])
+        profile_predictions = dict(zip(labels["profile"], predictions[:profile_count]))
+
+        return {
+            "total_predicted_workload": sum(profile_predictions.values()),
+            "profile_predictions": profile_predictions,
+            "project_predictions": dict(
+                zip(labels["project"], predictions[profile_count:])
+            ),
+            "profile_forecasts": dict(zip(labels["profile"], details[:profile_count])),
+            "project_forecasts": dict(zip(labels["project"], details[profile_count:])),
+        }
+
+    @staticmethod
+    def analyze_workload_distribution(entries: Entries) -> Dict[str, Any]:
         """
         Analyse la distribution de la charge de travail
 
-        :param entries: Liste des entrées de charge de travail
+        :param entries: Liste des entrées de charge de travail (ou table)
         :return: Analyse de distribution
         """
         if not entries:
@@ -243,30 +426,11 @@ class WorkloadCalculator:
                 "project_manager_distribution": {},
             }
 
-        # Distribution par profil
-        profile_distribution = {}
-        for entry in entries:
-            if entry.profile not in profile_distribution:
-                profile_distribution[entry.profile] = 0
-            profile_distribution[entry.profile] += entry.workload
-
-        # Distribution par projet
-        project_distribution = {}
-        for entry in entries:
-            if entry.project not in project_distribution:
-                project_distribution[entry.project] = 0
-            project_distribution[entry.project] += entry.workload
-
-        # Distribution par chef de projet
-        project_manager_distribution = {}
-        for entry in entries:
-            if entry.project_manager not in project_manager_distribution:
-                project_manager_distribution[entry.project_manager] = 0
-            project_manager_distribution[entry.project_manager] += entry.workload
+        columns = _EntryColumns(entries, ("profile", "project", "project_manager"))
 
         return {
-            "total_workload": sum(entry.workload for entry in entries),
-            "profile_distribution": profile_distribution,
-            "project_distribution": project_distribution,
-            "project_manager_distribution": project_manager_distribution,
+            "total_workload": columns.total(),
+            "profile_distribution": columns.group_sum("profile"),
+            "project_distribution": columns.group_sum("project"),
+            "project_manager_distribution": columns.group_sum("project_manager"),
         }
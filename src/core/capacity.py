@@ -0,0 +1,174 @@
+﻿from dataclasses import dataclass, field
+from typing import List, Dict
+
+import numpy as np
+
+from src.data.data_models import CapacityModel
+from src.data.workload_table import WorkloadTable, MISSING_CODE
+
+
+@dataclass
+class OverloadCell:
+    """
+    Semaine où la demande d'un profil dépasse sa capacité
+    """
+
+    profile: str
+    week: str
+    demand: float
+    capacity: float
+    utilisation: float
+    # Projet -> heures demandées au profil cette semaine, par ordre décroissant
+    projects: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class CapacityReport:
+    """
+    Demande et capacité par profil (lignes) et par semaine (colonnes)
+    """
+
+    profiles: List[str]
+    weeks: List[str]
+    demand: np.ndarray
+    # NaN lorsque la capacité du profil est inconnue
+    capacity: np.ndarray
+    # Demande / capacité (inf pour une demande sans capacité, NaN si inconnue)
+    utilisation: np.ndarray
+    overloads: List[OverloadCell] = field(default_factory=list)
+
+
+def capacity_matrix(
+    capacity: CapacityModel, profiles: List[str], weeks: List[str]
+) -> np.ndarray:
+    """
+    Matrice des capacités profil × semaine (NaN lorsqu'elle est inconnue)
+
+    :param capacity: Modèle de capacité
+    :param profiles: Profils (lignes)
+    :param weeks: Colonnes de semaine (colonnes)
+    :return: Matrice des heures disponibles
+    """
+    default = np.nan if capacity.default_capacity is None else capacity.default_capacity
+    matrix = np.empty((len(profiles), len(weeks)))
+    matrix[:] = np.asarray(
+        [capacity.profile_capacity.get(profile, default) for profile in profiles],
+        dtype=np.float64,
+    ).reshape(-1, 1)
+
+    profile_rows = {profile: row for row, profile in enumerate(profiles)}
+    week_columns = {week: column for column, week in enumerate(weeks)}
+    for (profile, week), hours in capacity.week_overrides.items():
+        row = profile_rows.get(profile)
+        column = week_columns.get(week)
+        if row is not None and column is not None:
+            matrix[row, column] = hours
+    return matrix
+
+
+def detect_overloads(
+    table: WorkloadTable, capacity: CapacityModel, threshold: float = 1.0
+) -> CapacityReport:
+    """
+    Compare la demande hebdomadaire de chaque profil à sa capacité
+
+    La demande profil × semaine et la demande profil × projet × semaine sont
+    sommées une fois ; la comparaison est faite sur toute la matrice à la fois
+    et seules les cellules en surcharge sont détaillées par projet.
+
+    :param table: Table dont les colonnes de semaine forment l'axe du temps
+    :param capacity: Modèle de capacité
+    :param threshold: Taux d'utilisation au-delà duquel une cellule est en
+        surcharge (1.0 : demande supérieure à la capacité)
+    :return: Rapport de capacité
+    """
+    if threshold <= 0:
+        raise ValueError("Le seuil d'utilisation doit être positif")
+
+    profiles, demand = table.group_hours("profile")
+    weeks = list(table.week_columns)
+    available = capacity_matrix(capacity, profiles, weeks)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        utilisation = demand / available
+    # Une capacité nulle sans demande n'est pas utilisée
+    utilisation[(available == 0) & (demand == 0)] = 0.0
+    overloaded = demand > available * threshold
+
+    report = CapacityReport(
+        profiles=profiles,
+        weeks=weeks,
+        demand=demand,
+        capacity=available,
+        utilisation=utilisation,
+    )
+    if overloaded.any():
+        report.overloads = _describe_overloads(table, report, overloaded)
+    return report
+
+
+def _describe_overloads(
+    table: WorkloadTable, report: CapacityReport, overloaded: np.ndarray
+) -> List[OverloadCell]:
+    """
+    Détaille les cellules en surcharge avec les projets qui en sont la cause
+
+    :param table: Table d'origine
+    :param report: Rapport en cours de construction
+    :param overloaded: Masque des cellules en surcharge (profil × semaine)
+    :return: Cellules en surcharge, par profil puis par semaine
+    """
+    profile_codes = table.codes["profile"]
+    project_codes = table.codes["project"]
+    present = (profile_codes != MISSING_CODE) & (project_codes != MISSING_CODE)
+
+    # Demande par couple (profil, projet), couples triés par profil
+    project_count = len(table.categories["project"])
+    pair_codes = profile_codes[present].astype(np.int64) * project_count
+    pair_codes += project_codes[present]
+    order = np.argsort(pair_codes, kind="stable")
+    sorted_codes = pair_codes[order]
+    starts = np.flatnonzero(np.diff(sorted_codes, prepend=-1))
+    pairs = sorted_codes[starts]
+    pair_hours = np.add.reduceat(table.hours[present][order], starts, axis=0)
+    pair_profiles = pairs // project_count
+    pair_projects = pairs % project_count
+
+    profile_code_of = {
+        profile: code for code, profile in enumerate(table.categories["profile"])
+    }
+    projects = table.categories["project"]
+
+    cells = []
+    for row in np.flatnonzero(overloaded.any(axis=1)).tolist():
+        profile = report.profiles[row]
+        code = profile_code_of[profile]
+        first = np.searchsorted(pair_profiles, code, "left")
+        last = np.searchsorted(pair_profiles, code, "right")
+        names = [projects[project] for project in pair_projects[first:last].tolist()]
+
+        # Projets de chaque semaine en surcharge, triés par demande décroissante
+        columns = np.flatnonzero(overloaded[row])
+        block = pair_hours[first:last, columns]
+        order = np.argsort(-block, axis=0, kind="stable")
+        sorted_hours = np.take_along_axis(block, order, axis=0)
+        counts = (block > 0).sum(axis=0)
+
+        for position, column in enumerate(columns.tolist()):
+            count = counts[position]
+            cells.append(
+                OverloadCell(
+                    profile=profile,
+                    week=report.weeks[column],
+                    demand=float(report.demand[row, column]),
+                    capacity=float(report.capacity[row, column]),
+                    utilisation=float(report.utilisation[row, column]),
+                    projects=dict(
+                        zip(
+                            [names[i] for i in order[:count, position].tolist()],
+                            sorted_hours[:count, position].tolist(),
+                        )
+                    ),
+                )
+            )
+    return cells
@@ -0,0 +1,412 @@
+﻿from dataclasses import dataclass
+from itertools import combinations
+from typing import List, Dict, Any, Callable, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.data.workload_table import WorkloadTable, group_keys
+
+# Dimensions du cube, en plus de la dimension des semaines
+CUBE_DIMENSIONS = ("profile", "project_manager", "project")
+
+# Plage de semaines : colonnes (première, dernière) ou positions
+WeekRange = Union[Tuple[str, str], slice]
+
+# Filtre de découpe : valeur imposée, ou valeurs acceptées, par dimension
+Where = Mapping[str, Union[str, Sequence[str]]]
+
+
+@dataclass
+class _Cuboid:
+    """
+    Agrégat du cube sur un sous-ensemble de dimensions : une ligne par
+    combinaison présente, avec ses heures par semaine et leurs sommes cumulées
+    """
+
+    dimensions: Tuple[str, ...]
+    keys: np.ndarray
+    hours: np.ndarray
+    prefix_sums: np.ndarray
+    index: Dict[Tuple[int, ...], int]
+
+    @classmethod
+    def build(cls, table: WorkloadTable, dimensions: Tuple[str, ...]) -> "_Cuboid":
+        """
+        Agrège les lignes d'une table sur les dimensions demandées
+        """
+        if dimensions:
+            row_keys = np.stack([table.codes[dim] for dim in dimensions], axis=1)
+        else:
+            row_keys = np.zeros((len(table), 0), dtype=np.int32)
+
+        keys, groups = group_keys(row_keys)
+        if not dimensions:
+            # Total général : une seule combinaison, même pour une table vide
+            keys = np.zeros((1, 0), dtype=np.int32)
+
+        hours = np.zeros((len(keys), table.hours.shape[1]))
+        np.add.at(hours, groups, table.hours)
+
+        prefix_sums = np.zeros((hours.shape[0], hours.shape[1] + 1))
+        np.cumsum(hours, axis=1, out=prefix_sums[:, 1:])
+
+        return cls(
+            dimensions=dimensions,
+            keys=keys,
+            hours=hours,
+            prefix_sums=prefix_sums,
+            index={tuple(key): row for row, key in enumerate(keys.tolist())},
+        )
+
+
+class WorkloadCube:
+    """
+    Cube de charge de travail profil × chef de projet × projet × semaine
+
+    Toutes les agrégations (marginales) sur les sous-ensembles de dimensions
+    sont précalculées à la construction, avec leurs sommes cumulées par
+    semaine : les requêtes d'agrégation (roll-up), de découpe (slice) et
+    d'exploration (drill-down) sur une plage de semaines quelconque ne font
+    que sélectionner des lignes déjà sommées, sans reparcourir les entrées.
+    """
+
+    def __init__(self, table: WorkloadTable):
+        """
+        Construit le cube à partir d'une table de charge de travail
+
+        :param table: Table dont les colonnes de semaine forment l'axe du temps
+        """
+        self.categories = {dim: table.categories[dim] for dim in CUBE_DIMENSIONS}
+        self.week_columns = list(table.week_columns)
+        self._codes = {
+            dim: {value: code for code, value in enumerate(values)}
+            for dim, values in self.categories.items()
+        }
+        self._week_positions = {
+            column: position for position, column in enumerate(self.week_columns)
+        }
+        self._cuboids = {
+            dimensions: _Cuboid.build(table, dimensions)
+            for size in range(len(CUBE_DIMENSIONS) + 1)
+            for dimensions in combinations(CUBE_DIMENSIONS, size)
+        }
+        # Table d'origine, pour les charges par entrée (statistiques de
+        # distribution et seuil de charge)
+        self._table = table
+
+    def _cuboid(self, dimensions: Sequence[str]) -> _Cuboid:
+        unknown = set(dimensions) - set(CUBE_DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Dimension inconnue: {', '.join(sorted(unknown))}")
+        return self._cuboids[tuple(dim for dim in CUBE_DIMENSIONS if dim in dimensions)]
+
+    def _week_range(self, weeks: Optional[WeekRange]) -> Tuple[int, int]:
+        """
+        Convertit une plage de semaines en positions [start, stop)
+        """
+        if weeks is None:
+            return 0, len(self.week_columns)
+        if isinstance(weeks, slice):
+            start, stop, _ = weeks.indices(len(self.week_columns))
+            return start, max(start, stop)
+        try:
+            start = self._week_positions[weeks[0]]
+            stop = self._week_positions[weeks[1]] + 1
+        except KeyError as e:
+            raise ValueError(f"Colonne de semaine inconnue: {e.args[0]}")
+        return start, max(start, stop)
+
+    def _select(self, by: Sequence[str], where: Where) -> Tuple[_Cuboid, np.ndarray]:
+        """
+        Choisit l'agrégat couvrant les dimensions demandées et filtrées, puis
+        ses lignes correspondant au filtre
+
+        :return: Tuple (agrégat, indices des lignes retenues)
+        """
+        cuboid = self._cuboid(list(by) + list(where))
+        no_rows = np.zeros(0, dtype=np.intp)
+
+        fixed = {}
+        accepted = {}
+        for dim, value in where.items():
+            position = cuboid.dimensions.index(dim)
+            if isinstance(value, str):
+                code = self._codes[dim].get(value)
+                if code is None:
+                    return cuboid, no_rows
+                fixed[position] = code
+            else:
+                codes = [self._codes[dim][v] for v in value if v in self._codes[dim]]
+                if not codes:
+                    return cuboid, no_rows
+                accepted[position] = codes
+
+        if len(fixed) == len(cuboid.dimensions):
+            # Toutes les dimensions sont fixées : accès direct à la combinaison
+            key = tuple(fixed[position] for position in range(len(fixed)))
+            row = cuboid.index.get(key)
+            return cuboid, np.asarray([] if row is None else [row], dtype=np.intp)
+
+        mask = np.ones(len(cuboid.keys), dtype=bool)
+        for position, code in fixed.items():
+            mask &= cuboid.keys[:, position] == code
+        for position, codes in accepted.items():
+            mask &= np.isin(cuboid.keys[:, position], codes)
+        return cuboid, np.flatnonzero(mask)
+
+    def _grouped(
+        self,
+        by: Sequence[str],
+        where: Optional[Where],
+        values: Callable[[_Cuboid, np.ndarray], np.ndarray],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Valeurs des lignes d'agrégat retenues par le filtre, sommées par
+        combinaison des dimensions demandées lorsqu'une dimension filtrée sur
+        plusieurs valeurs n'est pas conservée
+
+        :param by: Dimensions conservées
+        :param where: Filtre de découpe
+        :param values: Valeurs des lignes retenues d'un agrégat
+        :return: Tuple (codes des dimensions de by, valeurs de chaque combinaison)
+        """
+        where = where or {}
+        cuboid, rows = self._select(by, where)
+        data = values(cuboid, rows)
+        keys = cuboid.keys[rows][:, [cuboid.dimensions.index(dim) for dim in by]]
+
+        if all(isinstance(where[dim], str) for dim in where if dim not in by):
+            return keys, data
+        if not by:
+            return np.zeros((1, 0), dtype=keys.dtype), data.sum(axis=0, keepdims=True)
+
+        keys, groups = group_keys(keys)
+        sums = np.zeros((len(keys),) + data.shape[1:])
+        np.add.at(sums, groups, data)
+        return keys, sums
+
+    def _nest(self, keys: np.ndarray, by: Sequence[str], values: List[Any]) -> Any:
+        """
+        Range des valeurs par combinaison de dimensions dans des dictionnaires
+        imbriqués suivant l'ordre des dimensions demandé
+        """
+        if not by:
+            return values[0] if values else 0.0
+
+        labels = [self.categories[dim] for dim in by]
+        result: Dict[str, Any] = {}
+        for key, value in zip(keys.tolist(), values):
+            level = result
+            for depth in range(len(by) - 1):
+                level = level.setdefault(labels[depth][key[depth]], {})
+            level[labels[-1][key[-1]]] = value
+        return result
+
+    def rollup(
+        self,
+        by: Sequence[str] = (),
+        where: Optional[Where] = None,
+        weeks: Optional[WeekRange] = None,
+    ) -> Any:
+        """
+        Charge totale agrégée sur les dimensions demandées
+
+        :param by: Dimensions conservées (aucune : total général)
+        :param where: Valeur imposée, ou liste des valeurs acceptées, par
+            dimension (découpe du cube)
+        :param weeks: Plage de colonnes de semaine (première, dernière), ou
+            tranche de positions
+        :return: Total, ou dictionnaires imbriqués suivant l'ordre de by
+        """
+        start, stop = self._week_range(weeks)
+        keys, totals = self._grouped(
+            by,
+            where,
+            lambda cuboid, rows: cuboid.prefix_sums[rows, stop]
+            - cuboid.prefix_sums[rows, start],
+        )
+        return self._nest(keys, by, totals.tolist())
+
+    def series(
+        self,
+        by: Sequence[str] = (),
+        where: Optional[Where] = None,
+        weeks: Optional[WeekRange] = None,
+    ) -> Any:
+        """
+        Charge par semaine, agrégée sur les dimensions demandées
+
+        :param by: Dimensions conservées (aucune : total général)
+        :param where: Valeur imposée, ou liste des valeurs acceptées, par
+            dimension (découpe du cube)
+        :param weeks: Plage de colonnes de semaine (première, dernière), ou
+            tranche de positions
+        :return: Heures par semaine, ou dictionnaires imbriqués de ces listes
+        """
+        start, stop = self._week_range(weeks)
+        keys, series = self._grouped(
+            by, where, lambda cuboid, rows: cuboid.hours[rows, start:stop]
+        )
+        series_list = series.tolist()
+        if not by and not series_list:
+            return [0.0] * (stop - start)
+        return self._nest(keys, by, series_list)
+
+    def drill_down(
+        self,
+        path: Dict[str, str],
+        into: str,
+        weeks: Optional[WeekRange] = None,
+    ) -> Dict[str, float]:
+        """
+        Détaille une cellule du cube selon une dimension supplémentaire
+        (par exemple les projets d'un chef de projet)
+
+        :param path: Valeurs des dimensions déjà fixées
+        :param into: Dimension à détailler
+        :param weeks: Plage de colonnes de semaine (première, dernière), ou
+            tranche de positions
+        :return: Charge totale par valeur de la dimension détaillée
+        """
+        return self.rollup((into,), where=path, weeks=weeks)
+
+    def _entry_workloads(
+        self,
+        weeks: Optional[WeekRange],
+        where: Optional[Where],
+        min_workload: Optional[float],
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Charge de chaque entrée sur la plage de semaines, limitée aux entrées
+        retenues par le filtre et le seuil de charge
+
+        :return: Tuple (charges des entrées retenues, indices de ces entrées
+            ou None si toutes le sont)
+        """
+        where = where or {}
+        self._cuboid(list(where))
+        start, stop = self._week_range(weeks)
+        workloads = self._table.window_totals(start, stop)
+
+        mask = np.ones(len(workloads), dtype=bool)
+        for dim, value in where.items():
+            mask &= self._table.mask_for(
+                dim, [value] if isinstance(value, str) else value
+            )
+        if min_workload is not None:
+            mask &= workloads >= min_workload
+        if mask.all():
+            return workloads, None
+        rows = np.flatnonzero(mask)
+        return workloads[rows], rows
+
+    def _totals(
+        self,
+        dimensions: Sequence[str],
+        weeks: Optional[WeekRange],
+        where: Optional[Where],
+        min_workload: Optional[float],
+        rows: Optional[np.ndarray],
+    ) -> Tuple[float, Dict[str, Dict[str, float]]]:
+        """
+        Charge totale et charges par valeur de chaque dimension
+
+        Sans seuil de charge, les totaux sont lus dans les agrégats ; le seuil
+        portant sur chaque entrée, les entrées retenues sont sinon sommées
+        directement (bincount).
+
+        :return: Tuple (charge totale, dimension -> valeur -> charge)
+        """
+        if min_workload is None:
+            return self.rollup(where=where, weeks=weeks), {
+                dim: self.rollup((dim,), where, weeks) for dim in dimensions
+            }
+
+        start, stop = self._week_range(weeks)
+        table = self._table.window(start, stop)
+        if rows is not None:
+            table = table.take(rows)
+        return float(table.workload.sum()), {
+            dim: table.group_sum(dim) for dim in dimensions
+        }
+
+    def distribution(
+        self,
+        weeks: Optional[WeekRange] = None,
+        where: Optional[Where] = None,
+        min_workload: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Distribution de la charge, au format de
+        WorkloadCalculator.analyze_workload_distribution
+
+        :param weeks: Plage de semaines (toutes par défaut)
+        :param where: Valeur imposée, ou liste des valeurs acceptées, par
+            dimension
+        :param min_workload: Charge minimale d'une entrée sur la plage
+        :return: Analyse de distribution
+        """
+        workloads, rows = self._entry_workloads(weeks, where, min_workload)
+        if len(workloads) == 0:
+            return {
+                "total_workload": 0,
+                "profile_distribution": {},
+                "project_distribution": {},
+                "project_manager_distribution": {},
+            }
+
+        total_workload, totals = self._totals(
+            ("profile", "project", "project_manager"),
+            weeks,
+            where,
+            min_workload,
+            rows,
+        )
+        return {
+            "total_workload": total_workload,
+            "profile_distribution": totals["profile"],
+            "project_distribution": totals["project"],
+            "project_manager_distribution": totals["project_manager"],
+        }
+
+    def statistics(
+        self,
+        weeks: Optional[WeekRange] = None,
+        where: Optional[Where] = None,
+        min_workload: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Statistiques de charge, au format de
+        WorkloadCalculator.calculate_workload_statistics
+
+        :param weeks: Plage de semaines (toutes par défaut)
+        :param where: Valeur imposée, ou liste des valeurs acceptées, par
+            dimension
+        :param min_workload: Charge minimale d'une entrée sur la plage
+        :return: Dictionnaire de statistiques
+        """
+        workloads, rows = self._entry_workloads(weeks, where, min_workload)
+        if len(workloads) == 0:
+            return {
+                "total_workload": 0,
+                "average_workload": 0,
+                "median_workload": 0,
+                "min_workload": 0,
+                "max_workload": 0,
+                "workload_by_project": {},
+                "workload_by_project_manager": {},
+            }
+
+        total_workload, totals = self._totals(
+            ("project", "project_manager"), weeks, where, min_workload, rows
+        )
+        workloads = np.sort(workloads)
+        return {
+            "total_workload": total_workload,
+            "average_workload": total_workload / len(workloads),
+            "median_workload": float(np.median(workloads)),
+            "min_workload": float(workloads[0]),
+            "max_workload": float(workloads[-1]),
+            "workload_by_project": totals["project"],
+            "workload_by_project_manager": totals["project_manager"],
+        }
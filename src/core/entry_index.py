@@ -0,0 +1,121 @@
+﻿from typing import List, Dict, Any, Iterable, Optional
+
+import numpy as np
+
+from src.data.data_models import WorkloadEntry
+
+# Clés de filtre par valeur -> attribut correspondant des entrées
+FILTER_DIMENSIONS = {
+    "profiles": "profile",
+    "projects": "project",
+    "project_managers": "project_manager",
+}
+
+
+class EntryIndex:
+    """
+    Index inversés d'une liste d'entrées de charge de travail
+
+    Pour chaque dimension filtrable, chaque valeur renvoie au tableau trié des
+    numéros de ligne qui la portent ; les charges sont indexées par un tri.
+    Un filtre est évalué par union des listes de ses valeurs, intersection
+    entre dimensions et recherche dichotomique pour les bornes de charge.
+    """
+
+    def __init__(self, entries: List[WorkloadEntry]):
+        """
+        Construit les index d'une liste d'entrées
+
+        :param entries: Entrées de charge de travail
+        """
+        self.entries = entries
+        self.postings: Dict[str, Dict[str, np.ndarray]] = {}
+        for filter_key, attribute in FILTER_DIMENSIONS.items():
+            rows_by_value: Dict[str, List[int]] = {}
+            for row, entry in enumerate(entries):
+                rows_by_value.setdefault(getattr(entry, attribute), []).append(row)
+            self.postings[filter_key] = {
+                value: np.asarray(rows, dtype=np.intp)
+                for value, rows in rows_by_value.items()
+            }
+
+        self._workloads = np.asarray([entry.workload for entry in entries], dtype=float)
+        self._workload_order = np.argsort(self._workloads, kind="stable")
+        self._sorted_workloads = self._workloads[self._workload_order]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _rows_for_values(self, filter_key: str, values: Iterable[str]) -> np.ndarray:
+        """
+        Lignes portant l'une des valeurs d'une dimension
+        """
+        if isinstance(values, str):
+            values = [values]
+        postings = self.postings[filter_key]
+        matches = [postings[value] for value in set(values) if value in postings]
+        if not matches:
+            return np.zeros(0, dtype=np.intp)
+        if len(matches) == 1:
+            return matches[0]
+        # Les listes de valeurs distinctes sont disjointes : il suffit de trier
+        return np.sort(np.concatenate(matches))
+
+    def _rows_for_workload(
+        self, min_workload: Optional[float], max_workload: Optional[float]
+    ) -> np.ndarray:
+        """
+        Lignes dont la charge est comprise entre les bornes (incluses)
+        """
+        start = 0
+        stop = len(self._sorted_workloads)
+        if min_workload is not None:
+            start = np.searchsorted(self._sorted_workloads, min_workload, "left")
+        if max_workload is not None:
+            stop = np.searchsorted(self._sorted_workloads, max_workload, "right")
+        return np.sort(self._workload_order[start:stop])
+
+    def query(self, filters: Dict[str, Any]) -> np.ndarray:
+        """
+        Évalue des filtres sur les index
+
+        :param filters: Dictionnaire de filtres (profiles, projects,
+            project_managers, min_workload, max_workload)
+        :return: Numéros des lignes retenues, dans l'ordre d'origine
+        """
+        candidates = [
+            self._rows_for_values(filter_key, filters[filter_key])
+            for filter_key in FILTER_DIMENSIONS
+            if filter_key in filters
+        ]
+        min_workload = filters.get("min_workload")
+        max_workload = filters.get("max_workload")
+
+        if not candidates:
+            if min_workload is None and max_workload is None:
+                return np.arange(len(self.entries))
+            return self._rows_for_workload(min_workload, max_workload)
+
+        # Intersecter en partant de l'ensemble le plus petit
+        candidates.sort(key=len)
+        rows = candidates[0]
+        for other in candidates[1:]:
+            if len(rows) == 0:
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+
+        # Bornes de charge vérifiées sur les seules lignes restantes
+        if min_workload is not None:
+            rows = rows[self._workloads[rows] >= min_workload]
+        if max_workload is not None:
+            rows = rows[self._workloads[rows] <= max_workload]
+        return rows
+
+    def filter(self, filters: Dict[str, Any]) -> List[WorkloadEntry]:
+        """
+        Retourne les entrées satisfaisant des filtres
+
+        :param filters: Dictionnaire de filtres
+        :return: Entrées retenues, dans l'ordre d'origine
+        """
+        return [self.entries[row] for row in self.query(filters).tolist()]
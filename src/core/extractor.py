@@ -1,7 +1,8 @@
 ﻿import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
+from src.core.entry_index import EntryIndex
 from src.data.data_models import WorkloadEntry, AnalysisConfiguration
 from src.data.excel_reader import ExcelReader
 
@@ -18,6 +19,11 @@ class WorkloadExtractor:
         :param excel_reader: Instance du lecteur Excel
         """
         self.excel_reader = excel_reader
+        # Index des entrées de la dernière configuration lue
+        self._entry_index: Optional[EntryIndex] = None
+        self._entry_index_key: Optional[Tuple[Any, ...]] = None
+        # Index de la dernière liste d'entrées filtrée par _apply_filters
+        self._filter_index: Optional[EntryIndex] = None
 
     def extract_workload_entries(
         self,
@@ -31,37 +37,79 @@ class WorkloadExtractor:
         :param additional_filters: Filtres supplémentaires pour l'extraction
         :return: Liste des entrées de charge de travail
         """
-        # Lire toutes les entrées de la feuille
-        all_entries = self._read_raw_entries(config)
+        # Entrées de la feuille, indexées à la première lecture
+        index = self.get_entry_index(config)
 
         # Appliquer les filtres supplémentaires
         if additional_filters:
-            all_entries = self._apply_filters(all_entries, additional_filters)
+            return index.filter(additional_filters)
 
-        return all_entries
+        return list(index.entries)
+
+    def get_entry_index(self, config: AnalysisConfiguration) -> EntryIndex:
+        """
+        Retourne l'index des entrées brutes d'une configuration, construit à la
+        lecture et conservé tant que la configuration et le fichier sont inchangés
+
+        :param config: Configuration de l'analyse
+        :return: Index des entrées
+        """
+        if self.excel_reader.has_changed():
+            self.excel_reader.reload()
+            self._entry_index = None
+
+        key = config.cache_key()
+        if self._entry_index is None or key != self._entry_index_key:
+            self._entry_index = EntryIndex(self._read_raw_entries(config))
+            self._entry_index_key = key
+        return self._entry_index
 
     def _read_raw_entries(self, config: AnalysisConfiguration) -> List[WorkloadEntry]:
         """
         Lit les entrées brutes du fichier Excel
 
+        Chaque ligne est lue une seule fois, projetée sur les colonnes utiles,
+        jusqu'à la dernière ligne de données.
+
         :param config: Configuration de l'analyse
         :return: Liste des entrées brutes
         """
         workload_entries = []
 
+        column_index = self.excel_reader._column_index_from_string
+        profile_col_idx = column_index(config.profile_column)
+        start_col_idx = column_index(config.start_column)
+        end_col_idx = column_index(config.end_column)
+        pm_col_idx = column_index("B")  # Colonne chef de projet
+        project_col_idx = column_index("D")  # Colonne projet
+        jira_col_idx = column_index("F")  # Colonne ticket JIRA
+
+        first_col_idx = min(
+            profile_col_idx, start_col_idx, pm_col_idx, project_col_idx, jira_col_idx
+        )
+        last_col_idx = max(
+            profile_col_idx, end_col_idx, pm_col_idx, project_col_idx, jira_col_idx
+        )
+
         # Parcourir les lignes spécifiées
-        for row in range(config.start_row, config.end_row + 1):
+        for row, values in self.excel_reader._iter_projected_rows(
+            config, [first_col_idx, last_col_idx]
+        ):
             try:
                 # Extraire les valeurs des colonnes nécessaires
-                project_manager = self._get_cell_value(
-                    row, "B"
-                )  # Colonne chef de projet
-                project = self._get_cell_value(row, "D")  # Colonne projet
-                profile = self._get_cell_value(row, config.profile_column)
-                jira_ticket = self._get_cell_value(row, "F")  # Colonne ticket JIRA
+                project_manager = values[pm_col_idx - first_col_idx]
+                project = values[project_col_idx - first_col_idx]
+                profile = values[profile_col_idx - first_col_idx]
+                jira_ticket = values[jira_col_idx - first_col_idx]
 
                 # Calculer la charge de travail
-                workload = self._calculate_workload(row, config)
+                workload = sum(
+                    value
+                    for value in values[
+                        start_col_idx - first_col_idx : end_col_idx - first_col_idx + 1
+                    ]
+                    if isinstance(value, (int, float))
+                )
 
                 # Créer une entrée si toutes les informations essentielles sont présentes
                 if project_manager and project and profile:
@@ -80,95 +128,28 @@ class WorkloadExtractor:
 
         return workload_entries
 
-    def _get_cell_value(self, row: int, column: str) -> Optional[str]:
-        """
-        Récupère la valeur d'une cellule spécifique
-
-        :param row: Numéro de ligne
-        :param column: Lettre de colonne
-        :return: Valeur de la cellule
-        """
-        try:
-            column_index = self.excel_reader._column_index_from_string(column)
-            cell = self.excel_reader.sheet.cell(row=row, column=column_index)
-            return cell.value
-        except Exception:
-            return None
-
-    def _calculate_workload(self, row: int, config: AnalysisConfiguration) -> float:
-        """
-        Calcule la charge de travail pour une ligne
-
-        :param row: Numéro de ligne
-        :param config: Configuration de l'analyse
-        :return: Charge de travail totale
-        """
-        start_col_index = self.excel_reader._column_index_from_string(
-            config.start_column
-        )
-        end_col_index = self.excel_reader._column_index_from_string(config.end_column)
-
-        total_workload = 0
-        for col in range(start_col_index, end_col_index + 1):
-            cell = self.excel_reader.sheet.cell(row=row, column=col)
-            if cell.value is not None and isinstance(cell.value, (int, float)):
-                total_workload += cell.value
-
-        return total_workload
-
     def _apply_filters(
         self, entries: List[WorkloadEntry], filters: Dict[str, Any]
     ) -> List[WorkloadEntry]:
         """
-        Applique des filtres personnalisés aux entrées
+        Applique des filtres personnalisés aux entrées, évalués sur leurs
+        index inversés
+
+        L'index est construit une seule fois par liste (comparée par
+        identité) : celui de get_entry_index est réutilisé pour ses entrées,
+        celui de la dernière autre liste filtrée est conservé. Une liste
+        modifiée sur place doit donc être copiée avant d'être filtrée.
 
         :param entries: Liste des entrées
         :param filters: Dictionnaire de filtres
         :return: Liste des entrées filtrées
         """
-        filtered_entries = entries.copy()
-
-        # Filtre par profil
-        if "profiles" in filters:
-            filtered_entries = [
-                entry
-                for entry in filtered_entries
-                if entry.profile in filters["profiles"]
-            ]
-
-        # Filtre par projet
-        if "projects" in filters:
-            filtered_entries = [
-                entry
-                for entry in filtered_entries
-                if entry.project in filters["projects"]
-            ]
-
-        # Filtre par chef de projet
-        if "project_managers" in filters:
-            filtered_entries = [
-                entry
-                for entry in filtered_entries
-                if entry.project_manager in filters["project_managers"]
-            ]
-
-        # Filtre par charge de travail minimale
-        if "min_workload" in filters:
-            filtered_entries = [
-                entry
-                for entry in filtered_entries
-                if entry.workload >= filters["min_workload"]
-            ]
-
-        # Filtre par charge de travail maximale
-        if "max_workload" in filters:
-            filtered_entries = [
-                entry
-                for entry in filtered_entries
-                if entry.workload <= filters["max_workload"]
-            ]
-
-        return filtered_entries
+        if self._entry_index is not None and entries is self._entry_index.entries:
+            return self._entry_index.filter(filters)
+
+        if self._filter_index is None or entries is not self._filter_index.entries:
+            self._filter_index = EntryIndex(entries)
+        return self._filter_index.filter(filters)
 
     def extract_unique_metadata(self) -> Dict[str, List[str]]:
         """
@@ -183,16 +164,23 @@ class WorkloadExtractor:
             "jira_tickets": set(),
         }
 
-        # Parcourir toutes les entrées
-        for row in range(3, self.excel_reader.sheet.max_row + 1):
-            unique_metadata["profiles"].add(str(self._get_cell_value(row, "E") or ""))
-            unique_metadata["projects"].add(str(self._get_cell_value(row, "D") or ""))
-            unique_metadata["project_managers"].add(
-                str(self._get_cell_value(row, "B") or "")
-            )
-            unique_metadata["jira_tickets"].add(
-                str(self._get_cell_value(row, "F") or "")
-            )
+        # Colonnes des métadonnées (indices relatifs à la colonne B)
+        metadata_columns = {
+            "project_managers": 0,  # Colonne B
+            "projects": 2,  # Colonne D
+            "profiles": 3,  # Colonne E
+            "jira_tickets": 4,  # Colonne F
+        }
+
+        # Parcourir les entrées jusqu'à la dernière ligne de données réelle
+        # (max_row est souvent gonflé par la mise en forme)
+        extent = self.excel_reader.detect_data_extent()
+        scan_config = AnalysisConfiguration(start_row=3, end_row=extent.last_row)
+        for _, values in self.excel_reader._iter_projected_rows(
+            scan_config, [2, 6]  # Colonnes B à F
+        ):
+            for key, position in metadata_columns.items():
+                unique_metadata[key].add(str(values[position] or ""))
 
         # Convertir les ensembles en listes et supprimer les valeurs vides
         for key in unique_metadata:
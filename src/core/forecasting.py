@@ -0,0 +1,96 @@
+﻿from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass
+class SeriesForecast:
+    """
+    Prévisions d'un ensemble de séries hebdomadaires : une ligne par série,
+    une colonne par semaine de l'horizon
+    """
+
+    forecasts: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    # État final du lissage et écart-type des erreurs de prévision à une semaine
+    level: np.ndarray
+    trend: np.ndarray
+    residual_std: np.ndarray
+
+
+def smooth_series(
+    series: np.ndarray,
+    weeks_ahead: int = 4,
+    smoothing_factor: float = 0.5,
+    trend_factor: Optional[float] = None,
+    confidence: float = 0.95,
+) -> SeriesForecast:
+    """
+    Lissage exponentiel de toutes les séries à la fois
+
+    La récurrence est parcourue semaine par semaine, chaque pas traitant
+    toutes les séries par une opération vectorielle. Avec trend_factor, la
+    tendance est lissée elle aussi (méthode de Holt). Les bandes de confiance
+    reposent sur l'erreur quadratique moyenne des prévisions à une semaine ;
+    leur borne basse est ramenée à zéro, une charge ne pouvant être négative.
+
+    :param series: Heures par semaine, une ligne par série
+    :param weeks_ahead: Nombre de semaines à prédire
+    :param smoothing_factor: Facteur de lissage du niveau (entre 0 et 1)
+    :param trend_factor: Facteur de lissage de la tendance (None : sans tendance)
+    :param confidence: Niveau de confiance des bandes (entre 0 et 1)
+    :return: Prévisions des séries
+    """
+    if not 0 < smoothing_factor <= 1:
+        raise ValueError("Le facteur de lissage doit être compris entre 0 et 1")
+    if trend_factor is not None and not 0 < trend_factor <= 1:
+        raise ValueError("Le facteur de tendance doit être compris entre 0 et 1")
+    if not 0 < confidence < 1:
+        raise ValueError("Le niveau de confiance doit être compris entre 0 et 1")
+    if weeks_ahead < 1:
+        raise ValueError("L'horizon de prévision doit être d'au moins une semaine")
+
+    series = np.asarray(series, dtype=np.float64)
+    count, weeks = series.shape
+    if weeks == 0:
+        level = np.zeros(count)
+    else:
+        level = series[:, 0].copy()
+    trend = np.zeros(count)
+    if trend_factor is not None and weeks > 1:
+        trend = series[:, 1] - series[:, 0]
+
+    squared_errors = np.zeros(count)
+    for week in range(1, weeks):
+        observed = series[:, week]
+        predicted = level + trend
+        squared_errors += (observed - predicted) ** 2
+        level = smoothing_factor * observed + (1 - smoothing_factor) * predicted
+        if trend_factor is not None:
+            trend = (
+                trend_factor * (level - predicted + trend) + (1 - trend_factor) * trend
+            )
+    residual_std = np.sqrt(squared_errors / max(weeks - 1, 1))
+
+    steps = np.arange(1, weeks_ahead + 1)
+    forecasts = level[:, np.newaxis] + trend[:, np.newaxis] * steps
+
+    # Variance de la prévision à h semaines, relative à celle à une semaine
+    beta = trend_factor or 0.0
+    growth = smoothing_factor**2 * (1 + np.arange(weeks_ahead) * beta) ** 2
+    growth[0] = 1.0
+    spread = np.sqrt(np.cumsum(growth))
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    margin = z * residual_std[:, np.newaxis] * spread
+
+    return SeriesForecast(
+        forecasts=forecasts,
+        lower=np.maximum(forecasts - margin, 0.0),
+        upper=forecasts + margin,
+        level=level,
+        trend=trend,
+        residual_std=residual_std,
+    )
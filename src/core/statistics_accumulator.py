@@ -0,0 +1,210 @@
+﻿import math
+from typing import Dict, Any, Iterable
+
+import numpy as np
+
+from src.data.workload_table import WorkloadTable
+
+# Largeur par défaut des classes de l'histogramme, en heures
+DEFAULT_BUCKET_WIDTH = 0.5
+
+
+class WorkloadStatisticsAccumulator:
+    """
+    Statistiques de charge de travail calculées au fil de l'eau
+
+    Les entrées sont poussées par lots ; seuls des agrégats sont conservés :
+    effectif, moyenne et somme des carrés des écarts (Welford, fusionnés lot
+    par lot selon Chan), minimum, maximum, histogramme à classes de largeur
+    fixe pour la médiane et totaux par projet et par chef de projet. La
+    mémoire dépend de l'étendue des charges et du nombre de projets, pas du
+    volume d'historique. Deux accumulateurs de même largeur de classe (par
+    exemple calculés dans des processus distincts) se fusionnent avec merge.
+    """
+
+    def __init__(self, bucket_width: float = DEFAULT_BUCKET_WIDTH):
+        """
+        :param bucket_width: Largeur des classes de l'histogramme ; la médiane
+            est exacte à une largeur de classe près
+        """
+        if bucket_width <= 0:
+            raise ValueError("La largeur des classes doit être positive")
+
+        self.bucket_width = bucket_width
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.histogram: Dict[int, int] = {}
+        self.workload_by_project: Dict[str, float] = {}
+        self.workload_by_project_manager: Dict[str, float] = {}
+
+    def push(self, entries) -> "WorkloadStatisticsAccumulator":
+        """
+        Ajoute un lot d'entrées
+
+        :param entries: Liste d'entrées de charge de travail, ou table
+        :return: L'accumulateur lui-même
+        """
+        if not isinstance(entries, WorkloadTable):
+            entries = WorkloadTable.from_entries(entries)
+        if len(entries) == 0:
+            return self
+
+        workloads = entries.workload
+        count = len(workloads)
+        mean = float(workloads.mean())
+        m2 = float(((workloads - mean) ** 2).sum())
+        self._combine(count, mean, m2, float(workloads.sum()))
+        self.minimum = min(self.minimum, float(workloads.min()))
+        self.maximum = max(self.maximum, float(workloads.max()))
+
+        buckets, counts = np.unique(
+            np.floor(workloads / self.bucket_width).astype(np.int64),
+            return_counts=True,
+        )
+        for bucket, bucket_count in zip(buckets.tolist(), counts.tolist()):
+            self.histogram[bucket] = self.histogram.get(bucket, 0) + bucket_count
+
+        _add_totals(self.workload_by_project, entries.group_sum("project"))
+        _add_totals(
+            self.workload_by_project_manager, entries.group_sum("project_manager")
+        )
+        return self
+
+    def push_all(self, chunks: Iterable) -> "WorkloadStatisticsAccumulator":
+        """
+        Ajoute successivement plusieurs lots d'entrées
+
+        :param chunks: Lots d'entrées (listes ou tables)
+        :return: L'accumulateur lui-même
+        """
+        for chunk in chunks:
+            self.push(chunk)
+        return self
+
+    def merge(
+        self, other: "WorkloadStatisticsAccumulator"
+    ) -> "WorkloadStatisticsAccumulator":
+        """
+        Fusionne un autre accumulateur dans celui-ci
+
+        :param other: Accumulateur de même largeur de classe
+        :return: L'accumulateur lui-même
+        """
+        if other.bucket_width != self.bucket_width:
+            raise ValueError(
+                "Impossible de fusionner des histogrammes de largeurs différentes"
+            )
+        if other.count == 0:
+            return self
+
+        self._combine(other.count, other.mean, other.m2, other.total)
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        for bucket, bucket_count in other.histogram.items():
+            self.histogram[bucket] = self.histogram.get(bucket, 0) + bucket_count
+        _add_totals(self.workload_by_project, other.workload_by_project)
+        _add_totals(self.workload_by_project_manager, other.workload_by_project_manager)
+        return self
+
+    def _combine(self, count: int, mean: float, m2: float, total: float):
+        """
+        Combine effectif, moyenne et somme des carrés des écarts d'un lot
+        avec ceux déjà accumulés (formule de Chan)
+        """
+        combined = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / combined
+        self.m2 += m2 + delta**2 * self.count * count / combined
+        self.count = combined
+        self.total += total
+
+    @property
+    def variance(self) -> float:
+        """
+        Variance (de population) des charges
+        """
+        return self.m2 / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Quantile approché des charges, interpolé linéairement entre les deux
+        valeurs de rang encadrant (comme numpy.quantile)
+
+        :param q: Ordre du quantile (entre 0 et 1)
+        :return: Valeur du quantile
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("L'ordre du quantile doit être compris entre 0 et 1")
+        if self.count == 0:
+            return 0.0
+
+        position = q * (self.count - 1)
+        lower = math.floor(position)
+        value = self._order_statistic(lower)
+        if position > lower:
+            upper = self._order_statistic(lower + 1)
+            value += (position - lower) * (upper - value)
+        return value
+
+    def _order_statistic(self, rank: int) -> float:
+        """
+        Valeur approchée de rang donné (à partir de 0), placée dans sa classe
+        proportionnellement à son rang parmi les valeurs de la classe
+
+        :param rank: Rang de la valeur dans les charges triées
+        :return: Valeur approchée, à moins d'une largeur de classe près
+        """
+        seen = 0
+        for bucket in sorted(self.histogram):
+            bucket_count = self.histogram[bucket]
+            if rank < seen + bucket_count:
+                fraction = (rank - seen + 0.5) / bucket_count
+                value = (bucket + fraction) * self.bucket_width
+                return min(max(value, self.minimum), self.maximum)
+            seen += bucket_count
+        return self.maximum
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Statistiques accumulées, au format de
+        WorkloadCalculator.calculate_workload_statistics (médiane approchée),
+        complétées de la variance et de l'écart-type
+
+        :return: Dictionnaire de statistiques
+        """
+        if self.count == 0:
+            return {
+                "total_workload": 0,
+                "average_workload": 0,
+                "median_workload": 0,
+                "min_workload": 0,
+                "max_workload": 0,
+                "variance": 0,
+                "standard_deviation": 0,
+                "workload_by_project": {},
+                "workload_by_project_manager": {},
+            }
+
+        return {
+            "total_workload": self.total,
+            "average_workload": self.total / self.count,
+            "median_workload": self.quantile(0.5),
+            "min_workload": self.minimum,
+            "max_workload": self.maximum,
+            "variance": self.variance,
+            "standard_deviation": math.sqrt(self.variance),
+            "workload_by_project": dict(self.workload_by_project),
+            "workload_by_project_manager": dict(self.workload_by_project_manager),
+        }
+
+
+def _add_totals(totals: Dict[str, float], other: Dict[str, float]):
+    """
+    Ajoute des totaux par clé à des totaux existants
+    """
+    for key, value in other.items():
+        totals[key] = totals.get(key, 0.0) + value
@@ -1,3 +1,11 @@
 ﻿from .excel_reader import ExcelReader
 from .repository import WorkloadRepository
-from .data_models import WorkloadEntry, ProfileWorkload, AnalysisConfiguration
+from .data_models import (
+    WorkloadEntry,
+    ProfileWorkload,
+    AnalysisConfiguration,
+    CapacityModel,
+)
+from .workload_table import WorkloadTable
+from .native_excel_reader import NativeExcelReader
+from .snapshot_store import SnapshotStore
@@ -1,5 +1,5 @@
 ﻿from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 
 @dataclass
@@ -36,8 +36,115 @@ class AnalysisConfiguration:
     end_column: str = "Z"
     profile_column: str = "E"
     start_row: int = 3
-    end_row: int = 1831
+    # None : dernière ligne de données détectée automatiquement
+    end_row: Optional[int] = None
     selected_profiles: List[str] = field(default_factory=list)
+    # Charge minimale d'une ligne (None : aucune ligne écartée sur sa charge)
+    min_workload: Optional[float] = None
+
+    def cache_key(self) -> Tuple[Any, ...]:
+        """
+        Instantané hachable de la configuration, utilisable comme clé de cache
+
+        :return: Tuple des paramètres (profils sélectionnés triés)
+        """
+        return (
+            self.start_column,
+            self.end_column,
+            self.profile_column,
+            self.start_row,
+            self.end_row,
+            tuple(sorted(self.selected_profiles)),
+            self.min_workload,
+        )
+
+
+@dataclass
+class DataExtent:
+    """
+    Étendue réelle des données d'une feuille (hors cellules seulement mises en forme)
+    """
+
+    last_row: int = 0
+    last_column: int = 0
+
+
+@dataclass
+class WorkloadSummary:
+    """
+    Résultats d'analyse complets, avec les sous-totaux précalculés
+    """
+
+    profiles_workload: List[ProfileWorkload] = field(default_factory=list)
+    detailed_workload: Dict[str, Dict[str, List[WorkloadEntry]]] = field(
+        default_factory=dict
+    )
+    # Chef de projet -> profil -> charge totale
+    profiles_by_project_manager: Dict[str, Dict[str, float]] = field(
+        default_factory=dict
+    )
+    # Chef de projet -> projet -> charge totale
+    project_totals: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    total_workload: float = 0.0
+
+
+@dataclass
+class BatchAnalysisResult:
+    """
+    Résultat combiné de l'analyse de plusieurs classeurs
+    """
+
+    profiles_workload: List[ProfileWorkload] = field(default_factory=list)
+    detailed_workload: Dict[str, Dict[str, List[WorkloadEntry]]] = field(
+        default_factory=dict
+    )
+    workload_by_file: Dict[str, float] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class CapacityModel:
+    """
+    Capacité hebdomadaire des profils, en heures
+    """
+
+    # Profil -> heures disponibles par semaine
+    profile_capacity: Dict[str, float] = field(default_factory=dict)
+    # (profil, colonne de semaine) -> heures disponibles cette semaine-là
+    week_overrides: Dict[Tuple[str, str], float] = field(default_factory=dict)
+    # Capacité des profils absents de profile_capacity (None : non évalués)
+    default_capacity: Optional[float] = None
+
+    def capacity_for(self, profile: str, week: str) -> Optional[float]:
+        """
+        Capacité d'un profil pour une semaine
+
+        :param profile: Profil
+        :param week: Colonne de la semaine
+        :return: Heures disponibles, ou None si la capacité est inconnue
+        """
+        override = self.week_overrides.get((profile, week))
+        if override is not None:
+            return override
+        return self.profile_capacity.get(profile, self.default_capacity)
+
+
+@dataclass
+class Snapshot:
+    """
+    Instantané hebdomadaire enregistré dans l'historique
+    """
+
+    snapshot_id: int
+    # Date de l'instantané (AAAA-MM-JJ)
+    taken_at: str
+    label: str
+    source: Optional[str] = None
+    total_workload: float = 0.0
+    entry_count: int = 0
+    # Instantané de base dont les lignes sont reconstruites (None : lignes
+    # non enregistrées)
+    base_id: Optional[int] = None
 
 
 @dataclass
@@ -48,3 +155,32 @@ class ExportConfiguration:
 
     export_format: str = "txt"
     file_path: Optional[str] = None
+
+
+@dataclass
+class ExportResult:
+    """
+    Résultat de l'exportation dans un format
+    """
+
+    export_format: str
+    file_path: Optional[str] = None
+    # Taille du fichier écrit, en octets
+    size: int = 0
+    # Durée d'écriture, en secondes
+    duration: float = 0.0
+    # Message d'erreur (None : exportation réussie)
+    error: Optional[str] = None
+
+
+@dataclass
+class ReportManifest:
+    """
+    Manifeste des rapports écrits pour chaque chef de projet
+    """
+
+    manifest_path: Optional[str] = None
+    # Chef de projet -> résultat de l'écriture de son rapport
+    reports: Dict[str, ExportResult] = field(default_factory=dict)
+    # Durée totale (préparation, écriture des rapports et du manifeste), en secondes
+    duration: float = 0.0
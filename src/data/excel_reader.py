@@ -1,48 +1,314 @@
-﻿import openpyxl
+﻿import logging
+import os
+import numpy as np
+import openpyxl
 from openpyxl.utils import column_index_from_string
-from typing import List, Dict, Any, Optional
-from src.data.data_models import WorkloadEntry, AnalysisConfiguration
+from typing import List, Dict, Any, Callable, Iterable, Optional, Iterator, Tuple
+from src.data.data_models import WorkloadEntry, AnalysisConfiguration, DataExtent
+from src.data.workload_table import WorkloadTable
+from src.data.scan_plan import ScanPlan
+from src.utils.file_utils import file_fingerprint
+from src.data.workbook_cache import WorkbookCache
+
+logger = logging.getLogger(__name__)
+
+# Nombre de lignes parcourues entre deux appels du suivi de progression
+PROGRESS_INTERVAL = 1000
+
+# Suivi de progression : (lignes parcourues, total estimé ou None)
+ProgressCallback = Callable[[int, Optional[int]], None]
 
 
 class ExcelReader:
-    def __init__(self, file_path: str):
+    _column_index_from_string = staticmethod(column_index_from_string)
+
+    def __init__(
+        self,
+        file_path: str,
+        read_only: bool = False,
+        cache: Optional[WorkbookCache] = None,
+    ):
         """
         Initialise le lecteur de fichier Excel
 
         :param file_path: Chemin du fichier Excel à charger
+        :param read_only: Active la lecture en flux (mode lecture seule d'openpyxl),
+            qui ne construit pas le graphe complet des cellules en mémoire
+        :param cache: Cache disque des données extraites ; lorsqu'il est fourni,
+            le classeur n'est ouvert qu'en cas d'absence dans le cache
         """
         self.file_path = file_path
-        self.workbook = None
-        self.sheet = None
-        self._load_workbook()
+        self.read_only = read_only
+        self.cache = cache
+        self._workbook = None
+        self._sheet = None
+        self._data_extent: Optional[DataExtent] = None
+        # Appelé pendant les parcours de lignes ; une exception levée par le
+        # suivi interrompt la lecture (annulation coopérative)
+        self.progress_callback: Optional[ProgressCallback] = None
+
+        if cache is None:
+            self._load_workbook()
+        elif not os.path.isfile(file_path):
+            raise ValueError(
+                f"Impossible de charger le fichier Excel: fichier introuvable {file_path}"
+            )
+        # Empreinte du fichier lu, pour détecter une modification ultérieure
+        self._fingerprint = file_fingerprint(file_path)
+
+    @property
+    def workbook(self):
+        """
+        Classeur openpyxl, chargé à la première utilisation
+        """
+        if self._workbook is None:
+            self._load_workbook()
+        return self._workbook
+
+    @property
+    def sheet(self):
+        """
+        Feuille active du classeur, chargée à la première utilisation
+        """
+        if self._sheet is None:
+            self._load_workbook()
+        return self._sheet
 
     def _load_workbook(self):
         """
         Charge le fichier Excel
         """
         try:
-            self.workbook = openpyxl.load_workbook(self.file_path, data_only=True)
-            self.sheet = self.workbook.active
+            self._workbook = openpyxl.load_workbook(
+                self.file_path, read_only=self.read_only, data_only=True
+            )
+            self._sheet = self._workbook.active
         except Exception as e:
             raise ValueError(f"Impossible de charger le fichier Excel: {str(e)}")
 
+    def close(self):
+        """
+        Libère le classeur (ferme le fichier source en mode lecture seule)
+        """
+        if self._workbook is not None and self.read_only:
+            self._workbook.close()
+
+    def has_changed(self) -> bool:
+        """
+        Indique si le fichier a été modifié depuis son chargement
+
+        :return: True si la taille ou la date de modification ont changé
+        """
+        try:
+            return file_fingerprint(self.file_path) != self._fingerprint
+        except OSError:
+            # Fichier momentanément inaccessible : les données lues restent valides
+            return False
+
+    def reload(self):
+        """
+        Oublie le classeur et son étendue pour relire l'état actuel du fichier
+        """
+        self.close()
+        self._workbook = None
+        self._sheet = None
+        self._data_extent = None
+        self._fingerprint = file_fingerprint(self.file_path)
+        if self.cache is None:
+            self._load_workbook()
+
+    def detect_data_extent(self) -> DataExtent:
+        """
+        Détermine la dernière ligne et la dernière colonne contenant des données
+
+        Les cellules vides (seulement mises en forme) ne comptent pas, ce qui
+        évite de se fier à max_row, souvent gonflé par la mise en forme. Le
+        résultat est conservé pour le fichier (et dans le cache s'il existe).
+
+        :return: Étendue des données de la feuille active
+        """
+        if self._data_extent is not None:
+            return self._data_extent
+
+        if self.cache is not None:
+            key = self.cache.make_key(self.file_path, "extent")
+            arrays = self.cache.load_arrays(key)
+            if arrays is not None:
+                last_row, last_column = arrays["extent"].tolist()
+                self._data_extent = DataExtent(last_row, last_column)
+                return self._data_extent
+
+        self._data_extent = self._scan_data_extent()
+        if self.cache is not None:
+            self._store_in_cache(
+                self.cache.store_arrays,
+                key,
+                {
+                    "extent": np.asarray(
+                        [self._data_extent.last_row, self._data_extent.last_column]
+                    )
+                },
+            )
+        return self._data_extent
+
+    def _scan_data_extent(self) -> DataExtent:
+        """
+        Parcourt la feuille pour repérer les dernières ligne et colonne non vides
+        """
+        last_row = 0
+        last_column = 0
+
+        rows = self._track_rows(
+            self.sheet.iter_rows(values_only=True),
+            getattr(self.sheet, "max_row", None),
+        )
+        for row_idx, values in enumerate(rows, start=1):
+            for col_idx in range(len(values), 0, -1):
+                value = values[col_idx - 1]
+                if value is not None and value != "":
+                    last_row = row_idx
+                    last_column = max(last_column, col_idx)
+                    break
+
+        return DataExtent(last_row=last_row, last_column=last_column)
+
+    def _track_rows(self, rows: Iterable[Any], total: Optional[int]) -> Iterator[Any]:
+        """
+        Signale la progression d'un parcours de lignes au suivi configuré
+
+        Sans suivi, les lignes sont renvoyées telles quelles ; sinon le suivi
+        est appelé toutes les PROGRESS_INTERVAL lignes et en fin de parcours.
+
+        :param rows: Lignes à parcourir
+        :param total: Nombre de lignes attendu (None s'il est inconnu)
+        :return: Itérateur des mêmes lignes
+        """
+        callback = self.progress_callback
+        if callback is None:
+            return iter(rows)
+        return self._tracked_rows(rows, total, callback)
+
+    @staticmethod
+    def _tracked_rows(
+        rows: Iterable[Any], total: Optional[int], callback: ProgressCallback
+    ) -> Iterator[Any]:
+        done = 0
+        for row in rows:
+            yield row
+            done += 1
+            if done % PROGRESS_INTERVAL == 0:
+                callback(done, total)
+        callback(done, total)
+
+    def resolve_end_row(self, config: AnalysisConfiguration) -> int:
+        """
+        Détermine la dernière ligne à parcourir
+
+        Une dernière ligne saisie par l'utilisateur est prioritaire ; sinon la
+        dernière ligne de données détectée est utilisée. Si l'étendue est déjà
+        connue, le parcours s'arrête de toute façon à la dernière ligne de données.
+
+        :param config: Configuration pour la lecture
+        :return: Numéro de la dernière ligne à lire
+        """
+        if config.end_row is None:
+            return self.detect_data_extent().last_row
+        if self._data_extent is not None:
+            return min(config.end_row, self._data_extent.last_row)
+        return config.end_row
+
+    def _iter_projected_rows(
+        self, config: AnalysisConfiguration, column_indices: List[int]
+    ) -> Iterator[Tuple[int, Tuple[Any, ...]]]:
+        """
+        Parcourt les lignes de la plage configurée en flux, en ne matérialisant
+        que les colonnes comprises entre la plus petite et la plus grande
+        colonne demandée
+
+        :param config: Configuration pour la lecture
+        :param column_indices: Indices des colonnes nécessaires
+        :return: Itérateur de tuples (numéro de ligne, valeurs projetées),
+            les valeurs étant indexées à partir de min(column_indices)
+        """
+        end_row = self.resolve_end_row(config)
+        if end_row < config.start_row:
+            # openpyxl interprète max_row=0 comme « jusqu'à la fin »
+            return iter(())
+
+        rows = self.sheet.iter_rows(
+            min_row=config.start_row,
+            max_row=end_row,
+            min_col=min(column_indices),
+            max_col=max(column_indices),
+            values_only=True,
+        )
+        return enumerate(
+            self._track_rows(rows, end_row - config.start_row + 1),
+            start=config.start_row,
+        )
+
     def extract_unique_profiles(self, config: AnalysisConfiguration) -> List[str]:
         """
         Extrait les profils uniques du fichier Excel
 
+        :param config: Configuration pour l'extraction
+        :return: Liste des profils uniques
+        """
+        if self.cache is not None:
+            key = self.cache.make_key(self.file_path, "profiles", config)
+            arrays = self.cache.load_arrays(key)
+            if arrays is not None:
+                return arrays["profiles"].tolist()
+
+            profiles = self._extract_unique_profiles(config)
+            self._store_in_cache(
+                self.cache.store_arrays,
+                key,
+                {"profiles": np.asarray(profiles, dtype=str)},
+            )
+            return profiles
+
+        return self._extract_unique_profiles(config)
+
+    def _extract_unique_profiles(self, config: AnalysisConfiguration) -> List[str]:
+        """
+        Extrait les profils uniques en lisant la feuille
+
         :param config: Configuration pour l'extraction
         :return: Liste des profils uniques
         """
         unique_profiles = set()
         profile_col_idx = column_index_from_string(config.profile_column)
 
-        for row in range(config.start_row, config.end_row + 1):
+        if self.read_only:
+            for _, values in self._iter_projected_rows(config, [profile_col_idx]):
+                if values and values[0]:
+                    unique_profiles.add(str(values[0]))
+            return list(unique_profiles)
+
+        rows = range(config.start_row, self.resolve_end_row(config) + 1)
+        for row in self._track_rows(rows, len(rows)):
             cell_value = self.sheet.cell(row=row, column=profile_col_idx).value
             if cell_value:
                 unique_profiles.add(str(cell_value))
 
         return list(unique_profiles)
 
+    def compile_scan_plan(self, config: AnalysisConfiguration) -> ScanPlan:
+        """
+        Compile le plan de lecture d'une configuration, en limitant les
+        colonnes lues à l'étendue des données
+
+        :param config: Configuration pour la lecture
+        :return: Plan de lecture
+        """
+        # Résoudre la dernière ligne d'abord : l'étendue peut alors être connue
+        self.resolve_end_row(config)
+        max_column = (
+            self._data_extent.last_column if self._data_extent is not None else None
+        )
+        return ScanPlan.compile(config, max_column)
+
     def read_workload_entries(
         self, config: AnalysisConfiguration
     ) -> List[WorkloadEntry]:
@@ -52,49 +318,141 @@ class ExcelReader:
         :param config: Configuration pour la lecture
         :return: Liste des entrées de charge de travail
         """
+        if self.cache is not None:
+            return self.read_workload_table(config).to_entries()
+
+        plan = self.compile_scan_plan(config)
+        if self.read_only:
+            return self._read_workload_entries_streaming(config, plan)
+
         workload_entries = []
+        rows = range(config.start_row, self.resolve_end_row(config) + 1)
+        for row in self._track_rows(rows, len(rows)):
+            # Colonnes clés d'abord : les heures ne sont lues que si la ligne est retenue
+            profile = self.sheet.cell(row=row, column=plan.profile_col_idx).value
+            if not plan.accepts_profile(profile):
+                continue
 
-        # Indices des colonnes
-        profile_col_idx = column_index_from_string(config.profile_column)
-        start_col_idx = column_index_from_string(config.start_column)
-        end_col_idx = column_index_from_string(config.end_column)
-        pm_col_idx = column_index_from_string("B")  # Colonne chef de projet
-        project_col_idx = column_index_from_string("D")  # Colonne projet
-        jira_col_idx = column_index_from_string("F")  # Colonne ticket JIRA
-
-        for row in range(config.start_row, config.end_row + 1):
-            # Vérifier si le profil est dans la liste des profils sélectionnés (si fournie)
-            profile = self.sheet.cell(row=row, column=profile_col_idx).value
-
-            if not config.selected_profiles or (
-                profile and str(profile) in config.selected_profiles
-            ):
-
-                # Calculer la charge de travail totale pour cette ligne
-                row_total = sum(
-                    cell.value or 0
-                    for col_idx in range(start_col_idx, end_col_idx + 1)
-                    for cell in [self.sheet.cell(row=row, column=col_idx)]
-                    if isinstance(cell.value, (int, float))
+            pm_name = self.sheet.cell(row=row, column=plan.pm_col_idx).value
+            project_name = self.sheet.cell(row=row, column=plan.project_col_idx).value
+            if not (pm_name and project_name):
+                continue
+
+            # Calculer la charge de travail totale pour cette ligne
+            row_total = sum(
+                cell.value or 0
+                for col_idx in range(plan.start_col_idx, plan.scan_end_col_idx + 1)
+                for cell in [self.sheet.cell(row=row, column=col_idx)]
+                if isinstance(cell.value, (int, float))
+            )
+            if not plan.accepts_workload(row_total):
+                continue
+
+            jira_ticket = self.sheet.cell(row=row, column=plan.jira_col_idx).value
+            workload_entries.append(
+                WorkloadEntry(
+                    project_manager=str(pm_name),
+                    project=str(project_name),
+                    profile=str(profile),
+                    jira_ticket=str(jira_ticket) if jira_ticket else None,
+                    workload=row_total,
                 )
+            )
 
-                # Récupérer les autres informations
-                pm_name = self.sheet.cell(row=row, column=pm_col_idx).value
-                project_name = self.sheet.cell(row=row, column=project_col_idx).value
-                jira_ticket = self.sheet.cell(row=row, column=jira_col_idx).value
-
-                if pm_name and project_name:
-                    entry = WorkloadEntry(
-                        project_manager=str(pm_name),
-                        project=str(project_name),
-                        profile=str(profile),
-                        jira_ticket=str(jira_ticket) if jira_ticket else None,
-                        workload=row_total,
-                    )
-                    workload_entries.append(entry)
+        return workload_entries
+
+    def _read_workload_entries_streaming(
+        self, config: AnalysisConfiguration, plan: ScanPlan
+    ) -> List[WorkloadEntry]:
+        """
+        Variante en flux de read_workload_entries : chaque ligne est lue une
+        seule fois sous forme de tuple de valeurs, limité aux colonnes utiles
+
+        :param config: Configuration pour la lecture
+        :param plan: Plan de lecture compilé
+        :return: Liste des entrées de charge de travail
+        """
+        workload_entries = []
+
+        for _, values in self._iter_projected_rows(
+            config, [plan.first_col_idx, plan.last_col_idx]
+        ):
+            decoded = plan.decode(values)
+            if decoded is None:
+                continue
+
+            pm_name, project_name, profile, jira_ticket, hours = decoded
+            workload_entries.append(
+                WorkloadEntry(
+                    project_manager=pm_name,
+                    project=project_name,
+                    profile=profile,
+                    jira_ticket=jira_ticket,
+                    workload=sum(hours),
+                )
+            )
 
         return workload_entries
 
+    def read_workload_table(self, config: AnalysisConfiguration) -> WorkloadTable:
+        """
+        Lit les entrées de charge de travail sous forme de table colonnaire,
+        en conservant les heures de chaque colonne de semaine
+
+        Les lignes retenues sont les mêmes que pour read_workload_entries.
+        Si un cache est configuré et valide pour l'état actuel du fichier,
+        la table est rechargée depuis le cache sans ouvrir le classeur.
+
+        :param config: Configuration pour la lecture
+        :return: Table de charge de travail
+        """
+        if self.cache is None:
+            return self._read_workload_table(config)
+
+        key = self.cache.make_key(self.file_path, "table", config)
+        table = self.cache.load_table(key)
+        if table is None:
+            table = self._read_workload_table(config)
+            self._store_in_cache(self.cache.store_table, key, table)
+        return table
+
+    def _store_in_cache(self, store: Callable[[str, Any], None], key: str, value: Any):
+        """
+        Enregistre des données lues dans le cache
+
+        Un échec d'écriture (disque plein, répertoire en lecture seule...) est
+        journalisé sans faire échouer la lecture : les données sont simplement
+        relues au prochain appel.
+
+        :param store: Méthode d'enregistrement du cache
+        :param key: Clé de l'entrée
+        :param value: Données à enregistrer
+        """
+        try:
+            store(key, value)
+        except OSError as e:
+            logger.warning("Impossible d'écrire dans le cache: %s", e)
+
+    def _read_workload_table(self, config: AnalysisConfiguration) -> WorkloadTable:
+        """
+        Lit la table de charge de travail depuis la feuille
+
+        Les colonnes de semaine au-delà des données sont complétées par des zéros.
+
+        :param config: Configuration pour la lecture
+        :return: Table de charge de travail
+        """
+        plan = self.compile_scan_plan(config)
+        rows = self._iter_projected_rows(
+            config, [plan.first_col_idx, plan.last_col_idx]
+        )
+        decoded_rows = (
+            decoded
+            for decoded in (plan.decode(values) for _, values in rows)
+            if decoded is not None
+        )
+        return WorkloadTable.from_rows(decoded_rows, plan.week_columns)
+
     def get_sheet_names(self) -> List[str]:
         """
         Retourne les noms des feuilles dans le classeur
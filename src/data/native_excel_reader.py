@@ -0,0 +1,333 @@
+﻿import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+
+from openpyxl.styles.numbers import (
+    BUILTIN_FORMATS,
+    is_date_format,
+    is_timedelta_format,
+)
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+from openpyxl.utils.datetime import from_excel, from_ISO8601
+
+from src.data.excel_reader import ExcelReader
+from src.data.workbook_cache import WorkbookCache
+
+# Espace de noms des relations du paquet OOXML
+RELATIONSHIP_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+
+def _local_name(tag: str) -> str:
+    """
+    Retire l'espace de noms d'une balise XML ("{ns}row" -> "row")
+    """
+    return tag.rsplit("}", 1)[-1]
+
+
+def _column_index(reference: str) -> int:
+    """
+    Convertit une référence de cellule ("AB12") en indice de colonne (28)
+    """
+    index = 0
+    for char in reference:
+        if char.isdigit():
+            break
+        index = index * 26 + ord(char) - 64
+    return index
+
+
+def _text_content(element: ET.Element, text_tag: str, phonetic_tag: str) -> str:
+    """
+    Concatène le texte d'une chaîne (simple ou enrichie), hors annotations
+    phonétiques, comme le fait openpyxl
+    """
+    parts = []
+    for child in element:
+        if child.tag == text_tag:
+            parts.append(child.text or "")
+        elif child.tag != phonetic_tag:
+            parts.extend(t.text or "" for t in child.iter(text_tag))
+    return "".join(parts).replace("x005F_", "")
+
+
+class _XlsxWorkbook:
+    """
+    Accès minimal au paquet .xlsx : noms des feuilles, feuille active,
+    table des chaînes partagées et styles de date
+    """
+
+    def __init__(self, file_path: str):
+        self.archive = zipfile.ZipFile(file_path)
+        self.sheetnames: List[str] = []
+        self._sheet_paths: List[str] = []
+        self._active_index = 0
+        self.epoch = CALENDAR_WINDOWS_1900
+        self.date_styles: set = set()
+        self.timedelta_styles: set = set()
+        self._shared_strings: Optional[List[str]] = None
+
+        self._read_workbook()
+        self._read_styles()
+
+    def _read_workbook(self):
+        workbook_path = "xl/workbook.xml"
+        relations = self._read_relations(workbook_path)
+
+        root = ET.fromstring(self.archive.read(workbook_path))
+        for element in root.iter():
+            name = _local_name(element.tag)
+            if name == "workbookPr" and element.get("date1904") in ("1", "true"):
+                self.epoch = CALENDAR_MAC_1904
+            elif name == "workbookView":
+                self._active_index = int(element.get("activeTab", 0))
+            elif name == "sheet":
+                relation_id = element.get(f"{{{RELATIONSHIP_NS}}}id")
+                self.sheetnames.append(element.get("name"))
+                self._sheet_paths.append(relations[relation_id])
+
+    def _read_relations(self, part_path: str) -> Dict[str, str]:
+        """
+        Lit les relations d'une partie du paquet et résout leurs cibles
+        """
+        folder, name = posixpath.split(part_path)
+        rels_path = posixpath.join(folder, "_rels", name + ".rels")
+        root = ET.fromstring(self.archive.read(rels_path))
+
+        relations = {}
+        for element in root:
+            target = element.get("Target")
+            if target.startswith("/"):
+                target = target[1:]
+            else:
+                target = posixpath.normpath(posixpath.join(folder, target))
+            relations[element.get("Id")] = target
+        return relations
+
+    def _read_styles(self):
+        """
+        Repère les styles de cellule dont le format numérique est une date
+        """
+        try:
+            root = ET.fromstring(self.archive.read("xl/styles.xml"))
+        except KeyError:
+            return
+
+        formats = dict(BUILTIN_FORMATS)
+        style_formats = []
+        for element in root:
+            name = _local_name(element.tag)
+            if name == "numFmts":
+                for fmt in element:
+                    formats[int(fmt.get("numFmtId"))] = fmt.get("formatCode")
+            elif name == "cellXfs":
+                style_formats = [int(xf.get("numFmtId", 0)) for xf in element]
+
+        for style_id, format_id in enumerate(style_formats):
+            code = formats.get(format_id)
+            if code and is_date_format(code):
+                self.date_styles.add(style_id)
+                if is_timedelta_format(code):
+                    self.timedelta_styles.add(style_id)
+
+    @property
+    def shared_strings(self) -> List[str]:
+        """
+        Table des chaînes partagées, lue en flux à la première utilisation
+        """
+        if self._shared_strings is None:
+            self._shared_strings = self._read_shared_strings()
+        return self._shared_strings
+
+    def _read_shared_strings(self) -> List[str]:
+        try:
+            source = self.archive.open("xl/sharedStrings.xml")
+        except KeyError:
+            return []
+
+        strings = []
+        with source:
+            tags = None
+            for _, element in ET.iterparse(source, events=("end",)):
+                if tags is None:
+                    namespace = element.tag[: -len(_local_name(element.tag))]
+                    tags = (namespace + "si", namespace + "t", namespace + "rPh")
+                if element.tag == tags[0]:
+                    strings.append(_text_content(element, tags[1], tags[2]))
+                    element.clear()
+        return strings
+
+    @property
+    def active_sheet_path(self) -> str:
+        return self._sheet_paths[self._active_index]
+
+    def close(self):
+        self.archive.close()
+
+
+class _XlsxSheet:
+    """
+    Feuille lue en flux avec ElementTree.iterparse
+
+    Expose le sous-ensemble de l'API openpyxl utilisé par ExcelReader
+    (iter_rows avec values_only=True).
+    """
+
+    def __init__(self, workbook: _XlsxWorkbook, sheet_path: str):
+        self.workbook = workbook
+        self.sheet_path = sheet_path
+
+    def iter_rows(
+        self,
+        min_row: int = 1,
+        max_row: Optional[int] = None,
+        min_col: int = 1,
+        max_col: Optional[int] = None,
+        values_only: bool = True,
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        Parcourt les valeurs des lignes, en complétant lignes et cellules
+        absentes par None, comme le mode lecture seule d'openpyxl
+
+        :param min_row: Première ligne
+        :param max_row: Dernière ligne (fin de feuille si None)
+        :param min_col: Première colonne projetée
+        :param max_col: Dernière colonne projetée (dernière cellule de chaque
+            ligne si None, les lignes ayant alors des longueurs variables)
+        :param values_only: Seul le mode valeurs est supporté
+        :return: Itérateur de tuples de valeurs
+        """
+        if not values_only:
+            raise ValueError("Seule la lecture des valeurs est supportée")
+
+        width = max_col - min_col + 1 if max_col is not None else None
+        empty_row = (None,) * width if width is not None else ()
+        next_row = min_row
+
+        with self.workbook.archive.open(self.sheet_path) as source:
+            row_tag = None
+            row_counter = 0
+            for _, element in ET.iterparse(source, events=("end",)):
+                if row_tag is None:
+                    namespace = element.tag[: -len(_local_name(element.tag))]
+                    row_tag = namespace + "row"
+                    cell_tags = (namespace + "c", namespace + "v", namespace + "is")
+                    text_tags = (namespace + "t", namespace + "rPh")
+                if element.tag != row_tag:
+                    continue
+
+                row_counter = int(element.get("r", row_counter + 1))
+                if max_row is not None and row_counter > max_row:
+                    break
+                if row_counter < min_row:
+                    element.clear()
+                    continue
+
+                while next_row < row_counter:
+                    yield empty_row
+                    next_row += 1
+
+                cells = []
+                col_counter = 0
+                for cell in element:
+                    if cell.tag != cell_tags[0]:
+                        continue
+                    reference = cell.get("r")
+                    col_counter = (
+                        _column_index(reference) if reference else col_counter + 1
+                    )
+                    if col_counter >= min_col and (
+                        max_col is None or col_counter <= max_col
+                    ):
+                        cells.append(
+                            (col_counter, self._cell_value(cell, cell_tags, text_tags))
+                        )
+                element.clear()
+
+                row_width = width
+                if row_width is None:
+                    row_width = cells[-1][0] - min_col + 1 if cells else 0
+                values = [None] * row_width
+                for col_idx, value in cells:
+                    values[col_idx - min_col] = value
+                yield tuple(values)
+                next_row = row_counter + 1
+
+        if max_row is not None:
+            while next_row <= max_row:
+                yield empty_row
+                next_row += 1
+
+    def _cell_value(
+        self,
+        cell: ET.Element,
+        cell_tags: Tuple[str, str, str],
+        text_tags: Tuple[str, str],
+    ) -> Any:
+        """
+        Décode la valeur (mise en cache) d'une cellule
+        """
+        data_type = cell.get("t", "n")
+
+        if data_type == "inlineStr":
+            inline = cell.find(cell_tags[2])
+            return _text_content(inline, *text_tags) if inline is not None else None
+
+        value = cell.findtext(cell_tags[1]) or None
+        if value is None:
+            return None
+
+        if data_type == "n":
+            number = (
+                float(value)
+                if "." in value or "E" in value or "e" in value
+                else int(value)
+            )
+            style_id = int(cell.get("s", 0))
+            if style_id in self.workbook.date_styles:
+                try:
+                    return from_excel(
+                        number,
+                        self.workbook.epoch,
+                        timedelta=style_id in self.workbook.timedelta_styles,
+                    )
+                except (OverflowError, ValueError):
+                    return "#VALUE!"
+            return number
+        if data_type == "s":
+            return self.workbook.shared_strings[int(value)]
+        if data_type == "b":
+            return bool(int(value))
+        if data_type == "d":
+            return from_ISO8601(value)
+        # "str" (résultat de formule) et "e" (erreur) sont renvoyés tels quels
+        return value
+
+
+class NativeExcelReader(ExcelReader):
+    """
+    Lecteur Excel qui analyse directement le XML du paquet .xlsx
+
+    Seules les valeurs de la feuille active et la table des chaînes partagées
+    sont lues, en flux, sans construire le modèle objet d'openpyxl. Les
+    lignes sont projetées sur les colonnes utiles à la configuration.
+    """
+
+    def __init__(self, file_path: str, cache: Optional[WorkbookCache] = None):
+        """
+        Initialise le lecteur natif
+
+        :param file_path: Chemin du fichier Excel à charger
+        :param cache: Cache disque des données extraites
+        """
+        super().__init__(file_path, read_only=True, cache=cache)
+
+    def _load_workbook(self):
+        """
+        Ouvre le paquet .xlsx et localise la feuille active
+        """
+        try:
+            self._workbook = _XlsxWorkbook(self.file_path)
+            self._sheet = _XlsxSheet(self._workbook, self._workbook.active_sheet_path)
+        except Exception as e:
+            raise ValueError(f"Impossible de charger le fichier Excel: {str(e)}")
@@ -1,252 +1,293 @@
-﻿from typing import List, Dict, Any
+﻿from collections import OrderedDict
+from dataclasses import replace
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from openpyxl.utils import column_index_from_string, get_column_letter
 from src.data.excel_reader import ExcelReader
-from src.data.data_models import WorkloadEntry, AnalysisConfiguration, ProfileWorkload
+from src.data.data_models import (
+    WorkloadEntry,
+    AnalysisConfiguration,
+    ProfileWorkload,
+    WorkloadSummary,
+)
+from src.data.workload_table import WorkloadTable
+
+# Nombre de tables conservées par défaut dans le cache des résultats
+DEFAULT_MAX_CACHED_TABLES = 16
 
 
 class WorkloadRepository:
-    def __init__(self, excel_reader: ExcelReader):
+    def __init__(
+        self,
+        excel_reader: ExcelReader,
+        max_cached_tables: int = DEFAULT_MAX_CACHED_TABLES,
+    ):
         """
         Initialise le dépôt de données de charge de travail
 
+        Seule la table hebdomadaire non filtrée (toutes les colonnes de la
+        feuille) est lue, puis conservée par configuration de lecture (colonne
+        des profils, plage de lignes) dans un cache LRU borné. Plages de
+        semaines, profils sélectionnés et seuils de charge en sont dérivés par
+        masque : les requêtes répétées sur un classeur ouvert ne relisent pas
+        la feuille. Le cache est vidé dès que le fichier est modifié.
+
         :param excel_reader: Instance du lecteur Excel
+        :param max_cached_tables: Nombre maximal de tables conservées
         """
         self.excel_reader = excel_reader
+        self.max_cached_tables = max_cached_tables
+        self._tables: "OrderedDict[Tuple[Any, ...], WorkloadTable]" = OrderedDict()
 
-    def get_all_workload_entries(
-        self, config: AnalysisConfiguration, min_workload: float = 0.01
-    ) -> List[WorkloadEntry]:
+    def clear_cache(self):
         """
-        Récupère toutes les entrées de charge de travail significatives
-
-        :param config: Configuration pour la lecture
-        :param min_workload: Charge de travail minimale à considérer
-        :return: Liste des entrées de charge de travail
+        Vide le cache des résultats
         """
-        all_entries = self.excel_reader.read_workload_entries(config)
-        return [entry for entry in all_entries if entry.workload >= min_workload]
+        self._tables.clear()
 
-    def get_profiles_workload(
-        self, config: AnalysisConfiguration, min_workload: float = 0.01
-    ) -> List[ProfileWorkload]:
+    def _refresh(self):
         """
-        Calcule la charge de travail par profil en filtrant les projets significatifs
-
-        :param config: Configuration pour la lecture
-        :param min_workload: Charge de travail minimale à considérer
-        :return: Liste des charges de travail par profil
+        Relit le fichier et vide le cache des résultats s'il a été modifié
         """
-        workload_entries = self.get_all_workload_entries(config, min_workload)
+        if self.excel_reader.has_changed():
+            self.excel_reader.reload()
+            self.clear_cache()
 
-        # Regroupement par profil
-        profiles_workload = {}
-
-        for entry in workload_entries:
-            if entry.profile not in profiles_workload:
-                profiles_workload[entry.profile] = ProfileWorkload(
-                    profile=entry.profile, total_workload=0, projects=[]
-                )
-
-            profile_data = profiles_workload[entry.profile]
-            profile_data.total_workload += entry.workload
-            profile_data.projects.append(entry)
-
-        return list(profiles_workload.values())
-
-    def get_detailed_workload_by_project_manager(
-        self, config: AnalysisConfiguration, min_workload: float = 0.01
-    ) -> Dict[str, Dict[str, List[WorkloadEntry]]]:
+    def _cached_table(self, config: AnalysisConfiguration) -> WorkloadTable:
         """
-        Récupère la charge de travail détaillée par chef de projet et par projet
-        Filtre les projets avec une charge de travail significative
+        Retourne la table d'une configuration, lue seulement en cas d'absence
 
-        :param config: Configuration pour la lecture
-        :param min_workload: Charge de travail minimale à considérer
-        :return: Dictionnaire hiérarchique de la charge de travail
+        :param config: Configuration de lecture
+        :return: Table de charge de travail
         """
-        workload_entries = self.get_all_workload_entries(config, min_workload)
-
-        # Regroupement par chef de projet, puis par projet
-        detailed_workload = {}
-
-        for entry in workload_entries:
-            if entry.project_manager not in detailed_workload:
-                detailed_workload[entry.project_manager] = {}
-
-            if entry.project not in detailed_workload[entry.project_manager]:
-                detailed_workload[entry.project_manager][entry.project] = []
-
-            detailed_workload[entry.project_manager][entry.project].append(entry)
-
-        # Filtrer pour ne garder que les chefs de projet et projets avec une charge significative
-        return detailed_workload
+        key = config.cache_key()
+        table = self._tables.get(key)
+        if table is not None:
+            self._tables.move_to_end(key)
+            return table
+
+        table = self.excel_reader.read_workload_table(config)
+        self._tables[key] = table
+        while len(self._tables) > self.max_cached_tables:
+            self._tables.popitem(last=False)
+        return table
+
+    def get_workload_table(
+        self, config: AnalysisConfiguration, min_workload: Optional[float] = None
+    ) -> WorkloadTable:
+        """
+        Récupère les entrées de charge de travail sous forme de table colonnaire
 
+        La table est extraite de la table hebdomadaire : mêmes lignes et mêmes
+        heures qu'une lecture directe de la configuration, colonnes au-delà
+        des données complétées par des zéros.
 
-from typing import List, Dict, Any
-from src.data.excel_reader import ExcelReader
-from src.data.data_models import WorkloadEntry, AnalysisConfiguration, ProfileWorkload
+        :param config: Configuration pour la lecture
+        :param min_workload: Charge de travail minimale d'une entrée (prioritaire
+            sur celle de la configuration)
+        :return: Table de charge de travail
+        """
+        config = self._with_min_workload(config, min_workload)
+        weekly = self.get_weekly_table(config)
+
+        first_column = column_index_from_string(config.start_column)
+        last_column = column_index_from_string(config.end_column)
+        # La table hebdomadaire commence à la colonne A
+        available = len(weekly.week_columns)
+        table = weekly.select_weeks(
+            min(first_column - 1, available), min(last_column, available)
+        )
+        padding = last_column - max(first_column - 1, available)
+        if padding > 0:
+            table = WorkloadTable(
+                codes=table.codes,
+                categories=table.categories,
+                hours=np.hstack([table.hours, np.zeros((len(table), padding))]),
+                week_columns=table.week_columns
+                + [
+                    get_column_letter(col_idx)
+                    for col_idx in range(last_column - padding + 1, last_column + 1)
+                ],
+            )
 
+        rows = np.ones(len(table), dtype=bool)
+        if config.selected_profiles:
+            rows &= table.mask_for("profile", config.selected_profiles)
+        if config.min_workload is not None:
+            rows &= table.workload >= config.min_workload
+        return table if rows.all() else table.take(rows)
 
-class WorkloadRepository:
-    def __init__(self, excel_reader: ExcelReader):
+    def get_weekly_table(self, config: AnalysisConfiguration) -> WorkloadTable:
         """
-        Initialise le dépôt de données de charge de travail
+        Récupère la table des heures de toutes les colonnes, de A jusqu'à la
+        dernière colonne de données, pour pouvoir changer ensuite la plage de
+        semaines sans relire le classeur
 
-        :param excel_reader: Instance du lecteur Excel
+        Les colonnes configurées, les profils sélectionnés et le seuil de
+        charge sont ignorés : ils s'appliquent à la table fenêtrée.
+
+        :param config: Configuration pour la lecture
+        :return: Table de charge de travail, colonnes de semaine à partir de A
         """
-        self.excel_reader = excel_reader
+        self._refresh()
+        last_column = max(self.excel_reader.detect_data_extent().last_column, 1)
+        return self._cached_table(
+            replace(
+                config,
+                start_column="A",
+                end_column=get_column_letter(last_column),
+                selected_profiles=[],
+                min_workload=None,
+            )
+        )
 
     def get_all_workload_entries(
-        self, config: AnalysisConfiguration, min_workload: float = 0.01
+        self, config: AnalysisConfiguration, min_workload: Optional[float] = None
     ) -> List[WorkloadEntry]:
         """
-        Récupère toutes les entrées de charge de travail avec un seuil minimal
+        Récupère toutes les entrées de charge de travail
 
         :param config: Configuration pour la lecture
-        :param min_workload: Charge de travail minimale à considérer
+        :param min_workload: Charge de travail minimale d'une entrée (prioritaire
+            sur celle de la configuration)
         :return: Liste des entrées de charge de travail
         """
-        all_entries = self.excel_reader.read_workload_entries(config)
-        return [entry for entry in all_entries if entry.workload >= min_workload]
+        return self.get_workload_table(config, min_workload).to_entries()
 
     def get_profiles_workload(
-        self, config: AnalysisConfiguration, min_workload: float = 0.01
+        self, config: AnalysisConfiguration, min_workload: Optional[float] = None
     ) -> List[ProfileWorkload]:
         """
-        Calcule la charge de travail par profil en filtrant les projets significatifs
+        Calcule la charge de travail par profil
 
         :param config: Configuration pour la lecture
-        :param min_workload: Charge de travail minimale à considérer
+        :param min_workload: Charge de travail minimale d'une entrée (prioritaire
+            sur celle de la configuration)
         :return: Liste des charges de travail par profil
         """
-        workload_entries = self.get_all_workload_entries(config, min_workload)
-
-        # Regroupement par profil
-        profiles_workload = {}
-
-        for entry in workload_entries:
-            if entry.profile not in profiles_workload:
-                profiles_workload[entry.profile] = ProfileWorkload(
-                    profile=entry.profile, total_workload=0, projects=[]
-                )
-
-            profile_data = profiles_workload[entry.profile]
-            profile_data.total_workload += entry.workload
-            profile_data.projects.append(entry)
-
-        return list(profiles_workload.values())
+        return self.build_profiles_workload(
+            self.get_workload_table(config, min_workload)
+        )
 
     def get_detailed_workload_by_project_manager(
-        self, config: AnalysisConfiguration, min_workload: float = 0.01
+        self, config: AnalysisConfiguration, min_workload: Optional[float] = None
     ) -> Dict[str, Dict[str, List[WorkloadEntry]]]:
         """
         Récupère la charge de travail détaillée par chef de projet et par projet
-        Filtre les projets avec une charge de travail significative
 
         :param config: Configuration pour la lecture
-        :param min_workload: Charge de travail minimale à considérer
+        :param min_workload: Charge de travail minimale d'une entrée (prioritaire
+            sur celle de la configuration)
         :return: Dictionnaire hiérarchique de la charge de travail
         """
-        workload_entries = self.get_all_workload_entries(config, min_workload)
-
-        # Regroupement par chef de projet, puis par projet
-        detailed_workload = {}
+        return self.build_detailed_workload(
+            self.get_workload_table(config, min_workload)
+        )
 
-        for entry in workload_entries:
-            if entry.project_manager not in detailed_workload:
-                detailed_workload[entry.project_manager] = {}
-
-            if entry.project not in detailed_workload[entry.project_manager]:
-                detailed_workload[entry.project_manager][entry.project] = []
-
-            detailed_workload[entry.project_manager][entry.project].append(entry)
-
-        # Filtrer pour ne garder que les chefs de projet et projets avec une charge significative
-        return {
-            pm: {
-                project: entries
-                for project, entries in projects.items()
-                if sum(entry.workload for entry in entries) >= min_workload
-            }
-            for pm, projects in detailed_workload.items()
-            if any(
-                sum(entry.workload for entry in entries) >= min_workload
-                for entries in projects.values()
-            )
-        }
-
-
-from typing import List, Dict, Any
-from src.data.excel_reader import ExcelReader
-from src.data.data_models import WorkloadEntry, AnalysisConfiguration, ProfileWorkload
-
-
-class WorkloadRepository:
-    def __init__(self, excel_reader: ExcelReader):
+    def get_workload_summary(
+        self, config: AnalysisConfiguration, min_workload: Optional[float] = None
+    ) -> WorkloadSummary:
         """
-        Initialise le dépôt de données de charge de travail
+        Calcule en un seul passage les vues globale et détaillée, ainsi que
+        leurs sous-totaux
 
-        :param excel_reader: Instance du lecteur Excel
+        :param config: Configuration pour la lecture
+        :param min_workload: Charge de travail minimale d'une entrée (prioritaire
+            sur celle de la configuration)
+        :return: Résultats d'analyse complets
         """
-        self.excel_reader = excel_reader
+        return self.build_summary(self.get_workload_table(config, min_workload))
 
-    def get_all_workload_entries(
-        self, config: AnalysisConfiguration
-    ) -> List[WorkloadEntry]:
+    @staticmethod
+    def _with_min_workload(
+        config: AnalysisConfiguration, min_workload: Optional[float]
+    ) -> AnalysisConfiguration:
         """
-        Récupère toutes les entrées de charge de travail
-
-        :param config: Configuration pour la lecture
-        :return: Liste des entrées de charge de travail
+        Reporte le seuil de charge dans la configuration, pour qu'il soit
+        appliqué avec les autres filtres
         """
-        return self.excel_reader.read_workload_entries(config)
+        if min_workload is None:
+            return config
+        return replace(config, min_workload=min_workload)
 
-    def get_profiles_workload(
-        self, config: AnalysisConfiguration
-    ) -> List[ProfileWorkload]:
+    @staticmethod
+    def build_profiles_workload(table: WorkloadTable) -> List[ProfileWorkload]:
         """
-        Calcule la charge de travail par profil
+        Regroupe une table par profil (totaux calculés par bincount)
 
-        :param config: Configuration pour la lecture
+        :param table: Table de charge de travail
         :return: Liste des charges de travail par profil
         """
-        workload_entries = self.get_all_workload_entries(config)
-
-        # Regroupement par profil
-        profiles_workload = {}
-
-        for entry in workload_entries:
-            if entry.profile not in profiles_workload:
-                profiles_workload[entry.profile] = ProfileWorkload(
-                    profile=entry.profile, total_workload=0, projects=[]
-                )
-
-            profile_data = profiles_workload[entry.profile]
-            profile_data.total_workload += entry.workload
-            profile_data.projects.append(entry)
-
-        return list(profiles_workload.values())
+        entries = table.to_entries()
+        totals = table.group_sum("profile")
+
+        return [
+            ProfileWorkload(
+                profile=profile,
+                total_workload=totals[profile],
+                projects=[entries[row] for row in rows.tolist()],
+            )
+            for profile, rows in table.group_indices("profile").items()
+        ]
 
-    def get_detailed_workload_by_project_manager(
-        self, config: AnalysisConfiguration
+    @staticmethod
+    def build_detailed_workload(
+        table: WorkloadTable,
     ) -> Dict[str, Dict[str, List[WorkloadEntry]]]:
         """
-        Récupère la charge de travail détaillée par chef de projet et par projet
+        Regroupe une table par chef de projet, puis par projet
 
-        :param config: Configuration pour la lecture
+        :param table: Table de charge de travail
         :return: Dictionnaire hiérarchique de la charge de travail
         """
-        workload_entries = self.get_all_workload_entries(config)
+        entries = table.to_entries()
 
-        # Regroupement par chef de projet, puis par projet
-        detailed_workload = {}
+        return {
+            pm: {
+                project: [entries[row] for row in project_rows.tolist()]
+                for project, project_rows in table.group_indices(
+                    "project", pm_rows
+                ).items()
+            }
+            for pm, pm_rows in table.group_indices("project_manager").items()
+        }
 
-        for entry in workload_entries:
-            if entry.project_manager not in detailed_workload:
-                detailed_workload[entry.project_manager] = {}
+    @staticmethod
+    def build_summary(table: WorkloadTable) -> WorkloadSummary:
+        """
+        Construit à partir d'une table les charges par profil, la hiérarchie
+        chef de projet -> projet -> entrées, les charges par profil de chaque
+        chef de projet et les totaux par projet
 
-            if entry.project not in detailed_workload[entry.project_manager]:
-                detailed_workload[entry.project_manager][entry.project] = []
+        Les totaux sont des sommes groupées de la table (bincount) ; les
+        entrées ne sont reconstruites qu'une fois, pour les listes de détail.
 
-            detailed_workload[entry.project_manager][entry.project].append(entry)
+        :param table: Table de charge de travail
+        :return: Résultats d'analyse complets
+        """
+        entries = table.to_entries()
+        summary = WorkloadSummary(total_workload=float(table.workload.sum()))
+
+        profile_totals = table.group_sum("profile")
+        summary.profiles_workload = [
+            ProfileWorkload(
+                profile=profile,
+                total_workload=profile_totals[profile],
+                projects=[entries[row] for row in rows.tolist()],
+            )
+            for profile, rows in table.group_indices("profile").items()
+        ]
+
+        for pm, pm_rows in table.group_indices("project_manager").items():
+            summary.detailed_workload[pm] = {
+                project: [entries[row] for row in project_rows.tolist()]
+                for project, project_rows in table.group_indices(
+                    "project", pm_rows
+                ).items()
+            }
+            summary.profiles_by_project_manager[pm] = table.group_sum(
+                "profile", pm_rows
+            )
+            summary.project_totals[pm] = table.group_sum("project", pm_rows)
 
-        return detailed_workload
+        return summary
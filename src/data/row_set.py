@@ -0,0 +1,320 @@
+﻿import dataclasses
+import hashlib
+import io
+import zlib
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from src.data.workload_table import WorkloadTable, DIMENSIONS, occurrence_numbers
+
+# Nature des différences entre deux versions d'une ligne
+ADDED, MODIFIED, REMOVED = 0, 1, 2
+CHANGE_KINDS = ("added", "modified", "removed")
+
+# Écart de charge en dessous duquel une ligne est considérée inchangée
+ROW_TOLERANCE = 1e-9
+
+
+def _mix(hashes: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Combine des empreintes 64 bits avec de nouvelles valeurs (finaliseur
+    splitmix64, appliqué à tout un vecteur)
+    """
+    x = hashes ^ values
+    x ^= x >> np.uint64(30)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(27)
+    x *= np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return x
+
+
+def _text_hashes(values: List[str]) -> np.ndarray:
+    """
+    Empreintes 64 bits stables de libellés, suivies de celle de None (0)
+    """
+    return np.asarray(
+        [
+            int.from_bytes(
+                hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(),
+                "little",
+            )
+            for value in values
+        ]
+        + [0],
+        dtype=np.uint64,
+    )
+
+
+def _lookup(reference: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """
+    Position de chaque clé dans un tableau de clés distinctes (-1 si absente)
+    """
+    if len(reference) == 0:
+        return np.full(len(keys), -1, dtype=np.intp)
+    sorter = np.argsort(reference)
+    sorted_reference = reference[sorter]
+    index = np.minimum(np.searchsorted(sorted_reference, keys), len(reference) - 1)
+    return np.where(sorted_reference[index] == keys, sorter[index], -1)
+
+
+@dataclass
+class RowSet:
+    """
+    Version des lignes d'un instantané : table de charge de travail, clé
+    d'identité stable de chaque ligne et empreinte de ses heures
+
+    La clé combine le chef de projet, le projet, le profil, le ticket et le
+    numéro d'occurrence de cette combinaison ; elle ne dépend ni de l'ordre
+    des lignes ni des codes de la table, et se compare donc d'une version à
+    l'autre. Clés et empreintes sont calculées par des opérations vectorielles.
+    """
+
+    table: WorkloadTable
+    keys: np.ndarray
+    hashes: np.ndarray
+    occurrences: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def from_table(cls, table: WorkloadTable) -> "RowSet":
+        """
+        Calcule les clés et empreintes des lignes d'une table
+
+        :param table: Table de charge de travail
+        :return: Version des lignes
+        """
+        keys = np.zeros(len(table), dtype=np.uint64)
+        for dimension in DIMENSIONS:
+            value_hashes = _text_hashes(table.categories[dimension])
+            keys = _mix(keys, value_hashes[table.codes[dimension]])
+        occurrences = occurrence_numbers(keys)
+        keys = _mix(keys, occurrences.astype(np.uint64))
+
+        # + 0.0 : même empreinte pour 0.0 et -0.0
+        bits = np.ascontiguousarray(table.hours + 0.0).view(np.uint64)
+        hashes = np.full(len(table), bits.shape[1], dtype=np.uint64)
+        for column in range(bits.shape[1]):
+            hashes = _mix(hashes, bits[:, column])
+
+        return cls(table=table, keys=keys, hashes=hashes, occurrences=occurrences)
+
+    def take(self, rows: np.ndarray) -> "RowSet":
+        """
+        Sélectionne des lignes
+
+        :param rows: Indices des lignes
+        :return: Version restreinte à ces lignes
+        """
+        return RowSet(
+            table=self.table.take(rows),
+            keys=self.keys[rows],
+            hashes=self.hashes[rows],
+            occurrences=self.occurrences[rows],
+        )
+
+    @classmethod
+    def concatenate(cls, row_sets: List["RowSet"]) -> "RowSet":
+        """
+        Concatène plusieurs versions de lignes (voir WorkloadTable.concatenate)
+        """
+        return cls(
+            table=WorkloadTable.concatenate([rows.table for rows in row_sets]),
+            keys=np.concatenate([rows.keys for rows in row_sets]),
+            hashes=np.concatenate([rows.hashes for rows in row_sets]),
+            occurrences=np.concatenate([rows.occurrences for rows in row_sets]),
+        )
+
+    def diff(self, previous: "RowSet") -> "RowDelta":
+        """
+        Différences depuis une version précédente, par clé et empreinte
+
+        :param previous: Version précédente
+        :return: Lignes ajoutées et modifiées (dans l'ordre de cette version),
+            puis lignes supprimées (dans l'ordre de la précédente)
+        """
+        position = _lookup(previous.keys, self.keys)
+        matched = position >= 0
+        previous_workloads = np.zeros(len(self))
+        previous_workloads[matched] = previous.table.workload[position[matched]]
+        modified = np.zeros(len(self), dtype=bool)
+        modified[matched] = previous.hashes[position[matched]] != self.hashes[matched]
+
+        changed = np.flatnonzero(~matched | modified)
+        removed = np.flatnonzero(_lookup(self.keys, previous.keys) < 0)
+
+        return RowDelta(
+            rows=RowSet.concatenate([self.take(changed), previous.take(removed)]),
+            changes=np.concatenate(
+                [
+                    np.where(modified[changed], MODIFIED, ADDED),
+                    np.full(len(removed), REMOVED),
+                ]
+            ).astype(np.int8),
+            previous_workloads=np.concatenate(
+                [previous_workloads[changed], previous.table.workload[removed]]
+            ),
+        )
+
+    def apply(self, delta: "RowDelta") -> "RowSet":
+        """
+        Version suivante, obtenue en appliquant des différences
+
+        Les lignes modifiées restent à leur place, les lignes ajoutées sont
+        placées à la fin.
+
+        :param delta: Différences depuis cette version
+        :return: Nouvelle version
+        """
+        position = _lookup(self.keys, delta.rows.keys)
+        modified = delta.changes == MODIFIED
+
+        hours = self.table.hours.copy()
+        hours[position[modified]] = delta.rows.table.hours[modified]
+        hashes = self.hashes.copy()
+        hashes[position[modified]] = delta.rows.hashes[modified]
+
+        keep = np.ones(len(self), dtype=bool)
+        keep[position[delta.changes == REMOVED]] = False
+        kept = RowSet(
+            table=dataclasses.replace(self.table, hours=hours),
+            keys=self.keys,
+            hashes=hashes,
+            occurrences=self.occurrences,
+        ).take(np.flatnonzero(keep))
+        return RowSet.concatenate(
+            [kept, delta.rows.take(np.flatnonzero(delta.changes == ADDED))]
+        )
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Sérialise la version en tableaux NumPy
+
+        :return: Dictionnaire nom -> tableau, compatible avec np.savez
+        """
+        arrays = self.table.to_arrays()
+        arrays.update(
+            row_keys=self.keys, row_hashes=self.hashes, occurrences=self.occurrences
+        )
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "RowSet":
+        """
+        Reconstruit une version sérialisée par to_arrays
+        """
+        return cls(
+            table=WorkloadTable.from_arrays(arrays),
+            keys=arrays["row_keys"],
+            hashes=arrays["row_hashes"],
+            occurrences=arrays["occurrences"],
+        )
+
+
+@dataclass
+class RowDelta:
+    """
+    Différences entre deux versions des lignes d'un instantané
+    """
+
+    # Lignes concernées, dans leur dernière version (avant suppression pour
+    # les lignes supprimées)
+    rows: RowSet
+    # Nature de chaque différence (ADDED, MODIFIED ou REMOVED)
+    changes: np.ndarray
+    # Charge de chaque ligne dans la version précédente (0 pour un ajout)
+    previous_workloads: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def to_changes(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Décrit les différences ligne à ligne
+
+        Une ligne dont seule la répartition des heures entre semaines a changé
+        (charge totale identique à ROW_TOLERANCE près) reste dans les
+        différences stockées, mais n'est pas décrite comme modifiée.
+
+        :return: Lignes ajoutées, supprimées et modifiées, au format de
+            ComparisonService.diff_workload_entries
+        """
+        columns = [self.rows.table.decode(dimension) for dimension in DIMENSIONS]
+        workloads = self.rows.table.workload.tolist()
+        row_changes = {"added": [], "removed": [], "modified": []}
+        for row, (change, occurrence, previous_workload) in enumerate(
+            zip(
+                self.changes.tolist(),
+                self.rows.occurrences.tolist(),
+                self.previous_workloads.tolist(),
+            )
+        ):
+            current_workload = 0.0 if change == REMOVED else workloads[row]
+            if (
+                change == MODIFIED
+                and abs(current_workload - previous_workload) <= ROW_TOLERANCE
+            ):
+                continue
+            row_changes[CHANGE_KINDS[change]].append(
+                {
+                    "project_manager": columns[0][row],
+                    "project": columns[1][row],
+                    "profile": columns[2][row],
+                    "jira_ticket": columns[3][row],
+                    "occurrence": occurrence,
+                    "previous_workload": previous_workload,
+                    "current_workload": current_workload,
+                    "delta": current_workload - previous_workload,
+                }
+            )
+        return row_changes
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Sérialise les différences en tableaux NumPy
+        """
+        arrays = self.rows.to_arrays()
+        arrays.update(changes=self.changes, previous_workloads=self.previous_workloads)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "RowDelta":
+        """
+        Reconstruit des différences sérialisées par to_arrays
+        """
+        return cls(
+            rows=RowSet.from_arrays(arrays),
+            changes=arrays["changes"],
+            previous_workloads=arrays["previous_workloads"],
+        )
+
+
+def pack_arrays(arrays: Dict[str, np.ndarray]) -> bytes:
+    """
+    Sérialise des tableaux au format .npz, compressé par zlib au niveau le
+    plus rapide (np.savez_compressed est quatre fois plus lent pour un gain
+    de place d'environ 20 %)
+
+    :param arrays: Dictionnaire nom -> tableau
+    :return: Contenu binaire
+    """
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return zlib.compress(buffer.getvalue(), 1)
+
+
+def unpack_arrays(data: Optional[bytes]) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Désérialise des tableaux écrits par pack_arrays
+
+    :param data: Contenu binaire (None : aucun tableau)
+    :return: Dictionnaire nom -> tableau, ou None
+    """
+    if data is None:
+        return None
+    with np.load(io.BytesIO(zlib.decompress(data)), allow_pickle=False) as arrays:
+        return {name: arrays[name] for name in arrays.files}
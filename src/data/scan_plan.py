@@ -0,0 +1,147 @@
+﻿from dataclasses import dataclass, field
+from typing import List, Any, Optional, FrozenSet, Sequence, Tuple
+
+from openpyxl.utils import column_index_from_string, get_column_letter
+
+from src.data.data_models import AnalysisConfiguration
+
+# Ligne décodée : (chef de projet, projet, profil, ticket JIRA, heures par semaine)
+DecodedRow = Tuple[str, str, str, Optional[str], List[float]]
+
+
+@dataclass
+class ScanPlan:
+    """
+    Plan de lecture compilé à partir d'une configuration
+
+    Les filtres sont appliqués du moins coûteux au plus coûteux : profil
+    sélectionné, présence du chef de projet et du projet, puis seulement
+    lecture des heures et seuil de charge minimale. Une ligne écartée ne
+    donne lieu ni à la lecture de ses heures ni à la création d'un objet.
+    """
+
+    profile_col_idx: int
+    pm_col_idx: int
+    project_col_idx: int
+    jira_col_idx: int
+    start_col_idx: int
+    # Dernière colonne de semaine réellement lue (au plus la dernière colonne
+    # de données) et dernière colonne configurée, complétée par des zéros
+    scan_end_col_idx: int
+    end_col_idx: int
+    selected_profiles: FrozenSet[str] = frozenset()
+    min_workload: Optional[float] = None
+
+    first_col_idx: int = field(init=False)
+    last_col_idx: int = field(init=False)
+
+    def __post_init__(self):
+        key_columns = [
+            self.profile_col_idx,
+            self.pm_col_idx,
+            self.project_col_idx,
+            self.jira_col_idx,
+        ]
+        self.first_col_idx = min(key_columns + [self.start_col_idx])
+        self.last_col_idx = max(key_columns + [self.scan_end_col_idx])
+
+        # Positions des colonnes dans les tuples projetés
+        self._profile_pos = self.profile_col_idx - self.first_col_idx
+        self._pm_pos = self.pm_col_idx - self.first_col_idx
+        self._project_pos = self.project_col_idx - self.first_col_idx
+        self._jira_pos = self.jira_col_idx - self.first_col_idx
+        self._hours_slice = slice(
+            self.start_col_idx - self.first_col_idx,
+            self.scan_end_col_idx - self.first_col_idx + 1,
+        )
+        self._padding = [0.0] * (self.end_col_idx - self.scan_end_col_idx)
+
+    @classmethod
+    def compile(
+        cls, config: AnalysisConfiguration, max_column: Optional[int] = None
+    ) -> "ScanPlan":
+        """
+        Compile le plan de lecture d'une configuration
+
+        :param config: Configuration pour la lecture
+        :param max_column: Dernière colonne de données, si connue
+        :return: Plan de lecture
+        """
+        start_col_idx = column_index_from_string(config.start_column)
+        end_col_idx = column_index_from_string(config.end_column)
+        scan_end_col_idx = end_col_idx
+        if max_column is not None:
+            scan_end_col_idx = max(min(end_col_idx, max_column), start_col_idx - 1)
+
+        return cls(
+            profile_col_idx=column_index_from_string(config.profile_column),
+            pm_col_idx=column_index_from_string("B"),  # Colonne chef de projet
+            project_col_idx=column_index_from_string("D"),  # Colonne projet
+            jira_col_idx=column_index_from_string("F"),  # Colonne ticket JIRA
+            start_col_idx=start_col_idx,
+            scan_end_col_idx=scan_end_col_idx,
+            end_col_idx=end_col_idx,
+            selected_profiles=frozenset(config.selected_profiles),
+            min_workload=config.min_workload,
+        )
+
+    @property
+    def week_columns(self) -> List[str]:
+        """
+        Lettres des colonnes de semaine configurées
+        """
+        return [
+            get_column_letter(col_idx)
+            for col_idx in range(self.start_col_idx, self.end_col_idx + 1)
+        ]
+
+    def accepts_profile(self, profile: Any) -> bool:
+        """
+        Indique si le profil passe le filtre des profils sélectionnés
+        """
+        return not self.selected_profiles or (
+            bool(profile) and str(profile) in self.selected_profiles
+        )
+
+    def accepts_workload(self, workload: float) -> bool:
+        """
+        Indique si la charge d'une ligne atteint le seuil minimal
+        """
+        return self.min_workload is None or workload >= self.min_workload
+
+    def decode(self, values: Sequence[Any]) -> Optional[DecodedRow]:
+        """
+        Applique le plan à une ligne projetée sur [first_col_idx, last_col_idx]
+
+        :param values: Valeurs de la ligne
+        :return: Ligne décodée, ou None si elle est écartée
+        """
+        if not values:
+            return None
+
+        profile = values[self._profile_pos]
+        if self.selected_profiles and not (
+            profile and str(profile) in self.selected_profiles
+        ):
+            return None
+
+        pm_name = values[self._pm_pos]
+        project_name = values[self._project_pos]
+        if not (pm_name and project_name):
+            return None
+
+        hours = [
+            value if isinstance(value, (int, float)) else 0.0
+            for value in values[self._hours_slice]
+        ]
+        if self.min_workload is not None and sum(hours) < self.min_workload:
+            return None
+
+        jira_ticket = values[self._jira_pos]
+        return (
+            str(pm_name),
+            str(project_name),
+            str(profile),
+            str(jira_ticket) if jira_ticket else None,
+            hours + self._padding if self._padding else hours,
+        )
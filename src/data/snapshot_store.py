@@ -0,0 +1,591 @@
+﻿import json
+import os
+import sqlite3
+from datetime import date
+from typing import List, Dict, Any, Optional, Tuple, Type, Union
+
+from src.constants import SNAPSHOT_DB_PATH
+from src.data.data_models import AnalysisConfiguration, Snapshot
+from src.data.excel_reader import ExcelReader
+from src.data.repository import WorkloadRepository
+from src.data.row_set import RowSet, RowDelta, pack_arrays, unpack_arrays
+from src.data.workload_table import WorkloadTable
+from src.utils.file_utils import content_hash
+
+# Dimensions dont les totaux sont conservés pour chaque instantané
+SNAPSHOT_DIMENSIONS = ("profile", "project", "project_manager")
+
+# Nombre maximal d'instantanés (base comprise) reconstruits à partir d'une base
+DEFAULT_REBASE_INTERVAL = 8
+# Part de lignes changées au-delà de laquelle un instantané devient une base
+MAX_DELTA_RATIO = 0.5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    snapshot_id INTEGER PRIMARY KEY,
+    taken_at TEXT NOT NULL,
+    label TEXT NOT NULL,
+    source TEXT,
+    source_key TEXT UNIQUE,
+    total_workload REAL NOT NULL,
+    entry_count INTEGER NOT NULL,
+    parent_id INTEGER,
+    base_id INTEGER,
+    week_columns TEXT
+);
+CREATE INDEX IF NOT EXISTS snapshots_by_date ON snapshots (taken_at, snapshot_id);
+CREATE TABLE IF NOT EXISTS totals (
+    snapshot_id INTEGER NOT NULL
+        REFERENCES snapshots (snapshot_id) ON DELETE CASCADE,
+    dimension TEXT NOT NULL,
+    key TEXT NOT NULL,
+    workload REAL NOT NULL,
+    PRIMARY KEY (snapshot_id, dimension, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS totals_by_key ON totals (dimension, key, snapshot_id);
+CREATE TABLE IF NOT EXISTS row_sets (
+    snapshot_id INTEGER PRIMARY KEY
+        REFERENCES snapshots (snapshot_id) ON DELETE CASCADE,
+    base BLOB,
+    delta BLOB
+);
+"""
+
+# Colonnes ajoutées aux historiques créés avant l'enregistrement des lignes
+_ADDED_COLUMNS = (
+    ("parent_id", "INTEGER"),
+    ("base_id", "INTEGER"),
+    ("week_columns", "TEXT"),
+)
+
+_SNAPSHOT_COLUMNS = (
+    "snapshot_id, taken_at, label, source, total_workload, entry_count, base_id"
+)
+
+
+class SnapshotStore:
+    """
+    Historique local d'instantanés hebdomadaires (base SQLite)
+
+    Chaque classeur est lu une seule fois. Ses totaux par profil, par projet
+    et par chef de projet sont enregistrés : les tendances et variations sur
+    les N dernières semaines en sont déduites sans relire d'ancien fichier
+    .xlsx.
+
+    Les lignes sont enregistrées par différences : une base complète, puis
+    pour chaque instantané les seules lignes ajoutées, supprimées ou
+    modifiées depuis le précédent, repérées par une clé d'identité stable
+    (chef de projet, projet, profil, ticket, occurrence) et une empreinte des
+    heures. Une nouvelle base est écrite tous les rebase_interval instantanés,
+    ou lorsque les différences dépassent la moitié des lignes, ce qui borne le
+    coût de reconstruction d'une version.
+    """
+
+    def __init__(
+        self,
+        db_path: str = SNAPSHOT_DB_PATH,
+        rebase_interval: int = DEFAULT_REBASE_INTERVAL,
+    ):
+        """
+        Ouvre (ou crée) l'historique
+
+        :param db_path: Chemin de la base (":memory:" pour une base en mémoire ;
+            SNAPSHOT_DB_PATH par défaut)
+        :param rebase_interval: Nombre maximal d'instantanés par base
+        """
+        if rebase_interval < 1:
+            raise ValueError("L'intervalle entre deux bases doit être au moins 1")
+        self.rebase_interval = rebase_interval
+        # Lignes du dernier instantané enregistré ou reconstruit
+        self._last_rows: Optional[Tuple[int, RowSet]] = None
+
+        self.db_path = os.path.expanduser(db_path)
+        directory = os.path.dirname(self.db_path)
+        if directory and self.db_path != ":memory:":
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(self.db_path)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.executescript(_SCHEMA)
+        columns = {
+            row[1] for row in self._connection.execute("PRAGMA table_info(snapshots)")
+        }
+        for name, declaration in _ADDED_COLUMNS:
+            if name not in columns:
+                self._connection.execute(
+                    f"ALTER TABLE snapshots ADD COLUMN {name} {declaration}"
+                )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS snapshots_by_base"
+            " ON snapshots (base_id, snapshot_id)"
+        )
+
+    def close(self):
+        """
+        Ferme la base
+        """
+        self._connection.close()
+
+    def add_snapshot(
+        self,
+        table: WorkloadTable,
+        taken_at: Union[str, date],
+        label: Optional[str] = None,
+        source: Optional[str] = None,
+        source_key: Optional[str] = None,
+    ) -> Snapshot:
+        """
+        Enregistre les totaux d'une table comme nouvel instantané
+
+        Les instantanés sont ordonnés par date (puis par ordre
+        d'enregistrement) : les différences sont calculées avec l'instantané
+        qui précède à cette date. Un instantané inséré avant un instantané
+        existant devient le précédent de celui-ci, dont les différences sont
+        recalculées (il devient alors une base).
+
+        :param table: Table de charge de travail de la semaine
+        :param taken_at: Date de l'instantané
+        :param label: Libellé (la date par défaut)
+        :param source: Fichier d'origine
+        :param source_key: Identifiant unique de la source (évite les doublons)
+        :return: Instantané enregistré
+        """
+        if isinstance(taken_at, date):
+            taken_at = taken_at.isoformat()
+        snapshot = Snapshot(
+            snapshot_id=0,
+            taken_at=taken_at,
+            label=label or taken_at,
+            source=source,
+            total_workload=float(table.workload.sum()),
+            entry_count=len(table),
+        )
+        week_columns = json.dumps(table.week_columns)
+        rows = RowSet.from_table(table)
+
+        # Différences avec l'instantané précédent à cette date, s'il a ses lignes
+        parent = self._connection.execute(
+            "SELECT snapshot_id, base_id, week_columns FROM snapshots"
+            " WHERE taken_at <= ? ORDER BY taken_at DESC, snapshot_id DESC LIMIT 1",
+            (taken_at,),
+        ).fetchone()
+        previous = None
+        if parent is not None and parent[1] is not None:
+            previous = self._row_set(parent[0])
+        delta = rows.diff(previous) if previous is not None else None
+
+        # Instantané suivant à cette date (insertion dans le passé)
+        child = self._connection.execute(
+            "SELECT snapshot_id, base_id FROM snapshots"
+            " WHERE taken_at > ? ORDER BY taken_at, snapshot_id LIMIT 1",
+            (taken_at,),
+        ).fetchone()
+        child_rows = None
+        if child is not None and child[1] is not None:
+            child_rows = self._row_set(child[0])
+
+        # Une chaîne s'applique par identifiants croissants : l'instantané ne
+        # la prolonge que si son précédent en est le dernier maillon
+        is_base = (
+            delta is None
+            or parent[2] != week_columns
+            or len(delta) > MAX_DELTA_RATIO * max(len(rows), 1)
+            or self._chain_length(parent[1]) >= self.rebase_interval
+            or self._chain_end(parent[1]) != parent[0]
+        )
+
+        with self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO snapshots (taken_at, label, source, source_key,"
+                " total_workload, entry_count, parent_id, base_id, week_columns)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    snapshot.taken_at,
+                    snapshot.label,
+                    snapshot.source,
+                    source_key,
+                    snapshot.total_workload,
+                    snapshot.entry_count,
+                    parent[0] if parent is not None else None,
+                    None,
+                    week_columns,
+                ),
+            )
+            snapshot.snapshot_id = cursor.lastrowid
+            snapshot.base_id = snapshot.snapshot_id if is_base else parent[1]
+            self._connection.executemany(
+                "INSERT INTO totals (snapshot_id, dimension, key, workload)"
+                " VALUES (?, ?, ?, ?)",
+                [
+                    (snapshot.snapshot_id, dimension, key, workload)
+                    for dimension in SNAPSHOT_DIMENSIONS
+                    for key, workload in table.group_sum(dimension).items()
+                ],
+            )
+            self._store_rows(
+                snapshot.snapshot_id,
+                snapshot.base_id,
+                rows if is_base else None,
+                delta,
+            )
+
+            if child is not None:
+                self._connection.execute(
+                    "UPDATE snapshots SET parent_id = ? WHERE snapshot_id = ?",
+                    (snapshot.snapshot_id, child[0]),
+                )
+            if child_rows is not None:
+                if child[1] != child[0]:
+                    # La suite de sa chaîne repart de l'instantané suivant
+                    self._connection.execute(
+                        "UPDATE snapshots SET base_id = ?"
+                        " WHERE base_id = ? AND snapshot_id > ?",
+                        (child[0], child[1], child[0]),
+                    )
+                self._store_rows(child[0], child[0], child_rows, child_rows.diff(rows))
+
+        self._last_rows = (snapshot.snapshot_id, rows)
+        return snapshot
+
+    def ingest_workbook(
+        self,
+        file_path: str,
+        config: AnalysisConfiguration,
+        taken_at: Optional[Union[str, date]] = None,
+        label: Optional[str] = None,
+        reader_class: Type[ExcelReader] = ExcelReader,
+        **reader_options,
+    ) -> Snapshot:
+        """
+        Lit un classeur et l'enregistre comme instantané, sauf s'il l'a déjà
+        été avec la même configuration
+
+        :param file_path: Chemin du classeur
+        :param config: Configuration de lecture
+        :param taken_at: Date de l'instantané (date de modification du
+            fichier par défaut)
+        :param label: Libellé (la date par défaut)
+        :param reader_class: Classe du lecteur Excel
+        :param reader_options: Options passées au lecteur
+        :return: Instantané enregistré, ou celui déjà présent
+        """
+        source_key = json.dumps(
+            [content_hash(file_path), list(config.cache_key())], ensure_ascii=False
+        )
+        existing = self.find_snapshot(source_key)
+        if existing is not None:
+            return existing
+
+        if taken_at is None:
+            taken_at = date.fromtimestamp(os.path.getmtime(file_path))
+
+        reader = reader_class(file_path, **reader_options)
+        try:
+            table = WorkloadRepository(reader).get_workload_table(config)
+        finally:
+            reader.close()
+
+        return self.add_snapshot(
+            table,
+            taken_at,
+            label=label,
+            source=os.path.abspath(file_path),
+            source_key=source_key,
+        )
+
+    def find_snapshot(self, source_key: str) -> Optional[Snapshot]:
+        """
+        Recherche l'instantané d'une source déjà enregistrée
+
+        :param source_key: Identifiant de la source
+        :return: Instantané, ou None s'il n'existe pas
+        """
+        row = self._connection.execute(
+            f"SELECT {_SNAPSHOT_COLUMNS} FROM snapshots WHERE source_key = ?",
+            (source_key,),
+        ).fetchone()
+        return Snapshot(*row) if row is not None else None
+
+    def list_snapshots(self, last: Optional[int] = None) -> List[Snapshot]:
+        """
+        Liste les instantanés par date croissante
+
+        :param last: Nombre d'instantanés les plus récents (tous si None)
+        :return: Instantanés
+        """
+        query = f"SELECT {_SNAPSHOT_COLUMNS} FROM snapshots"
+        query += " ORDER BY taken_at DESC, snapshot_id DESC"
+        parameters = ()
+        if last is not None:
+            query += " LIMIT ?"
+            parameters = (last,)
+        rows = self._connection.execute(query, parameters).fetchall()
+        return [Snapshot(*row) for row in reversed(rows)]
+
+    def remove_snapshot(self, snapshot_id: int):
+        """
+        Supprime un instantané, ses totaux et ses lignes
+
+        L'instantané suivant, s'il était enregistré par différences à partir
+        de celui-ci, devient une base ; ses différences sont recalculées par
+        rapport à l'instantané qui précédait celui supprimé.
+
+        :param snapshot_id: Identifiant de l'instantané
+        """
+        removed = self._connection.execute(
+            "SELECT parent_id, base_id FROM snapshots WHERE snapshot_id = ?",
+            (snapshot_id,),
+        ).fetchone()
+        if removed is None:
+            return
+        parent_id, base_id = removed
+
+        child = self._connection.execute(
+            "SELECT snapshot_id, base_id FROM snapshots WHERE parent_id = ?",
+            (snapshot_id,),
+        ).fetchone()
+        child_rows = None
+        previous = None
+        if child is not None and child[1] is not None:
+            child_rows = self._row_set(child[0])
+            if parent_id is not None and self._has_rows(parent_id):
+                previous = self._row_set(parent_id)
+
+        with self._connection:
+            if child is not None:
+                self._connection.execute(
+                    "UPDATE snapshots SET parent_id = ? WHERE snapshot_id = ?",
+                    (parent_id, child[0]),
+                )
+            if child_rows is not None:
+                if child[1] == base_id:
+                    # La suite de la chaîne repart de l'instantané suivant
+                    self._connection.execute(
+                        "UPDATE snapshots SET base_id = ?"
+                        " WHERE base_id = ? AND snapshot_id >= ?",
+                        (child[0], base_id, child[0]),
+                    )
+                delta = child_rows.diff(previous) if previous is not None else None
+                self._store_rows(child[0], child[0], child_rows, delta)
+            self._connection.execute(
+                "DELETE FROM snapshots WHERE snapshot_id = ?", (snapshot_id,)
+            )
+        self._last_rows = None
+
+    def get_table(self, snapshot_id: int) -> WorkloadTable:
+        """
+        Reconstruit la table d'un instantané à partir de sa base et des
+        différences successives
+
+        Les lignes de la base gardent leur ordre ; les lignes ajoutées depuis
+        suivent, dans l'ordre de leur ajout.
+
+        :param snapshot_id: Identifiant de l'instantané
+        :return: Table de charge de travail de l'instantané
+        """
+        return self._row_set(snapshot_id).table
+
+    def get_row_changes(
+        self, snapshot_id: Optional[int] = None
+    ) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Lignes ajoutées, supprimées et modifiées depuis l'instantané précédent,
+        lues directement dans les différences enregistrées
+
+        :param snapshot_id: Identifiant de l'instantané (le plus récent par
+            défaut)
+        :return: Changements au format de
+            ComparisonService.diff_workload_entries, ou None si l'instantané
+            précédent n'a pas de lignes enregistrées
+        """
+        if snapshot_id is None:
+            latest = self.list_snapshots(last=1)
+            if not latest:
+                return None
+            snapshot_id = latest[0].snapshot_id
+        row = self._connection.execute(
+            "SELECT parent_id FROM snapshots WHERE snapshot_id = ?", (snapshot_id,)
+        ).fetchone()
+        if row is None or row[0] is None or not self._has_rows(row[0]):
+            return None
+
+        row = self._connection.execute(
+            "SELECT delta FROM row_sets WHERE snapshot_id = ?", (snapshot_id,)
+        ).fetchone()
+        return RowDelta.from_arrays(unpack_arrays(row[0])).to_changes()
+
+    def get_totals(self, snapshot_id: int, dimension: str) -> Dict[str, float]:
+        """
+        Totaux d'un instantané pour une dimension
+
+        :param snapshot_id: Identifiant de l'instantané
+        :param dimension: Dimension (profile, project ou project_manager)
+        :return: Dictionnaire valeur -> charge totale
+        """
+        self._check_dimension(dimension)
+        rows = self._connection.execute(
+            "SELECT key, workload FROM totals WHERE snapshot_id = ? AND dimension = ?",
+            (snapshot_id, dimension),
+        )
+        return dict(rows)
+
+    def get_trend(self, dimension: str, weeks: int) -> Dict[str, Any]:
+        """
+        Évolution des totaux d'une dimension sur les N derniers instantanés
+
+        :param dimension: Dimension (profile, project ou project_manager)
+        :param weeks: Nombre d'instantanés les plus récents
+        :return: Dictionnaire avec les instantanés (par date croissante) et,
+            pour chaque valeur, la liste de ses totaux (0 lorsqu'elle est absente)
+        """
+        self._check_dimension(dimension)
+        snapshots = self.list_snapshots(last=weeks)
+        positions = {
+            snapshot.snapshot_id: position
+            for position, snapshot in enumerate(snapshots)
+        }
+
+        series: Dict[str, List[float]] = {}
+        if snapshots:
+            placeholders = ", ".join("?" * len(snapshots))
+            rows = self._connection.execute(
+                "SELECT snapshot_id, key, workload FROM totals"
+                f" WHERE dimension = ? AND snapshot_id IN ({placeholders})",
+                (dimension, *positions),
+            )
+            for snapshot_id, key, workload in rows:
+                values = series.get(key)
+                if values is None:
+                    values = series[key] = [0.0] * len(snapshots)
+                values[positions[snapshot_id]] = workload
+
+        return {"snapshots": snapshots, "series": series}
+
+    def get_variations(
+        self, dimension: str, weeks: int, threshold_percentage: float = 0.0
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Variation des totaux d'une dimension entre le premier et le dernier
+        des N derniers instantanés
+
+        :param dimension: Dimension (profile, project ou project_manager)
+        :param weeks: Nombre d'instantanés les plus récents
+        :param threshold_percentage: Variation minimale (en %) à retenir
+        :return: Dictionnaire valeur -> charges précédente et actuelle et
+            pourcentage de variation
+        """
+        series = self.get_trend(dimension, weeks)["series"]
+        variations = {}
+        for key, values in series.items():
+            previous_workload, current_workload = values[0], values[-1]
+            if previous_workload > 0:
+                change_pct = (
+                    (current_workload - previous_workload) / previous_workload
+                ) * 100
+            else:
+                change_pct = 100 if current_workload > 0 else 0
+
+            if abs(change_pct) >= threshold_percentage:
+                variations[key] = {
+                    "previous_workload": previous_workload,
+                    "current_workload": current_workload,
+                    "change_percentage": change_pct,
+                }
+        return variations
+
+    @staticmethod
+    def _check_dimension(dimension: str):
+        if dimension not in SNAPSHOT_DIMENSIONS:
+            raise ValueError(f"Dimension inconnue: {dimension}")
+
+    def _has_rows(self, snapshot_id: int) -> bool:
+        row = self._connection.execute(
+            "SELECT base_id FROM snapshots WHERE snapshot_id = ?", (snapshot_id,)
+        ).fetchone()
+        return row is not None and row[0] is not None
+
+    def _chain_length(self, base_id: int) -> int:
+        """
+        Nombre d'instantanés reconstruits à partir d'une base (base comprise)
+        """
+        row = self._connection.execute(
+            "SELECT COUNT(*) FROM snapshots WHERE base_id = ?", (base_id,)
+        ).fetchone()
+        return row[0]
+
+    def _chain_end(self, base_id: int) -> int:
+        """
+        Dernier instantané (par identifiant) reconstruit à partir d'une base
+        """
+        row = self._connection.execute(
+            "SELECT MAX(snapshot_id) FROM snapshots WHERE base_id = ?", (base_id,)
+        ).fetchone()
+        return row[0]
+
+    def _row_set(self, snapshot_id: int) -> RowSet:
+        """
+        Reconstruit les lignes d'un instantané : lignes de sa base, puis
+        différences des instantanés suivants de la chaîne, dans l'ordre
+
+        :param snapshot_id: Identifiant de l'instantané
+        :return: Lignes de l'instantané
+        """
+        if self._last_rows is not None and self._last_rows[0] == snapshot_id:
+            return self._last_rows[1]
+
+        row = self._connection.execute(
+            "SELECT base_id FROM snapshots WHERE snapshot_id = ?", (snapshot_id,)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"Instantané inconnu: {snapshot_id}")
+        if row[0] is None:
+            raise ValueError(
+                f"Les lignes de l'instantané {snapshot_id} ne sont pas enregistrées"
+            )
+        base_id = row[0]
+
+        base = self._connection.execute(
+            "SELECT base FROM row_sets WHERE snapshot_id = ?", (base_id,)
+        ).fetchone()
+        rows = RowSet.from_arrays(unpack_arrays(base[0]))
+        deltas = self._connection.execute(
+            "SELECT r.delta FROM row_sets r"
+            " JOIN snapshots s ON s.snapshot_id = r.snapshot_id"
+            " WHERE s.base_id = ? AND s.snapshot_id > ? AND s.snapshot_id <= ?"
+            " ORDER BY s.snapshot_id",
+            (base_id, base_id, snapshot_id),
+        )
+        for (delta,) in deltas:
+            rows = rows.apply(RowDelta.from_arrays(unpack_arrays(delta)))
+
+        self._last_rows = (snapshot_id, rows)
+        return rows
+
+    def _store_rows(
+        self,
+        snapshot_id: int,
+        base_id: int,
+        base: Optional[RowSet],
+        delta: Optional[RowDelta],
+    ):
+        """
+        Enregistre les lignes d'un instantané
+
+        :param snapshot_id: Identifiant de l'instantané
+        :param base_id: Identifiant de sa base
+        :param base: Toutes ses lignes, s'il est lui-même une base
+        :param delta: Ses différences avec l'instantané précédent, si connues
+        """
+        self._connection.execute(
+            "UPDATE snapshots SET base_id = ? WHERE snapshot_id = ?",
+            (base_id, snapshot_id),
+        )
+        self._connection.execute(
+            "INSERT OR REPLACE INTO row_sets (snapshot_id, base, delta)"
+            " VALUES (?, ?, ?)",
+            (
+                snapshot_id,
+                pack_arrays(base.to_arrays()) if base is not None else None,
+                pack_arrays(delta.to_arrays()) if delta is not None else None,
+            ),
+        )
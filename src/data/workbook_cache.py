@@ -0,0 +1,179 @@
+﻿import hashlib
+import json
+import os
+import tempfile
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from src.data.data_models import AnalysisConfiguration
+from src.data.workload_table import WorkloadTable
+from src.utils.file_utils import file_fingerprint, content_hash
+
+# Extension des fichiers de cache
+CACHE_EXTENSION = ".npz"
+
+
+class WorkbookCache:
+    """
+    Cache disque des données extraites des classeurs Excel
+
+    Chaque entrée est un fichier .npz identifié par l'empreinte du classeur
+    (chemin, taille, date de modification, hachage du contenu) et par les
+    paramètres de lecture. La taille totale est plafonnée : les entrées les
+    moins récemment utilisées sont supprimées en premier.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialise le cache
+
+        :param cache_dir: Répertoire de stockage (créé si nécessaire)
+        :param max_bytes: Taille totale maximale du cache en octets
+        """
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.max_bytes = max_bytes
+        # Hachages de contenu déjà calculés, par empreinte (chemin, taille, mtime)
+        self._content_hashes: Dict[Tuple[str, int, int], str] = {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def file_key(self, file_path: str) -> str:
+        """
+        Calcule la clé identifiant l'état courant d'un fichier
+
+        :param file_path: Chemin du classeur
+        :return: Clé hexadécimale
+        """
+        fingerprint = file_fingerprint(file_path)
+        digest = self._content_hashes.get(fingerprint)
+        if digest is None:
+            digest = content_hash(file_path)
+            self._content_hashes[fingerprint] = digest
+        return self._hash_key([*fingerprint, digest])
+
+    def make_key(
+        self,
+        file_path: str,
+        kind: str,
+        config: Optional[AnalysisConfiguration] = None,
+    ) -> str:
+        """
+        Calcule la clé d'une entrée du cache
+
+        :param file_path: Chemin du classeur
+        :param kind: Nature des données mises en cache
+        :param config: Configuration de lecture (None pour les données qui ne
+            dépendent que du fichier)
+        :return: Clé hexadécimale
+        """
+        parts = [self.file_key(file_path), kind]
+        if config is not None:
+            parts += list(config.cache_key())
+        return self._hash_key(parts)
+
+    @staticmethod
+    def _hash_key(parts: List[Any]) -> str:
+        payload = json.dumps(parts, ensure_ascii=False).encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=20).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + CACHE_EXTENSION)
+
+    def load_arrays(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Charge une entrée du cache
+
+        :param key: Clé de l'entrée
+        :return: Dictionnaire de tableaux, ou None si l'entrée est absente
+        """
+        path = self._entry_path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Entrée corrompue (écriture interrompue, format incompatible...)
+            self._remove(path)
+            return None
+
+        # Marquer l'entrée comme récemment utilisée (politique LRU)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return arrays
+
+    def store_arrays(self, key: str, arrays: Dict[str, np.ndarray]):
+        """
+        Enregistre une entrée dans le cache puis applique le plafond de taille
+
+        :param key: Clé de l'entrée
+        :param arrays: Dictionnaire de tableaux à enregistrer
+        """
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(tmp_path, self._entry_path(key))
+        except Exception:
+            self._remove(tmp_path)
+            raise
+
+        self._evict()
+
+    def load_table(self, key: str) -> Optional[WorkloadTable]:
+        """
+        Charge une table de charge de travail depuis le cache
+
+        :param key: Clé de l'entrée
+        :return: Table, ou None si l'entrée est absente
+        """
+        arrays = self.load_arrays(key)
+        return WorkloadTable.from_arrays(arrays) if arrays is not None else None
+
+    def store_table(self, key: str, table: WorkloadTable):
+        """
+        Enregistre une table de charge de travail dans le cache
+
+        :param key: Clé de l'entrée
+        :param table: Table à enregistrer
+        """
+        self.store_arrays(key, table.to_arrays())
+
+    def _evict(self):
+        """
+        Supprime les entrées les moins récemment utilisées au-delà du plafond
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(CACHE_EXTENSION):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            self._remove(path)
+            total_size -= size
+
+    def clear(self):
+        """
+        Vide le cache
+        """
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(CACHE_EXTENSION):
+                self._remove(os.path.join(self.cache_dir, name))
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,504 @@
+﻿from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import List, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.data.data_models import WorkloadEntry
+
+# Dimensions catégorielles, nommées comme les attributs de WorkloadEntry
+DIMENSIONS = ("project_manager", "project", "profile", "jira_ticket")
+
+# Code attribué aux valeurs absentes (ticket JIRA vide)
+MISSING_CODE = -1
+
+
+def group_keys(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Regroupe les lignes identiques d'une matrice de codes
+
+    :param keys: Matrice de codes (lignes × dimensions)
+    :return: Tuple (clés distinctes dans l'ordre de première apparition,
+        indice du groupe de chaque ligne)
+    """
+    if len(keys) == 0:
+        return keys, np.zeros(0, dtype=np.intp)
+
+    unique_keys, first_rows, inverse = np.unique(
+        keys, axis=0, return_index=True, return_inverse=True
+    )
+    order = np.argsort(first_rows)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return unique_keys[order], rank[inverse.ravel()]
+
+
+def occurrence_numbers(keys: np.ndarray) -> np.ndarray:
+    """
+    Numérote les lignes de même clé dans leur ordre d'apparition
+
+    :param keys: Clé entière de chaque ligne
+    :return: Numéro d'occurrence de chaque ligne (0 pour la première ligne
+        d'une clé, 1 pour la suivante...)
+    """
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    run_lengths = np.diff(np.append(starts, len(keys)))
+    occurrences = np.empty(len(keys), dtype=np.int64)
+    occurrences[order] = np.arange(len(keys)) - np.repeat(starts, run_lengths)
+    return occurrences
+
+
+def factorize(values: Sequence[Optional[str]]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Attribue des codes entiers à une colonne de valeurs, dans leur ordre de
+    première apparition (MISSING_CODE pour None)
+
+    Les deux parcours de la colonne (dict.fromkeys, puis map) s'exécutent
+    sans boucle Python.
+
+    :param values: Valeurs de la colonne
+    :return: Tuple (codes, catégories)
+    """
+    categories = [value for value in dict.fromkeys(values) if value is not None]
+    index: Dict[Optional[str], int] = {
+        value: code for code, value in enumerate(categories)
+    }
+    index[None] = MISSING_CODE
+    codes = np.fromiter(
+        map(index.__getitem__, values), dtype=np.int32, count=len(values)
+    )
+    return codes, categories
+
+
+class _Factorizer:
+    """
+    Attribue des codes entiers aux valeurs dans leur ordre de première apparition
+    """
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.codes: List[int] = []
+
+    def add(self, value: Optional[str]):
+        if value is None:
+            self.codes.append(MISSING_CODE)
+            return
+        code = self.index.get(value)
+        if code is None:
+            code = len(self.index)
+            self.index[value] = code
+        self.codes.append(code)
+
+    def categories(self) -> List[str]:
+        return list(self.index)
+
+    def to_array(self) -> np.ndarray:
+        return np.asarray(self.codes, dtype=np.int32)
+
+
+@dataclass(eq=False)
+class WorkloadTable:
+    """
+    Représentation colonnaire des entrées de charge de travail
+
+    Chaque dimension (chef de projet, projet, profil, ticket JIRA) est stockée
+    sous forme de codes entiers renvoyant à une liste de catégories ; les heures
+    forment une matrice float64 lignes × colonnes de semaines.
+    """
+
+    codes: Dict[str, np.ndarray]
+    categories: Dict[str, List[str]]
+    hours: np.ndarray
+    week_columns: List[str] = field(default_factory=list)
+    # Sommes cumulées des heures, calculées à la première fenêtre demandée
+    _prefix_sums: Optional[np.ndarray] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __len__(self) -> int:
+        return self.hours.shape[0]
+
+    @property
+    def workload(self) -> np.ndarray:
+        """
+        Charge de travail totale de chaque ligne
+        """
+        return self.hours.sum(axis=1)
+
+    @property
+    def prefix_sums(self) -> np.ndarray:
+        """
+        Sommes cumulées des heures par ligne, précédées d'une colonne de zéros :
+        prefix_sums[:, j] est le total des j premières colonnes de semaine
+        """
+        if self._prefix_sums is None:
+            prefix_sums = np.zeros((self.hours.shape[0], self.hours.shape[1] + 1))
+            np.cumsum(self.hours, axis=1, out=prefix_sums[:, 1:])
+            self._prefix_sums = prefix_sums
+        return self._prefix_sums
+
+    def window_totals(self, start: int, stop: int) -> np.ndarray:
+        """
+        Charge de chaque ligne sur une plage de colonnes de semaine, obtenue
+        par une seule soustraction des sommes cumulées
+
+        :param start: Position de la première colonne de la plage
+        :param stop: Position suivant la dernière colonne de la plage
+        :return: Charge de travail de chaque ligne sur la plage
+        """
+        prefix_sums = self.prefix_sums
+        return prefix_sums[:, stop] - prefix_sums[:, start]
+
+    def window(self, start: int, stop: int) -> "WorkloadTable":
+        """
+        Réduit la table à une plage de colonnes de semaine, totalisée en une
+        seule colonne
+
+        :param start: Position de la première colonne de la plage
+        :param stop: Position suivant la dernière colonne de la plage
+        :return: Nouvelle table partageant les codes et catégories
+        """
+        return WorkloadTable(
+            codes=self.codes,
+            categories=self.categories,
+            hours=self.window_totals(start, stop)[:, np.newaxis],
+            week_columns=["Total"],
+        )
+
+    def select_weeks(self, start: int, stop: int) -> "WorkloadTable":
+        """
+        Restreint la table à une plage de colonnes de semaine, conservées
+        séparément
+
+        :param start: Position de la première colonne de la plage
+        :param stop: Position suivant la dernière colonne de la plage
+        :return: Nouvelle table partageant les codes et catégories
+        """
+        return WorkloadTable(
+            codes=self.codes,
+            categories=self.categories,
+            hours=self.hours[:, start:stop],
+            week_columns=self.week_columns[start:stop],
+        )
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Tuple[str, str, str, Optional[str], Sequence[float]]],
+        week_columns: List[str],
+    ) -> "WorkloadTable":
+        """
+        Construit une table à partir de lignes déjà décodées
+
+        :param rows: Tuples (chef de projet, projet, profil, ticket JIRA, heures)
+        :param week_columns: Libellés des colonnes de semaines
+        :return: Table de charge de travail
+        """
+        factorizers = {dimension: _Factorizer() for dimension in DIMENSIONS}
+        hours: List[Sequence[float]] = []
+
+        for project_manager, project, profile, jira_ticket, row_hours in rows:
+            factorizers["project_manager"].add(project_manager)
+            factorizers["project"].add(project)
+            factorizers["profile"].add(profile)
+            factorizers["jira_ticket"].add(jira_ticket)
+            hours.append(row_hours)
+
+        hours_matrix = np.asarray(hours, dtype=np.float64).reshape(
+            len(hours), len(week_columns)
+        )
+
+        return cls(
+            codes={
+                dim: factorizer.to_array() for dim, factorizer in factorizers.items()
+            },
+            categories={
+                dim: factorizer.categories() for dim, factorizer in factorizers.items()
+            },
+            hours=hours_matrix,
+            week_columns=list(week_columns),
+        )
+
+    @classmethod
+    def from_entries(cls, entries: List[WorkloadEntry]) -> "WorkloadTable":
+        """
+        Construit une table à partir d'entrées ; la charge de chaque entrée
+        devient une unique colonne d'heures
+
+        :param entries: Liste des entrées de charge de travail
+        :return: Table de charge de travail
+        """
+        codes = {}
+        categories = {}
+        for dimension in DIMENSIONS:
+            codes[dimension], categories[dimension] = factorize(
+                list(map(attrgetter(dimension), entries))
+            )
+
+        workloads = np.fromiter(
+            map(attrgetter("workload"), entries), dtype=np.float64, count=len(entries)
+        )
+        return cls(
+            codes=codes,
+            categories=categories,
+            hours=workloads[:, np.newaxis],
+            week_columns=["Total"],
+        )
+
+    @classmethod
+    def concatenate(cls, tables: List["WorkloadTable"]) -> "WorkloadTable":
+        """
+        Concatène plusieurs tables en fusionnant leurs catégories
+
+        Si les colonnes de semaines diffèrent d'une table à l'autre, les heures
+        sont ramenées à une unique colonne de total.
+
+        :param tables: Tables à concaténer
+        :return: Table de charge de travail
+        """
+        if not tables:
+            return cls.from_rows([], week_columns=["Total"])
+
+        week_columns = tables[0].week_columns
+        if any(table.week_columns != week_columns for table in tables):
+            week_columns = ["Total"]
+            hours = [table.workload[:, np.newaxis] for table in tables]
+        else:
+            hours = [table.hours for table in tables]
+
+        codes = {}
+        categories = {}
+        for dimension in DIMENSIONS:
+            index: Dict[str, int] = {}
+            remapped = []
+            for table in tables:
+                lookup = np.asarray(
+                    [
+                        index.setdefault(category, len(index))
+                        for category in table.categories[dimension]
+                    ]
+                    + [MISSING_CODE],
+                    dtype=np.int32,
+                )
+                remapped.append(lookup[table.codes[dimension]])
+            codes[dimension] = np.concatenate(remapped)
+            categories[dimension] = list(index)
+
+        return cls(
+            codes=codes,
+            categories=categories,
+            hours=np.concatenate(hours),
+            week_columns=list(week_columns),
+        )
+
+    def aggregate(self) -> "WorkloadTable":
+        """
+        Fusionne les lignes de même clé (chef de projet, projet, profil, ticket)
+        en sommant leurs heures semaine par semaine
+
+        :return: Table agrégée, clés dans l'ordre de première apparition
+        """
+        keys = np.stack([self.codes[dimension] for dimension in DIMENSIONS], axis=1)
+        if len(keys) == 0:
+            return self
+
+        unique_keys, groups = group_keys(keys)
+        hours = np.zeros((len(unique_keys), self.hours.shape[1]))
+        np.add.at(hours, groups, self.hours)
+
+        return WorkloadTable(
+            codes={
+                dimension: unique_keys[:, position].astype(np.int32)
+                for position, dimension in enumerate(DIMENSIONS)
+            },
+            categories=self.categories,
+            hours=hours,
+            week_columns=self.week_columns,
+        )
+
+    def to_entries(self) -> List[WorkloadEntry]:
+        """
+        Reconstruit les entrées de charge de travail
+
+        :return: Liste des entrées, dans l'ordre des lignes
+        """
+        columns = [self.decode(dimension) for dimension in DIMENSIONS]
+        workloads = self.workload.tolist()
+
+        return [
+            WorkloadEntry(
+                project_manager=project_manager,
+                project=project,
+                profile=profile,
+                jira_ticket=jira_ticket,
+                workload=workload,
+            )
+            for project_manager, project, profile, jira_ticket, workload in zip(
+                *columns, workloads
+            )
+        ]
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Sérialise la table en tableaux NumPy (sans objets Python)
+
+        :return: Dictionnaire nom -> tableau, compatible avec np.savez
+        """
+        arrays = {"hours": self.hours, "week_columns": np.asarray(self.week_columns)}
+        for dimension in DIMENSIONS:
+            arrays[f"{dimension}_codes"] = self.codes[dimension]
+            arrays[f"{dimension}_categories"] = np.asarray(
+                self.categories[dimension], dtype=str
+            )
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "WorkloadTable":
+        """
+        Reconstruit une table sérialisée par to_arrays
+
+        :param arrays: Dictionnaire nom -> tableau
+        :return: Table de charge de travail
+        """
+        return cls(
+            codes={dim: np.asarray(arrays[f"{dim}_codes"]) for dim in DIMENSIONS},
+            categories={
+                dim: arrays[f"{dim}_categories"].tolist() for dim in DIMENSIONS
+            },
+            hours=np.asarray(arrays["hours"], dtype=np.float64),
+            week_columns=arrays["week_columns"].tolist(),
+        )
+
+    def decode(self, dimension: str) -> List[Optional[str]]:
+        """
+        Décode la colonne d'une dimension en valeurs textuelles
+        """
+        lookup = self.categories[dimension] + [None]
+        return [lookup[code] for code in self.codes[dimension].tolist()]
+
+    def take(self, rows: np.ndarray) -> "WorkloadTable":
+        """
+        Sélectionne un sous-ensemble de lignes (indices ou masque booléen)
+
+        Les catégories sont partagées avec la table d'origine.
+
+        :param rows: Indices ou masque des lignes à conserver
+        :return: Nouvelle table
+        """
+        return WorkloadTable(
+            codes={dim: codes[rows] for dim, codes in self.codes.items()},
+            categories=self.categories,
+            hours=self.hours[rows],
+            week_columns=self.week_columns,
+        )
+
+    def mask_for(self, dimension: str, values: Iterable[str]) -> np.ndarray:
+        """
+        Calcule le masque des lignes dont la dimension prend une des valeurs
+
+        :param dimension: Nom de la dimension
+        :param values: Valeurs acceptées
+        :return: Masque booléen
+        """
+        accepted = set(values)
+        selected = np.zeros(len(self.categories[dimension]) + 1, dtype=bool)
+        for code, category in enumerate(self.categories[dimension]):
+            selected[code] = category in accepted
+        # Le code MISSING_CODE (-1) pointe sur la dernière case, toujours False
+        return selected[self.codes[dimension]]
+
+    def group_sum(
+        self, dimension: str, rows: Optional[np.ndarray] = None
+    ) -> Dict[str, float]:
+        """
+        Somme la charge de travail par valeur d'une dimension
+
+        :param dimension: Nom de la dimension
+        :param rows: Indices des lignes à considérer (toutes par défaut)
+        :return: Dictionnaire valeur -> charge, dans l'ordre de première apparition
+        """
+        codes = self.codes[dimension]
+        workload = self.workload
+        if rows is not None:
+            codes = codes[rows]
+            workload = workload[rows]
+
+        present = codes != MISSING_CODE
+        codes = codes[present]
+        size = len(self.categories[dimension])
+        totals = np.bincount(codes, weights=workload[present], minlength=size)
+
+        return {
+            self.categories[dimension][code]: float(totals[code])
+            for code in self._codes_in_order(codes)
+        }
+
+    def group_hours(self, dimension: str) -> Tuple[List[str], np.ndarray]:
+        """
+        Somme les heures de chaque semaine par valeur d'une dimension
+
+        :param dimension: Nom de la dimension
+        :return: Tuple (valeurs dans l'ordre de première apparition, matrice
+            des heures avec une ligne par valeur et une colonne par semaine)
+        """
+        codes = self.codes[dimension]
+        rows = np.flatnonzero(codes != MISSING_CODE)
+        codes = codes[rows]
+
+        # Sommes par blocs de lignes de même code (plus rapide que np.add.at)
+        order = np.argsort(codes, kind="stable")
+        starts = np.flatnonzero(np.diff(codes[order], prepend=MISSING_CODE))
+        sums = np.add.reduceat(self.hours[rows[order]], starts, axis=0)
+        series = np.zeros((len(self.categories[dimension]), self.hours.shape[1]))
+        series[codes[order][starts]] = sums
+
+        codes_in_order = self._codes_in_order(codes)
+        labels = [self.categories[dimension][code] for code in codes_in_order]
+        return labels, series[codes_in_order]
+
+    def group_indices(
+        self, dimension: str, rows: Optional[np.ndarray] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Regroupe les indices de lignes par valeur d'une dimension
+
+        :param dimension: Nom de la dimension
+        :param rows: Indices des lignes à considérer (toutes par défaut)
+        :return: Dictionnaire valeur -> indices croissants des lignes,
+            dans l'ordre de première apparition
+        """
+        if rows is None:
+            rows = np.arange(len(self))
+        rows = rows[self.codes[dimension][rows] != MISSING_CODE]
+        codes = self.codes[dimension][rows]
+
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        boundaries = np.flatnonzero(np.diff(sorted_codes)) + 1
+        groups = {
+            int(group_codes[0]): group_rows
+            for group_codes, group_rows in zip(
+                np.split(sorted_codes, boundaries), np.split(rows[order], boundaries)
+            )
+            if len(group_codes)
+        }
+
+        return {
+            self.categories[dimension][code]: groups[code]
+            for code in self._codes_in_order(codes)
+        }
+
+    @staticmethod
+    def _codes_in_order(codes: np.ndarray) -> List[int]:
+        """
+        Liste les codes présents dans l'ordre de leur première apparition
+        """
+        if len(codes) == 0:
+            return []
+        # Première ligne de chaque code, sans le tri complet de np.unique
+        first_rows = np.full(int(codes.max()) + 1, len(codes))
+        np.minimum.at(first_rows, codes, np.arange(len(codes)))
+        present = np.flatnonzero(first_rows < len(codes))
+        return present[np.argsort(first_rows[present])].tolist()
@@ -1,6 +1,16 @@
-﻿from typing import List, Dict, Any, Tuple
+﻿from operator import attrgetter
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+
+import numpy as np
+
 from src.data.data_models import WorkloadEntry, ProfileWorkload
+from src.data.row_set import ROW_TOLERANCE
+from src.data.snapshot_store import SnapshotStore
+from src.data.workload_table import factorize, occurrence_numbers
+
+# Attributs formant la clé d'une ligne
+ROW_KEY_FIELDS = ("project_manager", "project", "profile", "jira_ticket")
 
 
 class ComparisonService:
@@ -91,6 +101,167 @@ class ComparisonService:
         comparison_results["new_projects"] = list(curr_projects - prev_projects)
         comparison_results["removed_projects"] = list(prev_projects - curr_projects)
 
+        # Lignes ajoutées, supprimées et modifiées
+        comparison_results["row_changes"] = self.diff_workload_entries(
+            previous_entries, current_entries
+        )
+
+        return comparison_results
+
+    def diff_workload_entries(
+        self,
+        previous_entries: List[WorkloadEntry],
+        current_entries: List[WorkloadEntry],
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Compare les entrées ligne à ligne sur la clé (chef de projet, projet,
+        profil, ticket JIRA)
+
+        Les colonnes de la clé sont factorisées (une table de hachage par
+        colonne, commune aux deux périodes), puis chaque ligne reçoit un
+        identifiant dense ; le rapprochement se fait par adressage direct sur
+        ces identifiants, en temps linéaire hors tris. Les lignes de même clé
+        sont appariées dans leur ordre d'apparition (la n-ième de la période
+        précédente avec la n-ième de la période actuelle).
+
+        :param previous_entries: Entrées de la période précédente
+        :param current_entries: Entrées de la période actuelle
+        :return: Lignes ajoutées et modifiées (dans l'ordre de la période
+            actuelle) et lignes supprimées (dans l'ordre de la précédente)
+        """
+        ignored = set(self.settings.get("ignored_project_types", []))
+        if ignored:
+            previous_entries = [
+                entry for entry in previous_entries if entry.project not in ignored
+            ]
+            current_entries = [
+                entry for entry in current_entries if entry.project not in ignored
+            ]
+
+        entries = previous_entries + current_entries
+        split = len(previous_entries)
+        keys = np.zeros(len(entries), dtype=np.int64)
+        for name in ROW_KEY_FIELDS:
+            codes, categories = factorize(list(map(attrgetter(name), entries)))
+            keys = keys * (len(categories) + 1) + (codes + 1)
+            keys = _compress(keys)
+
+        # Numéro d'occurrence de chaque clé, propre à chaque période
+        occurrences = np.concatenate(
+            [occurrence_numbers(keys[:split]), occurrence_numbers(keys[split:])]
+        )
+        row_ids = _compress(keys * (int(occurrences.max(initial=0)) + 1) + occurrences)
+        previous_ids, current_ids = row_ids[:split], row_ids[split:]
+
+        workloads = np.fromiter(
+            map(attrgetter("workload"), entries), dtype=np.float64, count=len(entries)
+        )
+        previous_by_id = np.full(len(entries), np.nan)
+        previous_by_id[previous_ids] = workloads[:split]
+        current_by_id = np.full(len(entries), np.nan)
+        current_by_id[current_ids] = workloads[split:]
+
+        previous_workloads = previous_by_id[current_ids]
+        deltas = workloads[split:] - previous_workloads
+        added = np.flatnonzero(np.isnan(previous_workloads))
+        modified = np.flatnonzero(np.abs(deltas) > ROW_TOLERANCE)
+        removed = np.flatnonzero(np.isnan(current_by_id[previous_ids]))
+
+        return {
+            "added": [
+                self._row_change(
+                    current_entries[row], occurrences[split + row], 0.0, None
+                )
+                for row in added.tolist()
+            ],
+            "removed": [
+                self._row_change(previous_entries[row], occurrences[row], None, 0.0)
+                for row in removed.tolist()
+            ],
+            "modified": [
+                self._row_change(
+                    current_entries[row],
+                    occurrences[split + row],
+                    float(previous_workloads[row]),
+                    None,
+                )
+                for row in modified.tolist()
+            ],
+        }
+
+    @staticmethod
+    def _row_change(
+        entry: WorkloadEntry,
+        occurrence: int,
+        previous_workload: Optional[float],
+        current_workload: Optional[float],
+    ) -> Dict[str, Any]:
+        """
+        Décrit le changement d'une ligne (charge manquante : celle de l'entrée)
+        """
+        if previous_workload is None:
+            previous_workload = entry.workload
+        if current_workload is None:
+            current_workload = entry.workload
+        return {
+            "project_manager": entry.project_manager,
+            "project": entry.project,
+            "profile": entry.profile,
+            "jira_ticket": entry.jira_ticket,
+            "occurrence": int(occurrence),
+            "previous_workload": previous_workload,
+            "current_workload": current_workload,
+            "delta": current_workload - previous_workload,
+        }
+
+    def compare_snapshots(
+        self, store: SnapshotStore, weeks: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Compare le premier et le dernier des N derniers instantanés de
+        l'historique, à partir de leurs totaux enregistrés
+
+        :param store: Historique des instantanés
+        :param weeks: Nombre d'instantanés (weeks_to_compare par défaut)
+        :return: Résultats de la comparaison, au format de
+            compare_workload_entries, avec les instantanés comparés et
+            l'évolution de chaque profil ; les changements ligne à ligne sont
+            ceux du dernier instantané depuis le précédent (None s'ils ne sont
+            pas enregistrés)
+        """
+        if weeks is None:
+            weeks = self.settings.get("weeks_to_compare", 4)
+        if weeks < 2:
+            raise ValueError("La comparaison porte sur au moins deux semaines")
+
+        threshold = self.settings["workload_threshold"]
+        priority_profiles = self.settings.get("priority_profiles", [])
+        ignored = set(self.settings.get("ignored_project_types", []))
+
+        profile_trend = store.get_trend("profile", weeks)
+        profile_changes = store.get_variations("profile", weeks, threshold)
+        comparison_results = {
+            "snapshots": profile_trend["snapshots"],
+            "profile_trends": profile_trend["series"],
+            "profile_changes": profile_changes,
+            "new_projects": [],
+            "removed_projects": [],
+            "significant_workload_changes": [
+                {"profile": profile, **changes}
+                for profile, changes in profile_changes.items()
+                if profile in priority_profiles
+            ],
+            "row_changes": store.get_row_changes(),
+        }
+
+        for project, values in store.get_trend("project", weeks)["series"].items():
+            if project in ignored:
+                continue
+            if values[0] == 0 and values[-1] > 0:
+                comparison_results["new_projects"].append(project)
+            elif values[0] > 0 and values[-1] == 0:
+                comparison_results["removed_projects"].append(project)
+
         return comparison_results
 
     def _group_entries_by_profile(
@@ -159,6 +330,28 @@ class ComparisonService:
                 report += f"- {project}\n"
             report += "\n"
 
+        # Changements ligne à ligne
+        row_sections = [
+            ("added", "Lignes ajoutées"),
+            ("removed", "Lignes supprimées"),
+            ("modified", "Lignes modifiées"),
+        ]
+        for kind, title in row_sections:
+            changes = results["row_changes"][kind]
+            if not changes:
+                continue
+            report += f"{title} ({len(changes)}):\n"
+            for change in changes:
+                ticket = f" [{change['jira_ticket']}]" if change["jira_ticket"] else ""
+                report += (
+                    f"- {change['project_manager']} / {change['project']} / "
+                    f"{change['profile']}{ticket}: "
+                    f"{change['previous_workload']:.2f}h "
+                    f"→ {change['current_workload']:.2f}h "
+                    f"({change['delta']:+.2f}h)\n"
+                )
+            report += "\n"
+
         # Changements significatifs pour les profils prioritaires
         if results["significant_workload_changes"]:
             report += "Changements critiques pour les profils prioritaires:\n"
@@ -171,3 +364,10 @@ class ComparisonService:
                 )
 
         return report
+
+
+def _compress(keys: np.ndarray) -> np.ndarray:
+    """
+    Renumérote des clés entières en identifiants denses 0..n-1
+    """
+    return np.unique(keys, return_inverse=True)[1].ravel()
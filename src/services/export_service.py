@@ -1,13 +1,117 @@
-﻿import os
+﻿import json
+import os
+import tempfile
+import time
+from xml.sax.saxutils import escape
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+
 import openpyxl
 import csv
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import NamedStyle, Font, PatternFill, Alignment
+from openpyxl.utils import get_column_letter
 from reportlab.lib.pagesizes import A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
 from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+from src.data.data_models import (
+    WorkloadSummary,
+    ExportConfiguration,
+    ExportResult,
+    ReportManifest,
+)
+from src.utils.file_utils import safe_file_name
+
+# Style nommé des lignes d'en-tête des feuilles Excel
+HEADER_STYLE = "En-tête"
+
+# Nombre maximal de lignes d'un tableau PDF : au-delà, le découpage d'un
+# tableau en pages devient coûteux
+PDF_TABLE_ROWS = 500
+
+PDF_TABLE_HEADER = ["Projet", "Profil", "Charge (heures)", "Ticket JIRA"]
+
+# Largeurs des colonnes, en points (largeur utile d'une page A4)
+PDF_COLUMN_WIDTHS = [190, 110, 85, 95]
+
+# Style commun à tous les tableaux de détail
+PDF_TABLE_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("ALIGN", (0, 1), (0, -1), "LEFT"),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), 10),
+        ("BOTTOMPADDING", (0, 0), (-1, 0), 8),
+        ("FONTSIZE", (0, 1), (-1, -1), 9),
+        ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+        ("GRID", (0, 0), (-1, -1), 1, colors.black),
+        ("VALIGN", (0, 1), (-1, -1), "MIDDLE"),
+    ]
+)
+
+# Marges intérieures gauche et droite d'une cellule (valeur par défaut de
+# reportlab)
+PDF_CELL_PADDING = 12
+
+# Styles communs des cellules trop longues pour leur colonne, mises en
+# paragraphe pour passer à la ligne (police et taille des cellules de données)
+PDF_CELL_STYLE = ParagraphStyle("Cellule", fontName="Helvetica", fontSize=9, leading=11)
+PDF_CENTERED_CELL_STYLE = ParagraphStyle(
+    "Cellule centrée", parent=PDF_CELL_STYLE, alignment=TA_CENTER
+)
+PDF_COLUMN_STYLES = [
+    PDF_CELL_STYLE,
+    PDF_CENTERED_CELL_STYLE,
+    PDF_CENTERED_CELL_STYLE,
+    PDF_CENTERED_CELL_STYLE,
+]
+
+# Tables des formats colonnaires : suffixe du fichier -> contenu. Les entrées
+# détaillées sont écrites dans le fichier demandé, les agrégats à côté
+# (resultats.parquet, resultats.profiles.parquet...)
+COLUMNAR_TABLES = ("entries", "profiles", "profiles_by_project_manager")
+
+# Manifeste des rapports par chef de projet
+MANIFEST_FILE_NAME = "manifest.csv"
+
+# Section d'un chef de projet : (chef de projet, lignes du tableau de détail)
+PdfSection = Tuple[str, List[List[str]]]
+
+# Entrée détaillée préparée : (profil, charge, ticket JIRA)
+_PreparedEntry = Tuple[str, float, Optional[str]]
+
+# Projet préparé : (projet, charge totale, entrées)
+_PreparedProject = Tuple[str, float, List[_PreparedEntry]]
+
+
+@dataclass
+class _PreparedExport:
+    """
+    Représentation intermédiaire des résultats, commune à tous les formats
+
+    Construite une seule fois par exportation (ou par lot d'exportations),
+    dans l'ordre des résultats d'analyse ; les valeurs sont des tuples de
+    types simples, peu coûteux à transmettre à un processus.
+    """
+
+    # (profil, charge totale)
+    profiles: List[Tuple[str, float]]
+    # (chef de projet, projets)
+    detailed: List[Tuple[str, List[_PreparedProject]]]
+    # (chef de projet, profil, charge totale)
+    profiles_by_project_manager: List[Tuple[str, str, float]]
+    entry_count: int
+
 
-from typing import List, Dict, Any
-from src.data.data_models import ProfileWorkload, WorkloadEntry, ExportConfiguration
+# Fichier à écrire : (format, chemin, résultats préparés)
+_WriteTask = Tuple[str, str, _PreparedExport]
 
 
 class ExportService:
@@ -21,197 +125,868 @@ class ExportService:
     def export_txt(
         self,
         file_path: str,
-        profiles_workload: List[ProfileWorkload],
-        detailed_workload: Dict[str, Dict[str, List[WorkloadEntry]]],
+        summary: WorkloadSummary,
     ):
         """
         Exporte les résultats au format texte
 
         :param file_path: Chemin du fichier de sortie
-        :param profiles_workload: Charge de travail globale par profil
-        :param detailed_workload: Charge de travail détaillée
-        """
-        with open(file_path, "w", encoding="utf-8") as f:
-            # Résultats globaux
-            f.write("RÉSULTATS GLOBAUX PAR PROFIL:\n")
-            f.write("==========================\n\n")
-            for profile in profiles_workload:
-                f.write(f"Profil: {profile.profile}\n")
-                f.write(
-                    f"Charge de travail totale: {profile.total_workload:.2f} heures\n\n"
-                )
-
-            # Résultats détaillés
-            f.write("RÉSULTATS DÉTAILLÉS PAR CHEF DE PROJET ET PAR PROJET:\n")
-            f.write("=================================================\n\n")
-
-            for pm, projects in detailed_workload.items():
-                f.write(f"Chef de projet: {pm}\n")
-                f.write("-" * 50 + "\n")
-
-                for project, entries in projects.items():
-                    f.write(f"  Projet: {project}\n")
-                    for entry in entries:
-                        jira_info = (
-                            f" (JIRA: {entry.jira_ticket})" if entry.jira_ticket else ""
-                        )
-                        f.write(
-                            f"    • {entry.profile}: {entry.workload:.2f} heures{jira_info}\n"
-                        )
-                    f.write("\n")
+        :param summary: Résultats d'analyse complets, sous-totaux compris
+        """
+        _write_txt(file_path, _prepare(summary))
 
     def export_xlsx(
         self,
         file_path: str,
-        profiles_workload: List[ProfileWorkload],
-        detailed_workload: Dict[str, Dict[str, List[WorkloadEntry]]],
+        summary: WorkloadSummary,
     ):
         """
         Exporte les résultats au format Excel
 
+        Le classeur est ouvert en écriture seule : les lignes sont produites
+        par des générateurs et ajoutées une à une, sans conserver de cellules
+        en mémoire. Les en-têtes partagent un même style nommé ; volets figés,
+        filtres automatiques et largeurs de colonnes sont définis avant
+        l'écriture des données.
+
         :param file_path: Chemin du fichier de sortie
-        :param profiles_workload: Charge de travail globale par profil
-        :param detailed_workload: Charge de travail détaillée
-        """
-        wb = openpyxl.Workbook()
-
-        # Feuille des résultats globaux
-        ws_global = wb.active
-        ws_global.title = "Résultats Globaux"
-
-        ws_global.cell(row=1, column=1, value="Profil")
-        ws_global.cell(row=1, column=2, value="Charge de travail totale (heures)")
-
-        for idx, profile in enumerate(profiles_workload, start=2):
-            ws_global.cell(row=idx, column=1, value=profile.profile)
-            ws_global.cell(row=idx, column=2, value=profile.total_workload)
-
-        # Feuille des résultats détaillés
-        ws_detailed = wb.create_sheet(title="Résultats Détaillés")
-
-        ws_detailed.cell(row=1, column=1, value="Chef de projet")
-        ws_detailed.cell(row=1, column=2, value="Projet")
-        ws_detailed.cell(row=1, column=3, value="Profil")
-        ws_detailed.cell(row=1, column=4, value="Charge (heures)")
-        ws_detailed.cell(row=1, column=5, value="Ticket JIRA")
-
-        row_idx = 2
-        for pm, projects in detailed_workload.items():
-            for project, entries in projects.items():
-                for entry in entries:
-                    ws_detailed.cell(row=row_idx, column=1, value=pm)
-                    ws_detailed.cell(row=row_idx, column=2, value=project)
-                    ws_detailed.cell(row=row_idx, column=3, value=entry.profile)
-                    ws_detailed.cell(row=row_idx, column=4, value=entry.workload)
-                    ws_detailed.cell(
-                        row=row_idx, column=5, value=entry.jira_ticket or "N/A"
-                    )
-                    row_idx += 1
-
-        wb.save(file_path)
+        :param summary: Résultats d'analyse complets, sous-totaux compris
+        """
+        _write_xlsx(file_path, _prepare(summary))
 
     def export_pdf(
         self,
         file_path: str,
-        profiles_workload: List[ProfileWorkload],
-        detailed_workload: Dict[str, Dict[str, List[WorkloadEntry]]],
+        summary: WorkloadSummary,
+        workers: int = 1,
     ):
         """
         Exporte les résultats au format PDF
 
+        Les entrées de chaque chef de projet forment de longs tableaux (au
+        plus PDF_TABLE_ROWS lignes) qui se répartissent sur les pages en
+        répétant leur en-tête ; tous partagent le même style et les mêmes
+        largeurs de colonnes, ce qui évite de mesurer chaque cellule. Avec
+        plusieurs workers, les sections des chefs de projet sont rendues dans
+        des processus distincts puis concaténées avec pypdf, chaque partie
+        commençant sur une nouvelle page (rendu séquentiel si pypdf n'est pas
+        installé).
+
         :param file_path: Chemin du fichier de sortie
-        :param profiles_workload: Charge de travail globale par profil
-        :param detailed_workload: Charge de travail détaillée
+        :param summary: Résultats d'analyse complets, sous-totaux compris
+        :param workers: Nombre de processus de rendu
+        """
+        _write_pdf(file_path, _prepare(summary), workers, self.styles)
+
+    def export_parquet(
+        self,
+        file_path: str,
+        summary: WorkloadSummary,
+    ):
+        """
+        Exporte les résultats au format Parquet (pandas et pyarrow)
+
+        Les entrées détaillées sont écrites dans le fichier demandé, les
+        charges par profil et par chef de projet et profil dans des fichiers
+        voisins (voir columnar_paths). Les colonnes de libellés sont
+        catégorielles, donc encodées par dictionnaire.
+
+        :param file_path: Chemin du fichier des entrées détaillées
+        :param summary: Résultats d'analyse complets, sous-totaux compris
+        """
+        _write_parquet(file_path, _prepare(summary))
+
+    def export_feather(
+        self,
+        file_path: str,
+        summary: WorkloadSummary,
+    ):
+        """
+        Exporte les résultats au format Feather (Arrow IPC), comme
+        export_parquet
+
+        :param file_path: Chemin du fichier des entrées détaillées
+        :param summary: Résultats d'analyse complets, sous-totaux compris
+        """
+        _write_feather(file_path, _prepare(summary))
+
+    def export_jsonl(
+        self,
+        file_path: str,
+        summary: WorkloadSummary,
+    ):
+        """
+        Exporte les résultats au format JSON Lines
+
+        Un objet JSON par ligne, écrit au fil du parcours des résultats ; le
+        champ "record" indique son type : "profile" (charge totale d'un
+        profil), "project_manager_profile" (charge d'un profil pour un chef de
+        projet) ou "entry" (entrée détaillée, avec le total de son projet).
+
+        :param file_path: Chemin du fichier de sortie
+        :param summary: Résultats d'analyse complets, sous-totaux compris
+        """
+        _write_jsonl(file_path, _prepare(summary))
+
+    def export(
+        self,
+        config: ExportConfiguration,
+        summary: WorkloadSummary,
+    ):
+        """
+        Exporte les résultats selon la configuration
+
+        :param config: Configuration d'exportation
+        :param summary: Résultats d'analyse complets, sous-totaux compris
+        """
+        _check_configuration(config)
+        _write(config.export_format, config.file_path, _prepare(summary), self.styles)
+
+    def export_many(
+        self,
+        configs: List[ExportConfiguration],
+        summary: WorkloadSummary,
+        max_workers: Optional[int] = None,
+        use_processes: bool = False,
+    ) -> List[ExportResult]:
+        """
+        Exporte les mêmes résultats dans plusieurs formats en une fois
+
+        La représentation intermédiaire des résultats est préparée une seule
+        fois, puis chaque format est écrit dans sa propre tâche d'un pool de
+        threads (ou de processus). L'échec d'un format n'interrompt pas les
+        autres : son erreur est rapportée dans son résultat.
+
+        :param configs: Configurations d'exportation (une par fichier)
+        :param summary: Résultats d'analyse complets, sous-totaux compris
+        :param max_workers: Nombre de tâches simultanées (une par
+            configuration si None ; 1 pour tout écrire dans le thread courant)
+        :param use_processes: Écrire dans un pool de processus plutôt que de
+            threads (rendus PDF et XLSX volumineux, limités par le GIL)
+        :return: Résultat de chaque configuration, dans l'ordre de configs
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("Le nombre de tâches doit être au moins 1")
+
+        results: List[Optional[ExportResult]] = [None] * len(configs)
+        pending = []
+        for index, config in enumerate(configs):
+            try:
+                _check_configuration(config)
+            except ValueError as e:
+                results[index] = ExportResult(
+                    config.export_format, config.file_path, error=str(e)
+                )
+            else:
+                pending.append(index)
+
+        if pending:
+            prepared = _prepare(summary)
+            tasks = [
+                (configs[index].export_format, configs[index].file_path, prepared)
+                for index in pending
+            ]
+            written = _run_writes(tasks, max_workers, use_processes, self.styles)
+            for index, result in zip(pending, written):
+                results[index] = result
+
+        return results
+
+    def export_by_project_manager(
+        self,
+        summary: WorkloadSummary,
+        directory: str,
+        export_format: str = "pdf",
+        max_workers: Optional[int] = None,
+        use_processes: bool = False,
+    ) -> ReportManifest:
+        """
+        Écrit un rapport par chef de projet, limité à ses propres projets
+
+        Les résultats sont préparés puis répartis par chef de projet en un
+        seul parcours ; les rapports sont écrits en parallèle, par lots, dans
+        le répertoire de sortie, avec un manifeste (manifest.csv) listant
+        chaque fichier, sa taille, sa durée d'écriture et l'erreur éventuelle.
+        Chaque rapport reprend la structure de l'export complet, les
+        résultats globaux étant ceux du chef de projet.
+
+        :param summary: Résultats d'analyse complets, sous-totaux compris
+        :param directory: Répertoire de sortie (créé si nécessaire)
+        :param export_format: Format des rapports (voir export)
+        :param max_workers: Nombre de tâches simultanées (nombre de CPU si
+            None ; 1 pour tout écrire dans le thread courant)
+        :param use_processes: Écrire dans un pool de processus plutôt que de
+            threads
+        :return: Manifeste des rapports écrits
         """
-        doc = SimpleDocTemplate(file_path, pagesize=A4)
-        elements = []
+        if export_format not in _WRITERS:
+            raise ValueError(f"Format d'exportation non supporté: {export_format}")
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("Le nombre de tâches doit être au moins 1")
+
+        start = time.perf_counter()
+        os.makedirs(directory, exist_ok=True)
+
+        reports = _split_by_project_manager(_prepare(summary))
+        used_names = set()
+        tasks = []
+        for pm, prepared in reports:
+            name = safe_file_name(pm)
+            unique_name, suffix = name, 2
+            while unique_name.lower() in used_names:
+                unique_name, suffix = f"{name}_{suffix}", suffix + 1
+            used_names.add(unique_name.lower())
+            file_path = os.path.join(directory, f"{unique_name}.{export_format}")
+            tasks.append((export_format, file_path, prepared))
+
+        written = _run_writes(
+            tasks, max_workers or os.cpu_count() or 1, use_processes, self.styles
+        )
+
+        manifest = ReportManifest(
+            manifest_path=os.path.join(directory, MANIFEST_FILE_NAME),
+            reports={pm: result for (pm, _), result in zip(reports, written)},
+        )
+        _write_manifest(manifest)
+        manifest.duration = time.perf_counter() - start
+        return manifest
 
-        # Styles personnalisés
-        title_style = self.styles["Heading1"]
-        subtitle_style = self.styles["Heading2"]
-        normal_style = self.styles["Normal"]
 
-        # Titre
+def _check_configuration(config: ExportConfiguration):
+    """
+    Vérifie qu'une configuration d'exportation est exploitable
+
+    :param config: Configuration d'exportation
+    """
+    if not config.file_path:
+        raise ValueError("Le chemin du fichier n'est pas spécifié")
+    if config.export_format not in _WRITERS:
+        raise ValueError(f"Format d'exportation non supporté: {config.export_format}")
+
+
+def _prepare(summary: WorkloadSummary) -> _PreparedExport:
+    """
+    Construit la représentation intermédiaire commune à tous les formats
+
+    :param summary: Résultats d'analyse complets, sous-totaux compris
+    :return: Résultats préparés
+    """
+    detailed = []
+    entry_count = 0
+    for pm, projects in summary.detailed_workload.items():
+        project_totals = summary.project_totals[pm]
+        prepared_projects = []
+        for project, entries in projects.items():
+            prepared_projects.append(
+                (
+                    project,
+                    project_totals[project],
+                    [
+                        (entry.profile, entry.workload, entry.jira_ticket)
+                        for entry in entries
+                    ],
+                )
+            )
+            entry_count += len(entries)
+        detailed.append((pm, prepared_projects))
+
+    return _PreparedExport(
+        profiles=[
+            (profile.profile, profile.total_workload)
+            for profile in summary.profiles_workload
+        ],
+        detailed=detailed,
+        profiles_by_project_manager=[
+            (pm, profile, workload)
+            for pm, profiles in summary.profiles_by_project_manager.items()
+            for profile, workload in profiles.items()
+        ],
+        entry_count=entry_count,
+    )
+
+
+def _write(
+    export_format: str,
+    file_path: str,
+    prepared: _PreparedExport,
+    styles: Optional[StyleSheet1] = None,
+):
+    """
+    Écrit des résultats préparés dans un format
+
+    :param export_format: Format d'exportation (txt, xlsx, pdf, parquet,
+        feather ou jsonl)
+    :param file_path: Chemin du fichier de sortie
+    :param prepared: Résultats préparés
+    :param styles: Feuille de styles PDF (celle de reportlab par défaut)
+    """
+    if export_format == "pdf":
+        _write_pdf(file_path, prepared, styles=styles)
+    else:
+        _WRITERS[export_format](file_path, prepared)
+
+
+def _timed_write(
+    export_format: str,
+    file_path: str,
+    prepared: _PreparedExport,
+    styles: Optional[StyleSheet1] = None,
+) -> ExportResult:
+    """
+    Écrit des résultats préparés dans un format et mesure la durée d'écriture
+
+    :return: Résultat de l'exportation, erreur éventuelle comprise
+    """
+    result = ExportResult(export_format, file_path)
+    start = time.perf_counter()
+    try:
+        _write(export_format, file_path, prepared, styles)
+        result.size = os.path.getsize(file_path)
+    except Exception as e:
+        result.error = str(e)
+    result.duration = time.perf_counter() - start
+    return result
+
+
+def _timed_write_many(
+    tasks: List[_WriteTask], styles: Optional[StyleSheet1] = None
+) -> List[ExportResult]:
+    """
+    Écrit un lot de fichiers (voir _timed_write)
+    """
+    return [
+        _timed_write(export_format, file_path, prepared, styles)
+        for export_format, file_path, prepared in tasks
+    ]
+
+
+def _run_writes(
+    tasks: List[_WriteTask],
+    max_workers: Optional[int],
+    use_processes: bool,
+    styles: Optional[StyleSheet1] = None,
+) -> List[ExportResult]:
+    """
+    Écrit des fichiers dans un pool de threads ou de processus
+
+    Dans un pool de processus, les tâches sont regroupées en lots (environ
+    quatre par processus) pour limiter le coût de transfert.
+
+    :param tasks: Fichiers à écrire : (format, chemin, résultats préparés)
+    :param max_workers: Nombre de tâches simultanées (une par fichier si None)
+    :param use_processes: Écrire dans un pool de processus
+    :param styles: Feuille de styles PDF, partagée entre threads seulement
+    :return: Résultat de chaque fichier, dans l'ordre des tâches
+    """
+    workers = min(max_workers or len(tasks), len(tasks))
+    if workers <= 1:
+        return _timed_write_many(tasks, styles)
+
+    executor: Executor
+    if use_processes:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        size = -(-len(tasks) // (workers * 4))
+        # Les feuilles de styles reportlab ne sont partagées qu'entre threads
+        # d'un même processus
+        styles = None
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+        size = 1
+    chunks = [tasks[i : i + size] for i in range(0, len(tasks), size)]
+
+    results = []
+    with executor:
+        futures = [
+            executor.submit(_timed_write_many, chunk, styles) for chunk in chunks
+        ]
+        for chunk, future in zip(chunks, futures):
+            try:
+                results.extend(future.result())
+            except Exception as e:
+                # Processus de travail interrompu
+                results.extend(
+                    ExportResult(export_format, file_path, error=str(e))
+                    for export_format, file_path, _ in chunk
+                )
+    return results
+
+
+def _split_by_project_manager(
+    prepared: _PreparedExport,
+) -> List[Tuple[str, _PreparedExport]]:
+    """
+    Répartit des résultats préparés par chef de projet, en un seul parcours
+
+    Les résultats globaux de chaque partie sont les charges par profil du
+    chef de projet.
+
+    :param prepared: Résultats préparés complets
+    :return: (chef de projet, résultats préparés de ses seuls projets)
+    """
+    profiles_by_pm: Dict[str, List[Tuple[str, str, float]]] = {}
+    for row in prepared.profiles_by_project_manager:
+        profiles_by_pm.setdefault(row[0], []).append(row)
+
+    parts = []
+    for pm, projects in prepared.detailed:
+        pm_profiles = profiles_by_pm.get(pm, [])
+        parts.append(
+            (
+                pm,
+                _PreparedExport(
+                    profiles=[
+                        (profile, workload) for _, profile, workload in pm_profiles
+                    ],
+                    detailed=[(pm, projects)],
+                    profiles_by_project_manager=pm_profiles,
+                    entry_count=sum(len(entries) for _, _, entries in projects),
+                ),
+            )
+        )
+    return parts
+
+
+def _write_manifest(manifest: ReportManifest):
+    """
+    Écrit le manifeste des rapports au format CSV
+
+    :param manifest: Manifeste des rapports écrits
+    """
+    with open(manifest.manifest_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            ["Chef de projet", "Fichier", "Taille (octets)", "Durée (s)", "Erreur"]
+        )
+        for pm, result in manifest.reports.items():
+            writer.writerow(
+                [
+                    pm,
+                    os.path.basename(result.file_path or ""),
+                    result.size,
+                    f"{result.duration:.3f}",
+                    result.error or "",
+                ]
+            )
+
+
+def _write_txt(file_path: str, prepared: _PreparedExport):
+    """
+    Écrit les résultats préparés au format texte
+    """
+    with open(file_path, "w", encoding="utf-8") as f:
+        # Résultats globaux
+        f.write("RÉSULTATS GLOBAUX PAR PROFIL:\n")
+        f.write("==========================\n\n")
+        for profile, total_workload in prepared.profiles:
+            f.write(f"Profil: {profile}\n")
+            f.write(f"Charge de travail totale: {total_workload:.2f} heures\n\n")
+
+        # Résultats détaillés
+        f.write("RÉSULTATS DÉTAILLÉS PAR CHEF DE PROJET ET PAR PROJET:\n")
+        f.write("=================================================\n\n")
+
+        for pm, projects in prepared.detailed:
+            f.write(f"Chef de projet: {pm}\n")
+            f.write("-" * 50 + "\n")
+
+            for project, project_total, entries in projects:
+                f.write(f"  Projet: {project} (Total: {project_total:.2f} heures)\n")
+                for profile, workload, jira_ticket in entries:
+                    jira_info = f" (JIRA: {jira_ticket})" if jira_ticket else ""
+                    f.write(f"    • {profile}: {workload:.2f} heures{jira_info}\n")
+                f.write("\n")
+
+
+def _write_xlsx(file_path: str, prepared: _PreparedExport):
+    """
+    Écrit les résultats préparés au format Excel, en écriture seule
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    wb.add_named_style(_header_style())
+
+    _write_sheet(
+        wb,
+        "Résultats Globaux",
+        [("Profil", 30), ("Charge de travail totale (heures)", 34)],
+        len(prepared.profiles),
+        prepared.profiles,
+    )
+    _write_sheet(
+        wb,
+        "Résultats Détaillés",
+        [
+            ("Chef de projet", 25),
+            ("Projet", 40),
+            ("Profil", 25),
+            ("Charge (heures)", 16),
+            ("Ticket JIRA", 16),
+        ],
+        prepared.entry_count,
+        _detailed_rows(prepared),
+    )
+    _write_sheet(
+        wb,
+        "Profils par Chef de Projet",
+        [
+            ("Chef de projet", 25),
+            ("Profil", 25),
+            ("Charge de travail totale (heures)", 34),
+        ],
+        len(prepared.profiles_by_project_manager),
+        prepared.profiles_by_project_manager,
+    )
+
+    wb.save(file_path)
+
+
+def _write_pdf(
+    file_path: str,
+    prepared: _PreparedExport,
+    workers: int = 1,
+    styles: Optional[StyleSheet1] = None,
+):
+    """
+    Écrit les résultats préparés au format PDF (voir ExportService.export_pdf)
+    """
+    sections = _pdf_sections(prepared)
+
+    parts = _partition(sections, min(workers, len(sections)))
+    if len(parts) > 1:
+        try:
+            from pypdf import PdfWriter
+        except ImportError:
+            parts = [sections]
+    if len(parts) <= 1:
+        _render_pdf(file_path, prepared.profiles, sections, styles)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        part_paths = [
+            os.path.join(directory, f"part{index}.pdf") for index in range(len(parts))
+        ]
+        with ProcessPoolExecutor(max_workers=len(parts)) as executor:
+            futures = [
+                executor.submit(
+                    _render_pdf,
+                    part_path,
+                    prepared.profiles if index == 0 else None,
+                    part,
+                )
+                for index, (part_path, part) in enumerate(zip(part_paths, parts))
+            ]
+            for future in futures:
+                future.result()
+
+        writer = PdfWriter()
+        for part_path in part_paths:
+            writer.append(part_path)
+        with open(file_path, "wb") as output:
+            writer.write(output)
+
+
+def columnar_paths(file_path: str) -> Dict[str, str]:
+    """
+    Chemins des tables d'un export colonnaire (Parquet ou Feather)
+
+    :param file_path: Chemin du fichier des entrées détaillées
+    :return: Table (voir COLUMNAR_TABLES) -> chemin de son fichier
+    """
+    stem, extension = os.path.splitext(file_path)
+    paths = {COLUMNAR_TABLES[0]: file_path}
+    for table in COLUMNAR_TABLES[1:]:
+        paths[table] = f"{stem}.{table}{extension}"
+    return paths
+
+
+def _columnar_frames(prepared: _PreparedExport) -> Dict[str, Any]:
+    """
+    DataFrames pandas des tables d'un export colonnaire
+
+    Les libellés sont construits directement en colonnes catégorielles
+    (codes et catégories), sans passer par une liste d'objets par ligne.
+
+    :param prepared: Résultats préparés
+    :return: Table (voir COLUMNAR_TABLES) -> DataFrame
+    """
+    import pandas as pd
+
+    labels: Dict[str, Dict[Optional[str], int]] = {
+        name: {} for name in ("project_manager", "project", "profile", "jira_ticket")
+    }
+    codes: Dict[str, List[int]] = {name: [] for name in labels}
+    project_totals: List[float] = []
+    workloads: List[float] = []
+
+    def code(name: str, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        return labels[name].setdefault(value, len(labels[name]))
+
+    for pm, projects in prepared.detailed:
+        pm_code = code("project_manager", pm)
+        for project, project_total, entries in projects:
+            project_code = code("project", project)
+            for profile, workload, jira_ticket in entries:
+                codes["project_manager"].append(pm_code)
+                codes["project"].append(project_code)
+                codes["profile"].append(code("profile", profile))
+                codes["jira_ticket"].append(code("jira_ticket", jira_ticket or None))
+                project_totals.append(project_total)
+                workloads.append(workload)
+
+    entries = pd.DataFrame(
+        {
+            name: pd.Categorical.from_codes(codes[name], categories=list(labels[name]))
+            for name in ("project_manager", "project", "profile", "jira_ticket")
+        }
+    )
+    entries.insert(2, "project_total", pd.Series(project_totals, dtype="float64"))
+    entries.insert(4, "workload", pd.Series(workloads, dtype="float64"))
+
+    profiles = pd.DataFrame(
+        prepared.profiles, columns=["profile", "total_workload"]
+    ).astype({"total_workload": "float64"})
+    profiles_by_pm = pd.DataFrame(
+        prepared.profiles_by_project_manager,
+        columns=["project_manager", "profile", "total_workload"],
+    ).astype(
+        {
+            "project_manager": "category",
+            "profile": "category",
+            "total_workload": "float64",
+        }
+    )
+    return {
+        "entries": entries,
+        "profiles": profiles,
+        "profiles_by_project_manager": profiles_by_pm,
+    }
+
+
+def _write_parquet(file_path: str, prepared: _PreparedExport):
+    """
+    Écrit les résultats préparés au format Parquet (voir ExportService.export_parquet)
+    """
+    frames = _columnar_frames(prepared)
+    for table, path in columnar_paths(file_path).items():
+        frames[table].to_parquet(path, index=False)
+
+
+def _write_feather(file_path: str, prepared: _PreparedExport):
+    """
+    Écrit les résultats préparés au format Feather (voir ExportService.export_feather)
+    """
+    frames = _columnar_frames(prepared)
+    for table, path in columnar_paths(file_path).items():
+        frames[table].to_feather(path)
+
+
+def _write_jsonl(file_path: str, prepared: _PreparedExport):
+    """
+    Écrit les résultats préparés au format JSON Lines, un objet à la fois
+    (voir ExportService.export_jsonl)
+    """
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    with open(file_path, "w", encoding="utf-8") as f:
+        for profile, total_workload in prepared.profiles:
+            record = {
+                "record": "profile",
+                "profile": profile,
+                "total_workload": total_workload,
+            }
+            f.write(dumps(record) + "\n")
+
+        for pm, profile, workload in prepared.profiles_by_project_manager:
+            record = {
+                "record": "project_manager_profile",
+                "project_manager": pm,
+                "profile": profile,
+                "total_workload": workload,
+            }
+            f.write(dumps(record) + "\n")
+
+        for pm, projects in prepared.detailed:
+            for project, project_total, entries in projects:
+                for profile, workload, jira_ticket in entries:
+                    record = {
+                        "record": "entry",
+                        "project_manager": pm,
+                        "project": project,
+                        "project_total": project_total,
+                        "profile": profile,
+                        "workload": workload,
+                        "jira_ticket": jira_ticket or None,
+                    }
+                    f.write(dumps(record) + "\n")
+
+
+# Écriture des formats sans options
+_WRITERS = {
+    "txt": _write_txt,
+    "xlsx": _write_xlsx,
+    "pdf": _write_pdf,
+    "parquet": _write_parquet,
+    "feather": _write_feather,
+    "jsonl": _write_jsonl,
+}
+
+
+def _header_style() -> NamedStyle:
+    """
+    Style nommé des en-têtes, enregistré une fois par classeur et partagé
+    par toutes les cellules d'en-tête
+    """
+    style = NamedStyle(name=HEADER_STYLE)
+    style.font = Font(bold=True, color="FFFFFF")
+    style.fill = PatternFill("solid", fgColor="808080")
+    style.alignment = Alignment(horizontal="center", vertical="center")
+    return style
+
+
+def _write_sheet(
+    wb: openpyxl.Workbook,
+    title: str,
+    columns: List[Tuple[str, float]],
+    row_count: int,
+    rows: Iterable[Tuple[Any, ...]],
+):
+    """
+    Ajoute une feuille à un classeur en écriture seule
+
+    :param wb: Classeur ouvert en écriture seule
+    :param title: Titre de la feuille
+    :param columns: Libellé et largeur de chaque colonne
+    :param row_count: Nombre de lignes de données (étendue du filtre)
+    :param rows: Lignes de données, parcourues une seule fois
+    """
+    ws = wb.create_sheet(title=title)
+    for index, (_, width) in enumerate(columns, start=1):
+        ws.column_dimensions[get_column_letter(index)].width = width
+    ws.freeze_panes = "A2"
+    ws.auto_filter.ref = f"A1:{get_column_letter(len(columns))}{row_count + 1}"
+
+    header = []
+    for label, _ in columns:
+        cell = WriteOnlyCell(ws, value=label)
+        cell.style = HEADER_STYLE
+        header.append(cell)
+    ws.append(header)
+
+    for row in rows:
+        ws.append(row)
+
+
+def _detailed_rows(prepared: _PreparedExport) -> Iterator[Tuple[Any, ...]]:
+    """
+    Lignes de la feuille des résultats détaillés, produites à la demande
+    """
+    for pm, projects in prepared.detailed:
+        for project, _, entries in projects:
+            for profile, workload, jira_ticket in entries:
+                yield (pm, project, profile, workload, jira_ticket or "N/A")
+
+
+def _pdf_sections(prepared: _PreparedExport) -> List[PdfSection]:
+    """
+    Lignes des tableaux de détail de chaque chef de projet ; le projet et son
+    total ne figurent que sur la première ligne de ses entrées
+    """
+    sections = []
+    for pm, projects in prepared.detailed:
+        rows = []
+        for project, project_total, entries in projects:
+            label = f"{project} ({project_total:.2f} h)"
+            for profile, workload, jira_ticket in entries:
+                rows.append([label, profile, f"{workload:.2f}", jira_ticket or "N/A"])
+                label = ""
+        sections.append((pm, rows))
+    return sections
+
+
+def _partition(sections: List[PdfSection], parts: int) -> List[List[PdfSection]]:
+    """
+    Répartit des sections consécutives en groupes de tailles comparables
+
+    :param sections: Sections, dans l'ordre du document
+    :param parts: Nombre de groupes souhaité
+    :return: Groupes non vides, dans l'ordre du document
+    """
+    total = sum(len(rows) + 1 for _, rows in sections)
+    groups: List[List[PdfSection]] = [[]]
+    size = 0
+    for section in sections:
+        if groups[-1] and size >= total * len(groups) / max(parts, 1):
+            groups.append([])
+        groups[-1].append(section)
+        size += len(section[1]) + 1
+    return groups
+
+
+def _render_pdf(
+    file_path: str,
+    profiles: Optional[List[Tuple[str, float]]],
+    sections: List[PdfSection],
+    styles: Optional[StyleSheet1] = None,
+):
+    """
+    Rend un document PDF (ou une partie de document)
+
+    :param file_path: Chemin du fichier de sortie
+    :param profiles: Charge totale par profil ; None pour une partie qui ne
+        commence pas le document (ni titre ni résultats globaux)
+    :param sections: Sections des chefs de projet
+    :param styles: Feuille de styles (celle de reportlab par défaut)
+    """
+    styles = styles or getSampleStyleSheet()
+    title_style = styles["Heading1"]
+    subtitle_style = styles["Heading2"]
+    normal_style = styles["Normal"]
+
+    elements = []
+    if profiles is not None:
         elements.append(Paragraph("Analyse de Charge de Travail", title_style))
         elements.append(Spacer(1, 12))
 
-        # Résultats globaux
         elements.append(Paragraph("Résultats Globaux par Profil", subtitle_style))
-        for profile in profiles_workload:
+        for profile, total_workload in profiles:
             elements.append(
                 Paragraph(
-                    f"Profil: {profile.profile} - Charge totale: {profile.total_workload:.2f} heures",
+                    f"Profil: {profile} - Charge totale: {total_workload:.2f} heures",
                     normal_style,
                 )
             )
-
         elements.append(Spacer(1, 12))
 
-        # Résultats détaillés
         elements.append(
             Paragraph("Résultats Détaillés par Chef de Projet", subtitle_style)
         )
 
-        for pm, projects in detailed_workload.items():
-            elements.append(Paragraph(f"Chef de projet: {pm}", subtitle_style))
-
-            for project, entries in projects.items():
-                elements.append(Paragraph(f"Projet: {project}", normal_style))
-
-                # Créer un tableau pour les entrées de ce projet
-                table_data = [["Profil", "Charge (heures)", "Ticket JIRA"]]
-                for entry in entries:
-                    table_data.append(
-                        [
-                            entry.profile,
-                            f"{entry.workload:.2f}",
-                            entry.jira_ticket or "N/A",
-                        ]
-                    )
-
-                table = Table(table_data)
-                table.setStyle(
-                    TableStyle(
-                        [
-                            ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                            ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                            ("FONTSIZE", (0, 0), (-1, 0), 12),
-                            ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                            ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                            ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                        ]
-                    )
-                )
-                elements.append(table)
-                elements.append(Spacer(1, 12))
+    for pm, rows in sections:
+        elements.append(Paragraph(f"Chef de projet: {pm}", subtitle_style))
+        for start in range(0, len(rows), PDF_TABLE_ROWS):
+            table = Table(
+                [PDF_TABLE_HEADER]
+                + [_pdf_row(row) for row in rows[start : start + PDF_TABLE_ROWS]],
+                colWidths=PDF_COLUMN_WIDTHS,
+                repeatRows=1,
+            )
+            table.setStyle(PDF_TABLE_STYLE)
+            elements.append(table)
+        elements.append(Spacer(1, 12))
 
-        doc.build(elements)
+    SimpleDocTemplate(file_path, pagesize=A4).build(elements)
 
-    def export(
-        self,
-        config: ExportConfiguration,
-        profiles_workload: List[ProfileWorkload],
-        detailed_workload: Dict[str, Dict[str, List[WorkloadEntry]]],
-    ):
-        """
-        Exporte les résultats selon la configuration
 
-        :param config: Configuration d'exportation
-        :param profiles_workload: Charge de travail globale par profil
-        :param detailed_workload: Charge de travail détaillée
-        """
-        if not config.file_path:
-            raise ValueError("Le chemin du fichier n'est pas spécifié")
-
-        if config.export_format == "txt":
-            self.export_txt(config.file_path, profiles_workload, detailed_workload)
-        elif config.export_format == "xlsx":
-            self.export_xlsx(config.file_path, profiles_workload, detailed_workload)
-        elif config.export_format == "pdf":
-            self.export_pdf(config.file_path, profiles_workload, detailed_workload)
+def _pdf_row(row: List[str]) -> List[Any]:
+    """
+    Cellules d'une ligne de tableau PDF : le texte qui tient dans sa colonne
+    reste une chaîne, le texte plus long devient un paragraphe au style
+    partagé, qui passe à la ligne au lieu de déborder sur la cellule voisine
+    """
+    cells: List[Any] = []
+    for text, width, style in zip(row, PDF_COLUMN_WIDTHS, PDF_COLUMN_STYLES):
+        if stringWidth(text, style.fontName, style.fontSize) > width - PDF_CELL_PADDING:
+            cells.append(Paragraph(escape(text), style))
         else:
-            raise ValueError(
-                f"Format d'exportation non supporté: {config.export_format}"
-            )
+            cells.append(text)
+    return cells
@@ -0,0 +1,198 @@
+﻿import queue
+import threading
+import tkinter as tk
+from typing import Any, Callable, Optional
+
+from src.constants import JOB_POLL_INTERVAL_MS
+
+
+class JobCancelled(Exception):
+    """
+    Levée dans le thread de travail lorsqu'une tâche annulée atteint un point
+    de contrôle
+    """
+
+
+class BackgroundJob:
+    """
+    Tâche d'analyse exécutée sur un thread de travail
+
+    La tâche communique avec le thread Tk uniquement par la file de son
+    exécuteur ; l'annulation est coopérative : elle prend effet au prochain
+    point de contrôle (report_progress ou check_cancelled).
+    """
+
+    def __init__(
+        self,
+        job_id: int,
+        messages: "queue.Queue",
+        on_success: Callable[[Any], None],
+        on_error: Callable[[Exception], None],
+        on_progress: Optional[Callable[[int, Optional[int]], None]] = None,
+        on_cancelled: Optional[Callable[[], None]] = None,
+    ):
+        self.job_id = job_id
+        self._messages = messages
+        self._cancelled = threading.Event()
+        self.on_success = on_success
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancelled = on_cancelled
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """
+        Demande l'arrêt de la tâche
+        """
+        self._cancelled.set()
+
+    def check_cancelled(self):
+        """
+        Point de contrôle : interrompt la tâche si elle a été annulée
+        """
+        if self._cancelled.is_set():
+            raise JobCancelled()
+
+    def report_progress(self, done: int, total: Optional[int]):
+        """
+        Point de contrôle qui transmet aussi la progression au thread Tk
+        (utilisable comme ExcelReader.progress_callback)
+
+        :param done: Lignes parcourues
+        :param total: Nombre de lignes attendu (None s'il est inconnu)
+        """
+        self.check_cancelled()
+        self._messages.put(("progress", self, (done, total)))
+
+
+class BackgroundJobRunner:
+    """
+    Exécute une tâche d'analyse à la fois sur un thread de travail
+
+    Les messages du thread (progression, résultat, erreur) passent par une
+    file relevée avec root.after : les callbacks s'exécutent donc toujours
+    sur le thread Tk. Démarrer une tâche annule la précédente, dont les
+    messages sont ignorés même si elle se termine ensuite.
+    """
+
+    def __init__(self, root: tk.Misc, poll_interval: int = JOB_POLL_INTERVAL_MS):
+        """
+        Initialise l'exécuteur
+
+        :param root: Widget Tk utilisé pour planifier la relève de la file
+        :param poll_interval: Intervalle de relève, en millisecondes
+        """
+        self.root = root
+        self.poll_interval = poll_interval
+        self._messages: "queue.Queue" = queue.Queue()
+        self._current: Optional[BackgroundJob] = None
+        self._next_id = 0
+        self._polling = False
+
+    @property
+    def running(self) -> bool:
+        """
+        Indique si une tâche est en cours
+        """
+        return self._current is not None
+
+    def start(
+        self,
+        work: Callable[[BackgroundJob], Any],
+        on_success: Callable[[Any], None],
+        on_error: Callable[[Exception], None],
+        on_progress: Optional[Callable[[int, Optional[int]], None]] = None,
+        on_cancelled: Optional[Callable[[], None]] = None,
+    ) -> BackgroundJob:
+        """
+        Démarre une tâche, en annulant la tâche en cours
+
+        :param work: Travail exécuté sur le thread, qui reçoit la tâche pour
+            signaler sa progression et vérifier son annulation
+        :param on_success: Appelé avec le résultat de work
+        :param on_error: Appelé avec l'exception levée par work
+        :param on_progress: Appelé avec (lignes parcourues, total ou None)
+        :param on_cancelled: Appelé lorsque l'annulation a pris effet
+        :return: Tâche démarrée
+        """
+        self.cancel()
+        self._next_id += 1
+        job = BackgroundJob(
+            self._next_id,
+            self._messages,
+            on_success,
+            on_error,
+            on_progress,
+            on_cancelled,
+        )
+        self._current = job
+
+        thread = threading.Thread(
+            target=self._run, args=(job, work), name=f"analyse-{job.job_id}"
+        )
+        thread.daemon = True
+        thread.start()
+
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval, self._poll)
+        return job
+
+    def cancel(self):
+        """
+        Annule la tâche en cours ; son callback on_cancelled est appelé dès
+        que le thread atteint un point de contrôle
+        """
+        if self._current is not None:
+            self._current.cancel()
+
+    def _run(self, job: BackgroundJob, work: Callable[[BackgroundJob], Any]):
+        try:
+            result = work(job)
+            job.check_cancelled()
+        except JobCancelled:
+            self._messages.put(("cancelled", job, None))
+        except Exception as e:
+            self._messages.put(("error", job, e))
+        else:
+            self._messages.put(("done", job, result))
+
+    def _poll(self):
+        """
+        Relève les messages en attente et les transmet aux callbacks de la
+        tâche courante ; seule la dernière progression relevée est affichée
+        """
+        progress = None
+        while True:
+            try:
+                kind, job, payload = self._messages.get_nowait()
+            except queue.Empty:
+                break
+            if job is not self._current:
+                # Tâche remplacée : résultat périmé
+                continue
+
+            if kind == "progress":
+                progress = payload
+                continue
+
+            self._current = None
+            progress = None
+            if kind == "done":
+                job.on_success(payload)
+            elif kind == "error":
+                job.on_error(payload)
+            elif job.on_cancelled is not None:
+                job.on_cancelled()
+
+        if progress is not None and self._current is not None:
+            if self._current.on_progress is not None:
+                self._current.on_progress(*progress)
+
+        if self._current is not None:
+            self.root.after(self.poll_interval, self._poll)
+        else:
+            self._polling = False
@@ -1,8 +1,8 @@
 ﻿import tkinter as tk
 from tkinter import ttk
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict
 
-from src.data.data_models import ProfileWorkload, WorkloadEntry
+from src.data.data_models import ProfileWorkload, WorkloadEntry, WorkloadSummary
 
 
 class ResultsDisplay(ttk.Frame):
@@ -18,9 +18,8 @@ class ResultsDisplay(ttk.Frame):
         """
         super().__init__(master)
 
-        # Variables pour stocker les résultats
-        self._profiles_workload: List[ProfileWorkload] = []
-        self._detailed_workload: Dict[str, Dict[str, List[WorkloadEntry]]] = {}
+        # Résultats affichés
+        self._summary: WorkloadSummary = WorkloadSummary()
 
         # Créer les widgets
         self._create_widgets()
@@ -49,29 +48,23 @@ class ResultsDisplay(ttk.Frame):
         self.notebook.add(self.global_results_text, text="Résultats Globaux")
         self.notebook.add(self.detailed_results_text, text="Résultats Détaillés")
 
-    def display_results(
-        self,
-        profiles_workload: List[ProfileWorkload],
-        detailed_workload: Dict[str, Dict[str, List[WorkloadEntry]]],
-    ):
+    def display_results(self, summary: WorkloadSummary):
         """
         Affiche les résultats de l'analyse
 
-        :param profiles_workload: Charge de travail globale par profil
-        :param detailed_workload: Charge de travail détaillée
+        :param summary: Résultats d'analyse complets, sous-totaux compris
         """
         # Stocker les résultats
-        self._profiles_workload = profiles_workload
-        self._detailed_workload = detailed_workload
+        self._summary = summary
 
         # Effacer les résultats précédents
         self._clear_results()
 
         # Afficher les résultats globaux
-        self._display_global_results(profiles_workload)
+        self._display_global_results(summary.profiles_workload)
 
         # Afficher les résultats détaillés
-        self._display_detailed_results(detailed_workload)
+        self._display_detailed_results(summary)
 
     def _clear_results(self):
         """
@@ -125,13 +118,11 @@ class ResultsDisplay(ttk.Frame):
 
         text_widget.config(state=tk.DISABLED)
 
-    def _display_detailed_results(
-        self, detailed_workload: Dict[str, Dict[str, List[WorkloadEntry]]]
-    ):
+    def _display_detailed_results(self, summary: WorkloadSummary):
         """
         Affiche les résultats détaillés
 
-        :param detailed_workload: Charge de travail détaillée
+        :param summary: Résultats d'analyse complets, sous-totaux compris
         """
         text_widget = self.detailed_results_text
         text_widget.config(state=tk.NORMAL)
@@ -145,10 +136,7 @@ class ResultsDisplay(ttk.Frame):
         )
 
         # Parcourir les chefs de projet
-        for pm, projects in detailed_workload.items():
-            # Calculer la charge totale par profil pour ce chef de projet
-            profiles_by_pm = self._calculate_profiles_workload_by_pm(pm, projects)
-
+        for pm, projects in summary.detailed_workload.items():
             # N'afficher que les chefs de projet avec des projets non vides
             if not self._has_non_empty_projects(projects):
                 continue
@@ -172,8 +160,7 @@ class ResultsDisplay(ttk.Frame):
             }
 
             # Mettre à jour avec les charges de travail effectives
-            for profile_data in profiles_by_pm:
-                all_profiles[profile_data["profile"]] = profile_data["total_workload"]
+            all_profiles.update(summary.profiles_by_project_manager[pm])
 
             # Trier les profils
             sorted_profiles = sorted(
@@ -195,12 +182,13 @@ class ResultsDisplay(ttk.Frame):
             text_widget.insert(tk.END, "\n" + "-" * 50 + "\n\n")
 
             # Parcourir les projets de ce chef de projet
+            project_totals = summary.project_totals[pm]
             for project, entries in projects.items():
                 # Ne pas afficher les projets vides
                 if not entries or all(entry.workload == 0 for entry in entries):
                     continue
 
-                project_total = sum(entry.workload for entry in entries)
+                project_total = project_totals[project]
                 text_widget.insert(
                     tk.END, f"  Projet: {project} (Total: {project_total:.2f} heures)\n"
                 )
@@ -226,29 +214,6 @@ class ResultsDisplay(ttk.Frame):
 
         text_widget.config(state=tk.DISABLED)
 
-    def _calculate_profiles_workload_by_pm(
-        self, pm: str, projects: Dict[str, List[WorkloadEntry]]
-    ) -> List[Dict[str, Any]]:
-        """
-        Calcule la charge de travail par profil pour un chef de projet
-
-        :param pm: Nom du chef de projet
-        :param projects: Projets du chef de projet
-        :return: Liste des charges de travail par profil
-        """
-        profiles_workload = {}
-
-        for project, entries in projects.items():
-            for entry in entries:
-                if entry.profile not in profiles_workload:
-                    profiles_workload[entry.profile] = 0
-                profiles_workload[entry.profile] += entry.workload
-
-        return [
-            {"profile": profile, "total_workload": workload}
-            for profile, workload in profiles_workload.items()
-        ]
-
     def _has_non_empty_projects(self, projects: Dict[str, List[WorkloadEntry]]) -> bool:
         """
         Vérifie s'il y a des projets non vides
@@ -267,14 +232,14 @@ class ResultsDisplay(ttk.Frame):
 
         :return: True s'il y a des résultats, False sinon
         """
-        return bool(self._profiles_workload) and bool(self._detailed_workload)
+        return bool(self._summary.profiles_workload) and bool(
+            self._summary.detailed_workload
+        )
 
-    def get_results(
-        self,
-    ) -> Tuple[List[ProfileWorkload], Dict[str, Dict[str, List[WorkloadEntry]]]]:
+    def get_results(self) -> WorkloadSummary:
         """
         Récupère les résultats actuels
 
-        :return: Tuple contenant les résultats globaux et détaillés
+        :return: Résultats d'analyse complets, sous-totaux compris
         """
-        return self._profiles_workload, self._detailed_workload
+        return self._summary
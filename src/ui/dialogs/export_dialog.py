@@ -20,7 +20,7 @@ class ExportDialog(tk.Toplevel):
 
         # Configuration de la fenêtre
         self.title("Exporter les résultats")
-        self.geometry("400x250")
+        self.geometry("400x330")
         self.resizable(False, False)
 
         # Variable pour stocker la configuration
@@ -54,6 +54,9 @@ class ExportDialog(tk.Toplevel):
             ("Texte (.txt)", "txt"),
             ("Excel (.xlsx)", "xlsx"),
             ("PDF (.pdf)", "pdf"),
+            ("Parquet (.parquet)", "parquet"),
+            ("Feather / Arrow (.feather)", "feather"),
+            ("JSON Lines (.jsonl)", "jsonl"),
         ]
 
         for text, value in formats:
@@ -103,6 +106,15 @@ class ExportDialog(tk.Toplevel):
             "txt": [("Fichiers texte", "*.txt"), ("Tous les fichiers", "*.*")],
             "xlsx": [("Fichiers Excel", "*.xlsx"), ("Tous les fichiers", "*.*")],
             "pdf": [("Fichiers PDF", "*.pdf"), ("Tous les fichiers", "*.*")],
+            "parquet": [
+                ("Fichiers Parquet", "*.parquet"),
+                ("Tous les fichiers", "*.*"),
+            ],
+            "feather": [
+                ("Fichiers Feather", "*.feather"),
+                ("Tous les fichiers", "*.*"),
+            ],
+            "jsonl": [("Fichiers JSON Lines", "*.jsonl"), ("Tous les fichiers", "*.*")],
         }
 
         # Boîte de dialogue de sauvegarde
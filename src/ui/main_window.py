@@ -1,6 +1,7 @@
-﻿import tkinter as tk
+﻿import dataclasses
+import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-from typing import List, Optional
+from typing import Any, Callable, List, Optional, Tuple
 
 from src.constants import (
     APP_TITLE,
@@ -11,9 +12,12 @@ from src.constants import (
     DEFAULT_START_ROW,
     DEFAULT_END_ROW,
     EXPORT_FORMATS,
+    CACHE_DIR,
+    CACHE_MAX_BYTES,
 )
 from src.data.data_models import AnalysisConfiguration, ExportConfiguration
 from src.data.excel_reader import ExcelReader
+from src.data.workbook_cache import WorkbookCache
 from src.data.repository import WorkloadRepository
 from src.core.analyzer import WorkloadAnalyzer
 from src.services.export_service import ExportService
@@ -21,6 +25,7 @@ from src.ui.components.file_selector import FileSelector
 from src.ui.components.profile_manager import ProfileManager
 from src.ui.components.results_display import ResultsDisplay
 from src.ui.dialogs.export_dialog import ExportDialog
+from src.ui.background_job import BackgroundJob, BackgroundJobRunner
 
 
 class ExcelProfileAnalyzerApp:
@@ -41,6 +46,9 @@ class ExcelProfileAnalyzerApp:
         self.workload_repository: Optional[WorkloadRepository] = None
         self.workload_analyzer: Optional[WorkloadAnalyzer] = None
         self.export_service: ExportService = ExportService()
+        self.workbook_cache: Optional[WorkbookCache] = self._create_workbook_cache()
+        # Chargements et calculs, exécutés hors du thread Tk
+        self.job_runner = BackgroundJobRunner(self.root)
 
         # Configuration par défaut
         self.config = AnalysisConfiguration(
@@ -54,6 +62,17 @@ class ExcelProfileAnalyzerApp:
         # Création des composants
         self._create_main_layout()
 
+    def _create_workbook_cache(self) -> Optional[WorkbookCache]:
+        """
+        Crée le cache disque des classeurs analysés
+
+        :return: Cache, ou None si le répertoire n'est pas accessible
+        """
+        try:
+            return WorkbookCache(CACHE_DIR, max_bytes=CACHE_MAX_BYTES)
+        except OSError:
+            return None
+
     def _create_main_layout(self):
         """
         Crée la disposition principale de l'interface
@@ -89,6 +108,7 @@ class ExcelProfileAnalyzerApp:
             command=self._calculate_workload,
         )
         calculate_button.pack(side=tk.LEFT, padx=5)
+        self.calculate_button = calculate_button
 
         # Bouton d'exportation
         export_button = ttk.Button(
@@ -100,6 +120,26 @@ class ExcelProfileAnalyzerApp:
         export_button.pack(side=tk.LEFT, padx=5)
         self.export_button = export_button
 
+        # Progression de l'analyse en cours
+        progress_frame = ttk.Frame(main_frame)
+        progress_frame.pack(fill=tk.X)
+
+        self.progress_bar = ttk.Progressbar(
+            progress_frame, mode="determinate", maximum=100
+        )
+        self.progress_bar.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
+
+        self.progress_label = ttk.Label(progress_frame, text="", width=30)
+        self.progress_label.pack(side=tk.LEFT, padx=5)
+
+        self.cancel_button = ttk.Button(
+            progress_frame,
+            text="Annuler",
+            command=self._cancel_job,
+            state=tk.DISABLED,
+        )
+        self.cancel_button.pack(side=tk.RIGHT, padx=5)
+
     def _create_range_configuration_frame(self, parent):
         """
         Crée le frame de configuration des plages de colonnes et lignes
@@ -141,34 +181,65 @@ class ExcelProfileAnalyzerApp:
         self.start_row_entry.grid(row=1, column=3, padx=5, pady=5, sticky=tk.W)
         self.start_row_entry.insert(0, str(DEFAULT_START_ROW))
 
-        # Ligne de fin
-        ttk.Label(range_frame, text="Dernière ligne:").grid(
+        # Ligne de fin (vide : détection automatique de la dernière ligne de données)
+        ttk.Label(range_frame, text="Dernière ligne (vide = auto):").grid(
             row=2, column=0, padx=5, pady=5, sticky=tk.W
         )
         self.end_row_entry = ttk.Entry(range_frame, width=5)
         self.end_row_entry.grid(row=2, column=1, padx=5, pady=5, sticky=tk.W)
-        self.end_row_entry.insert(0, str(DEFAULT_END_ROW))
+        if DEFAULT_END_ROW is not None:
+            self.end_row_entry.insert(0, str(DEFAULT_END_ROW))
 
         return range_frame
 
+    def _read_end_row(self) -> Optional[int]:
+        """
+        Lit la dernière ligne saisie
+
+        :return: Numéro de ligne, ou None pour la détection automatique
+        """
+        end_row = self.end_row_entry.get().strip()
+        return int(end_row) if end_row else None
+
     def _on_file_selected(self, file_path: str):
         """
         Gère la sélection d'un fichier Excel
 
+        Le classeur est chargé et ses profils extraits sur un thread de
+        travail ; un chargement ou un calcul en cours est annulé.
+
         :param file_path: Chemin du fichier sélectionné
         """
         try:
-            # Charger le fichier Excel
-            self.file_path = file_path
-            self.excel_reader = ExcelReader(file_path)
-
-            # Extraire les profils automatiquement
             self.config.profile_column = self.profile_col_entry.get().strip().upper()
             self.config.start_row = int(self.start_row_entry.get())
-            self.config.end_row = int(self.end_row_entry.get())
+            self.config.end_row = self._read_end_row()
+        except ValueError as e:
+            messagebox.showerror(
+                "Erreur", f"Impossible de charger le fichier: {str(e)}"
+            )
+            return
+
+        # Le thread de travail lit un instantané de la configuration
+        config = dataclasses.replace(self.config)
+        cache = self.workbook_cache
+
+        def load(job: BackgroundJob) -> Tuple[ExcelReader, List[str]]:
+            # Charger le fichier Excel
+            excel_reader = ExcelReader(file_path, cache=cache)
+            job.check_cancelled()
 
             # Extraire les profils uniques
-            unique_profiles = self.excel_reader.extract_unique_profiles(self.config)
+            excel_reader.progress_callback = job.report_progress
+            try:
+                return excel_reader, excel_reader.extract_unique_profiles(config)
+            finally:
+                excel_reader.progress_callback = None
+
+        def on_loaded(result: Tuple[ExcelReader, List[str]]):
+            excel_reader, unique_profiles = result
+            self.file_path = file_path
+            self.excel_reader = excel_reader
 
             # Mettre à jour le gestionnaire de profils
             self.profile_manager.set_available_profiles(unique_profiles)
@@ -179,12 +250,22 @@ class ExcelProfileAnalyzerApp:
 
             messagebox.showinfo("Succès", f"Fichier {file_path} chargé avec succès!")
 
-        except Exception as e:
+        def on_error(e: Exception):
             messagebox.showerror(
                 "Erreur", f"Impossible de charger le fichier: {str(e)}"
             )
             self.file_path = None
             self.excel_reader = None
+            self.workload_repository = None
+            self.workload_analyzer = None
+
+        # Le fichier précédent n'est plus utilisable pendant le chargement
+        self.file_path = None
+        self.excel_reader = None
+        self.workload_repository = None
+        self.workload_analyzer = None
+
+        self._start_job("Chargement du fichier", load, on_loaded, on_error)
 
     def _on_profiles_updated(self, selected_profiles: List[str]):
         """
@@ -196,7 +277,8 @@ class ExcelProfileAnalyzerApp:
 
     def _calculate_workload(self):
         """
-        Calcule la charge de travail selon la configuration actuelle
+        Calcule la charge de travail selon la configuration actuelle, sur un
+        thread de travail
         """
         if not self.excel_reader or not self.workload_analyzer:
             messagebox.showwarning(
@@ -210,27 +292,121 @@ class ExcelProfileAnalyzerApp:
             self.config.end_column = self.end_col_entry.get().strip().upper()
             self.config.profile_column = self.profile_col_entry.get().strip().upper()
             self.config.start_row = int(self.start_row_entry.get())
-            self.config.end_row = int(self.end_row_entry.get())
-
-            # Analyser la charge de travail
-            profiles_workload = self.workload_analyzer.analyze_global_workload(
-                self.config
-            )
-            detailed_workload = self.workload_analyzer.analyze_detailed_workload(
-                self.config
+            self.config.end_row = self._read_end_row()
+        except ValueError as e:
+            messagebox.showerror(
+                "Erreur", f"Erreur lors du calcul de la charge de travail: {str(e)}"
             )
+            return
 
+        config = dataclasses.replace(
+            self.config, selected_profiles=list(self.config.selected_profiles)
+        )
+        excel_reader = self.excel_reader
+        workload_analyzer = self.workload_analyzer
+
+        def calculate(job: BackgroundJob):
+            excel_reader.progress_callback = job.report_progress
+            try:
+                # Analyser la charge de travail (un changement de plage de
+                # colonnes est servi par les sommes cumulées, sans relire le
+                # classeur)
+                return workload_analyzer.rewindow(config)
+            finally:
+                excel_reader.progress_callback = None
+
+        def on_calculated(summary):
             # Afficher les résultats
-            self.results_display.display_results(profiles_workload, detailed_workload)
+            self.results_display.display_results(summary)
 
             # Activer le bouton d'exportation
             self.export_button.config(state=tk.NORMAL)
 
-        except Exception as e:
+        def on_error(e: Exception):
             messagebox.showerror(
                 "Erreur", f"Erreur lors du calcul de la charge de travail: {str(e)}"
             )
 
+        self._start_job(
+            "Calcul de la charge de travail", calculate, on_calculated, on_error
+        )
+
+    def _start_job(
+        self,
+        title: str,
+        work: Callable[[BackgroundJob], Any],
+        on_success: Callable[[Any], None],
+        on_error: Callable[[Exception], None],
+    ):
+        """
+        Démarre une tâche d'analyse en arrière-plan, en remplaçant la tâche
+        en cours, et affiche sa progression
+
+        Le calcul reste désactivé pendant la tâche : deux tâches ne lisent
+        jamais le même classeur en même temps.
+
+        :param title: Libellé affiché pendant la tâche
+        :param work: Travail exécuté sur le thread de travail
+        :param on_success: Appelé sur le thread Tk avec le résultat
+        :param on_error: Appelé sur le thread Tk avec l'exception levée
+        """
+
+        def finish():
+            self.progress_bar.stop()
+            self.progress_bar.config(mode="determinate", value=0)
+            self.progress_label.config(text="")
+            self.calculate_button.config(state=tk.NORMAL)
+            self.cancel_button.config(state=tk.DISABLED)
+
+        def succeeded(result: Any):
+            finish()
+            on_success(result)
+
+        def failed(e: Exception):
+            finish()
+            on_error(e)
+
+        def cancelled():
+            finish()
+            self.progress_label.config(text="Analyse annulée")
+
+        self.calculate_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progress_label.config(text=f"{title}...")
+        # Durée inconnue tant que le parcours des lignes n'a pas commencé
+        self.progress_bar.config(mode="indeterminate", value=0)
+        self.progress_bar.start()
+
+        self.job_runner.start(
+            work,
+            on_success=succeeded,
+            on_error=failed,
+            on_progress=self._on_job_progress,
+            on_cancelled=cancelled,
+        )
+
+    def _on_job_progress(self, done: int, total: Optional[int]):
+        """
+        Affiche la progression de la tâche en cours
+
+        :param done: Lignes parcourues
+        :param total: Nombre de lignes attendu (None s'il est inconnu)
+        """
+        if total:
+            self.progress_bar.stop()
+            self.progress_bar.config(
+                mode="determinate", value=min(100.0, 100.0 * done / total)
+            )
+        self.progress_label.config(text=f"{done} lignes lues")
+
+    def _cancel_job(self):
+        """
+        Annule la tâche en cours (effective au prochain point de contrôle)
+        """
+        self.job_runner.cancel()
+        self.cancel_button.config(state=tk.DISABLED)
+        self.progress_label.config(text="Annulation...")
+
     def _export_results(self):
         """
         Ouvre la boîte de dialogue d'exportation
@@ -246,14 +422,10 @@ class ExcelProfileAnalyzerApp:
         if export_config:
             try:
                 # Récupérer les résultats actuels
-                profiles_workload, detailed_workload = (
-                    self.results_display.get_results()
-                )
+                summary = self.results_display.get_results()
 
                 # Exporter les résultats
-                self.export_service.export(
-                    export_config, profiles_workload, detailed_workload
-                )
+                self.export_service.export(export_config, summary)
 
                 messagebox.showinfo(
                     "Succès",
@@ -4,17 +4,70 @@
 Module: file_utils
 Description: 
     Ce module fait partie du projet Analyseur de Charge de Travail.
-    [Ajouter une description spÃ©cifique du module ici]
+    Fonctions utilitaires sur les fichiers : empreinte (chemin, taille,
+    date de modification), hachage du contenu et noms de fichiers sûrs.
 
 CrÃ©Ã© le 29/04/2025
 """
 
 # Importations
+import hashlib
+import os
+import re
+from typing import Tuple
+
+# Taille des blocs lus lors du hachage du contenu
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Noms de périphériques réservés sous Windows, quelle que soit l'extension
+WINDOWS_RESERVED_NAMES = frozenset(
+    ["CON", "PRN", "AUX", "NUL"]
+    + [f"COM{i}" for i in range(1, 10)]
+    + [f"LPT{i}" for i in range(1, 10)]
+)
 
 
 # Code du module
+def file_fingerprint(file_path: str) -> Tuple[str, int, int]:
+    """
+    Calcule l'empreinte rapide d'un fichier
+
+    :param file_path: Chemin du fichier
+    :return: Tuple (chemin absolu, taille en octets, date de modification en ns)
+    """
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns
+
+
+def content_hash(file_path: str) -> str:
+    """
+    Calcule le hachage BLAKE2b du contenu d'un fichier, lu par blocs
+
+    :param file_path: Chemin du fichier
+    :return: Condensat hexadécimal
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def safe_file_name(name: str, default: str = "sans_nom") -> str:
+    """
+    Convertit un libellé (chef de projet...) en nom de fichier portable
 
+    Les caractères interdits sous Windows ou Unix, les caractères de
+    contrôle et les espaces sont remplacés par des soulignés ; un souligné
+    est ajouté aux noms réservés sous Windows (CON, NUL, COM1...).
 
-if __name__ == "__main__":
-    # Code d'exÃ©cution directe si nÃ©cessaire
-    pass
+    :param name: Libellé d'origine
+    :param default: Nom utilisé si le libellé ne contient aucun caractère utile
+    :return: Nom de fichier sans extension
+    """
+    cleaned = re.sub(r'[<>:"/\\|?*\x00-\x1f\s]+', "_", name).strip("._")
+    cleaned = cleaned[:100] or default
+    stem, dot, rest = cleaned.partition(".")
+    if stem.upper() in WINDOWS_RESERVED_NAMES:
+        cleaned = f"{stem}_{dot}{rest}"
+    return cleaned
@@ -0,0 +1,15 @@
+﻿"""
+Fixtures communes des tests : classeurs Gantt synthétiques
+"""
+
+import pytest
+
+from benchmarks.workbook_factory import generate_gantt_workbook
+
+
+@pytest.fixture
+def gantt_workbook(tmp_path):
+    """
+    Classeur Gantt synthétique de 300 lignes de données (lignes 3 à 302)
+    """
+    return generate_gantt_workbook(str(tmp_path / "gantt.xlsx"), rows=300)
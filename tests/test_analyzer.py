@@ -2,19 +2,98 @@
 # -*- coding: utf-8 -*-
 """
 Module: test_analyzer
-Description: 
+Description:
     Ce module fait partie du projet Analyseur de Charge de Travail.
-    [Ajouter une description spÃ©cifique du module ici]
+    Tests de WorkloadAnalyzer : cube de charge de travail mis en cache par
+    configuration.
 
-CrÃ©Ã© le 29/04/2025
+Créé le 29/04/2025
 """
 
 # Importations
+import pytest
+
+from src.core.analyzer import WorkloadAnalyzer
+from src.core.calculator import WorkloadCalculator
+from src.data.data_models import AnalysisConfiguration
+from src.data.excel_reader import ExcelReader
+from src.data.repository import WorkloadRepository
 
 
 # Code du module
+def _analyzer(file_path: str) -> WorkloadAnalyzer:
+    return WorkloadAnalyzer(WorkloadRepository(ExcelReader(file_path)))
+
+
+def test_cube_rebuilt_when_read_configuration_changes(gantt_workbook):
+    analyzer = _analyzer(gantt_workbook)
+
+    # Deux tables hebdomadaires de tailles différentes, puis de même taille
+    first = analyzer.calculate_workload_statistics(AnalysisConfiguration(start_row=3))
+    cube = analyzer.get_workload_cube(AnalysisConfiguration(start_row=3))
+    second = analyzer.calculate_workload_statistics(AnalysisConfiguration(start_row=10))
+    third = analyzer.calculate_workload_statistics(AnalysisConfiguration(start_row=11))
+
+    assert analyzer.get_workload_cube(AnalysisConfiguration(start_row=11)) is not cube
+    assert second["total_workload"] < first["total_workload"]
+    assert third["total_workload"] <= second["total_workload"]
+    assert second == _analyzer(gantt_workbook).calculate_workload_statistics(
+        AnalysisConfiguration(start_row=10)
+    )
+
+
+QUERY_CONFIGS = [
+    AnalysisConfiguration(start_column="G", end_column="P"),
+    AnalysisConfiguration(start_column="K", end_column="Z"),
+    AnalysisConfiguration(start_column="T", end_column="AD"),
+    AnalysisConfiguration(start_column="AA", end_column="AD"),
+    AnalysisConfiguration(selected_profiles=["DevOps", "PMO"]),
+    AnalysisConfiguration(start_column="H", end_column="S", selected_profiles=["CTO"]),
+    AnalysisConfiguration(start_column="G", end_column="M", min_workload=10),
+    AnalysisConfiguration(
+        start_column="I", end_column="Z", selected_profiles=["PMO"], min_workload=20
+    ),
+]
+
+
+def test_cube_built_once_for_windows_and_filters(gantt_workbook):
+    analyzer = _analyzer(gantt_workbook)
+    cube = analyzer.get_workload_cube(AnalysisConfiguration())
+
+    for config in QUERY_CONFIGS:
+        analyzer.calculate_workload_statistics(config)
+        analyzer.analyze_workload_distribution(config)
+        assert analyzer.get_workload_cube(config) is cube
+
+
+@pytest.mark.parametrize("config", QUERY_CONFIGS)
+def test_cube_queries_match_calculator(gantt_workbook, config):
+    analyzer = _analyzer(gantt_workbook)
+    table = analyzer.repository.get_workload_table(config)
+
+    assert analyzer.calculate_workload_statistics(
+        config
+    ) == WorkloadCalculator.calculate_workload_statistics(table)
+    assert analyzer.analyze_workload_distribution(
+        config
+    ) == WorkloadCalculator.analyze_workload_distribution(table)
+
 
+@pytest.mark.parametrize(
+    "config",
+    [
+        AnalysisConfiguration(start_column="G", end_column="P"),
+        AnalysisConfiguration(start_column="K", end_column="Z"),
+        # Plage débordant des données : colonnes complétées par des zéros
+        AnalysisConfiguration(start_column="T", end_column="AD"),
+        AnalysisConfiguration(
+            start_column="H", end_column="S", selected_profiles=["DevOps", "PMO"]
+        ),
+        AnalysisConfiguration(start_column="G", end_column="M", min_workload=10),
+    ],
+)
+def test_rewindow_matches_direct_read(gantt_workbook, config):
+    reader = ExcelReader(gantt_workbook)
+    expected = WorkloadRepository.build_summary(reader.read_workload_table(config))
 
-if __name__ == "__main__":
-    # Code d'exÃ©cution directe si nÃ©cessaire
-    pass
+    assert _analyzer(gantt_workbook).rewindow(config) == expected
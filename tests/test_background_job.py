@@ -0,0 +1,228 @@
+﻿#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module: test_background_job
+Description:
+    Ce module fait partie du projet Analyseur de Charge de Travail.
+    Tests de BackgroundJobRunner avec une racine Tk factice dont les
+    callbacks planifiés par after sont exécutés de façon synchrone.
+
+Créé le 29/04/2025
+"""
+
+# Importations
+import threading
+import time
+
+import pytest
+
+from benchmarks.workbook_factory import generate_gantt_workbook
+from src.data.data_models import AnalysisConfiguration
+from src.data.excel_reader import PROGRESS_INTERVAL, ExcelReader
+from src.ui.background_job import BackgroundJobRunner, JobCancelled
+
+# Code du module
+TIMEOUT = 5.0
+
+
+class FakeRoot:
+    """
+    Remplace la racine Tk : after mémorise les callbacks, pump les exécute
+    sur le thread du test
+    """
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, delay, callback):
+        self.pending.append(callback)
+
+    def run_pending(self):
+        callbacks, self.pending = self.pending, []
+        for callback in callbacks:
+            callback()
+
+    def pump(self, until=None):
+        """
+        Exécute les callbacks planifiés jusqu'à ce que la condition soit
+        remplie ou, sans condition, jusqu'à ce que plus rien ne soit planifié
+        """
+        deadline = time.monotonic() + TIMEOUT
+        while self.pending and not (until is not None and until()):
+            if time.monotonic() > deadline:
+                raise AssertionError("La tâche ne s'est pas terminée à temps")
+            self.run_pending()
+            time.sleep(0.001)
+
+
+class Recorder:
+    """
+    Enregistre les appels aux callbacks d'une tâche
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def callbacks(self):
+        return {
+            "on_success": lambda result: self.calls.append(("success", result)),
+            "on_error": lambda error: self.calls.append(("error", error)),
+            "on_progress": lambda done, total: self.calls.append(
+                ("progress", (done, total))
+            ),
+            "on_cancelled": lambda: self.calls.append(("cancelled", None)),
+        }
+
+
+@pytest.fixture
+def root():
+    return FakeRoot()
+
+
+@pytest.fixture
+def runner(root):
+    return BackgroundJobRunner(root, poll_interval=1)
+
+
+def _join(job):
+    """
+    Attend la fin du thread de travail d'une tâche
+    """
+    for thread in threading.enumerate():
+        if thread.name == f"analyse-{job.job_id}":
+            thread.join(TIMEOUT)
+
+
+def test_result_delivered_on_poll(root, runner):
+    recorder = Recorder()
+    runner.start(lambda job: 42, **recorder.callbacks())
+    assert runner.running
+
+    root.pump()
+
+    assert recorder.calls == [("success", 42)]
+    assert not runner.running
+    assert root.pending == []
+
+
+def test_error_delivered_on_poll(root, runner):
+    recorder = Recorder()
+    error = ValueError("Fichier illisible")
+
+    def work(job):
+        raise error
+
+    runner.start(work, **recorder.callbacks())
+    root.pump()
+
+    assert recorder.calls == [("error", error)]
+    assert not runner.running
+
+
+def test_stale_result_dropped(root, runner):
+    release = threading.Event()
+
+    def slow(job):
+        release.wait(TIMEOUT)
+        return "ancien"
+
+    first, second = Recorder(), Recorder()
+    first_job = runner.start(slow, **first.callbacks())
+    second_job = runner.start(lambda job: "nouveau", **second.callbacks())
+    assert first_job.cancelled and not second_job.cancelled
+
+    # Le premier thread termine après avoir été remplacé
+    release.set()
+    _join(first_job)
+    _join(second_job)
+    root.pump()
+
+    assert first.calls == []
+    assert second.calls == [("success", "nouveau")]
+    assert not runner.running
+
+
+def test_only_latest_progress_delivered(root, runner):
+    reported = threading.Event()
+    release = threading.Event()
+
+    def work(job):
+        for done in range(1, 4):
+            job.report_progress(done, 3)
+        reported.set()
+        release.wait(TIMEOUT)
+        return "fini"
+
+    recorder = Recorder()
+    runner.start(work, **recorder.callbacks())
+    assert reported.wait(TIMEOUT)
+    root.run_pending()
+    assert recorder.calls == [("progress", (3, 3))]
+
+    release.set()
+    root.pump()
+    assert recorder.calls == [("progress", (3, 3)), ("success", "fini")]
+
+
+def test_cancel_takes_effect_at_next_checkpoint(root, runner):
+    release = threading.Event()
+    finished = []
+
+    def work(job):
+        job.report_progress(1, 2)
+        release.wait(TIMEOUT)
+        job.report_progress(2, 2)
+        finished.append(True)
+        return "fini"
+
+    recorder = Recorder()
+    runner.start(work, **recorder.callbacks())
+    root.pump(until=lambda: recorder.calls)
+    assert recorder.calls == [("progress", (1, 2))]
+
+    runner.cancel()
+    release.set()
+    root.pump()
+
+    assert recorder.calls == [("progress", (1, 2)), ("cancelled", None)]
+    assert finished == []
+    assert not runner.running
+
+
+def test_cancel_interrupts_reader_through_progress_callback(tmp_path, root, runner):
+    path = generate_gantt_workbook(
+        str(tmp_path / "gantt.xlsx"), rows=2 * PROGRESS_INTERVAL + 500
+    )
+    config = AnalysisConfiguration()
+    release = threading.Event()
+    checkpoints = []
+    finished = []
+
+    def load(job):
+        excel_reader = ExcelReader(path)
+        release.wait(TIMEOUT)
+
+        def progress(done, total):
+            checkpoints.append(done)
+            job.report_progress(done, total)
+
+        excel_reader.progress_callback = progress
+        try:
+            profiles = excel_reader.extract_unique_profiles(config)
+        finally:
+            excel_reader.progress_callback = None
+        finished.append(True)
+        return profiles
+
+    recorder = Recorder()
+    job = runner.start(load, **recorder.callbacks())
+    runner.cancel()
+    release.set()
+    root.pump()
+
+    # Le parcours s'arrête au premier point de contrôle
+    assert checkpoints == [PROGRESS_INTERVAL]
+    assert finished == []
+    assert recorder.calls == [("cancelled", None)]
+    with pytest.raises(JobCancelled):
+        job.check_cancelled()
@@ -0,0 +1,76 @@
+﻿#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module: test_batch_analyzer
+Description:
+    Ce module fait partie du projet Analyseur de Charge de Travail.
+    Tests de analyze_many : analyse combinée de plusieurs classeurs.
+
+Créé le 29/04/2025
+"""
+
+# Importations
+from collections import defaultdict
+
+import pytest
+
+from benchmarks.workbook_factory import generate_gantt_workbook
+from src.core.batch_analyzer import analyze_many
+from src.data.data_models import AnalysisConfiguration
+from src.data.excel_reader import ExcelReader
+from src.data.repository import WorkloadRepository
+
+# Code du module
+CONFIG = AnalysisConfiguration(start_column="G", end_column="Z")
+
+
+@pytest.fixture
+def workbooks(tmp_path):
+    return [
+        generate_gantt_workbook(
+            str(tmp_path / f"gantt_{seed}.xlsx"), rows=80, seed=seed
+        )
+        for seed in range(3)
+    ]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_analyze_many_combines_workbooks(workbooks, max_workers):
+    result = analyze_many(workbooks, CONFIG, max_workers=max_workers)
+
+    expected_totals = defaultdict(float)
+    for path in workbooks:
+        table = WorkloadRepository(ExcelReader(path)).get_workload_table(CONFIG)
+        assert result.workload_by_file[path] == pytest.approx(table.workload.sum())
+        for profile, total in table.group_sum("profile").items():
+            expected_totals[profile] += total
+
+    assert result.errors == {}
+    assert {
+        profile.profile: profile.total_workload for profile in result.profiles_workload
+    } == pytest.approx(dict(expected_totals))
+    assert sum(
+        entry.workload
+        for projects in result.detailed_workload.values()
+        for entries in projects.values()
+        for entry in entries
+    ) == pytest.approx(sum(expected_totals.values()))
+
+
+def test_analyze_many_without_files():
+    result = analyze_many([], CONFIG)
+
+    assert result.profiles_workload == []
+    assert result.detailed_workload == {}
+    assert result.workload_by_file == {}
+    assert result.errors == {}
+
+
+def test_analyze_many_reports_missing_file(workbooks, tmp_path):
+    missing = str(tmp_path / "absent.xlsx")
+
+    result = analyze_many([workbooks[0], missing], CONFIG, max_workers=1)
+
+    assert list(result.errors) == [missing]
+    assert list(result.workload_by_file) == [workbooks[0]]
+    assert result.profiles_workload
@@ -0,0 +1,76 @@
+﻿#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module: test_calculator
+Description:
+    Ce module fait partie du projet Analyseur de Charge de Travail.
+    Tests de WorkloadCalculator : résultats vectorisés identiques à ceux de
+    l'implémentation historique par entrées, types compris.
+
+Créé le 29/04/2025
+"""
+
+# Importations
+import pytest
+
+from benchmarks.bench_calculator import reference_distribution, reference_statistics
+from src.core.calculator import WorkloadCalculator
+from src.data.data_models import AnalysisConfiguration
+from src.data.excel_reader import ExcelReader
+from src.data.repository import WorkloadRepository
+
+# Code du module
+CONFIG = AnalysisConfiguration(start_column="G", end_column="Z")
+
+CASES = [
+    (WorkloadCalculator.calculate_workload_statistics, reference_statistics),
+    (WorkloadCalculator.analyze_workload_distribution, reference_distribution),
+]
+
+
+def _assert_identical(actual, expected):
+    """
+    Compare deux résultats : mêmes clés dans le même ordre, mêmes valeurs et
+    mêmes types (int ou float)
+    """
+    assert list(actual) == list(expected)
+    for key, value in expected.items():
+        if isinstance(value, dict):
+            assert list(actual[key].items()) == list(value.items())
+            assert [type(v) for v in actual[key].values()] == [
+                type(v) for v in value.values()
+            ]
+        else:
+            assert actual[key] == value
+            assert type(actual[key]) is type(value), key
+
+
+@pytest.mark.parametrize("calculate, reference", CASES)
+def test_entries_match_reference(gantt_workbook, calculate, reference):
+    # Charges lues telles quelles : entières ou décimales selon les cellules
+    entries = ExcelReader(gantt_workbook).read_workload_entries(CONFIG)
+    assert {type(entry.workload) for entry in entries} == {int, float}
+
+    _assert_identical(calculate(entries), reference(entries))
+
+
+@pytest.mark.parametrize("calculate, reference", CASES)
+def test_table_matches_reference(gantt_workbook, calculate, reference):
+    table = WorkloadRepository(ExcelReader(gantt_workbook)).get_workload_table(CONFIG)
+    entries = table.to_entries()
+
+    _assert_identical(calculate(table), reference(entries))
+    _assert_identical(calculate(entries), reference(entries))
+
+
+@pytest.mark.parametrize("calculate, reference", CASES)
+def test_integer_workloads_keep_int_totals(gantt_workbook, calculate, reference):
+    entries = [
+        entry
+        for entry in ExcelReader(gantt_workbook).read_workload_entries(CONFIG)
+        if isinstance(entry.workload, int)
+    ]
+
+    result = calculate(entries)
+    _assert_identical(result, reference(entries))
+    assert type(result["total_workload"]) is int
@@ -0,0 +1,107 @@
+﻿#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module: test_capacity
+Description:
+    Ce module fait partie du projet Analyseur de Charge de Travail.
+    Tests de detect_overloads : demande hebdomadaire par profil comparée à la
+    capacité sur une petite table dont le résultat est connu.
+
+Créé le 29/04/2025
+"""
+
+# Importations
+import numpy as np
+import pytest
+
+from src.core.capacity import OverloadCell, detect_overloads
+from src.data.data_models import CapacityModel
+from src.data.workload_table import WorkloadTable
+
+# Code du module
+WEEKS = ["G", "H", "I"]
+
+TABLE = WorkloadTable.from_rows(
+    [
+        ("Chef 1", "Projet A", "Développeur", None, [10.0, 20.0, 5.0]),
+        ("Chef 1", "Projet B", "Développeur", "JIRA-1", [15.0, 25.0, 0.0]),
+        ("Chef 2", "Projet C", "Testeur", None, [5.0, 5.0, 5.0]),
+        ("Chef 2", "Projet A", "Designer", None, [8.0, 0.0, 0.0]),
+    ],
+    WEEKS,
+)
+
+# Pas d'entrée pour le profil Designer
+CAPACITY = CapacityModel(
+    profile_capacity={"Développeur": 30.0, "Testeur": 10.0},
+    week_overrides={("Testeur", "H"): 4.0},
+)
+
+
+def test_weekly_load_against_capacity():
+    report = detect_overloads(TABLE, CAPACITY)
+
+    assert report.profiles == ["Développeur", "Testeur", "Designer"]
+    assert report.weeks == WEEKS
+    np.testing.assert_array_equal(
+        report.demand, [[25.0, 45.0, 5.0], [5.0, 5.0, 5.0], [8.0, 0.0, 0.0]]
+    )
+    np.testing.assert_array_equal(
+        report.capacity,
+        [[30.0, 30.0, 30.0], [10.0, 4.0, 10.0], [np.nan, np.nan, np.nan]],
+    )
+    np.testing.assert_allclose(
+        report.utilisation,
+        [[25 / 30, 1.5, 5 / 30], [0.5, 1.25, 0.5], [np.nan, np.nan, np.nan]],
+    )
+
+    # Le profil sans capacité n'est jamais signalé en surcharge
+    assert report.overloads == [
+        OverloadCell(
+            profile="Développeur",
+            week="H",
+            demand=45.0,
+            capacity=30.0,
+            utilisation=1.5,
+            projects={"Projet B": 25.0, "Projet A": 20.0},
+        ),
+        OverloadCell(
+            profile="Testeur",
+            week="H",
+            demand=5.0,
+            capacity=4.0,
+            utilisation=1.25,
+            projects={"Projet C": 5.0},
+        ),
+    ]
+
+
+def test_default_capacity_applies_to_profiles_without_entry():
+    capacity = CapacityModel(
+        profile_capacity=CAPACITY.profile_capacity,
+        week_overrides=CAPACITY.week_overrides,
+        default_capacity=0.0,
+    )
+    report = detect_overloads(TABLE, capacity)
+
+    np.testing.assert_array_equal(report.capacity[2], [0.0, 0.0, 0.0])
+    # Demande sans capacité : utilisation infinie ; ni demande ni capacité : 0
+    np.testing.assert_array_equal(report.utilisation[2], [np.inf, 0.0, 0.0])
+    assert [(cell.profile, cell.week) for cell in report.overloads] == [
+        ("Développeur", "H"),
+        ("Testeur", "H"),
+        ("Designer", "G"),
+    ]
+    assert report.overloads[2].projects == {"Projet A": 8.0}
+
+
+def test_threshold():
+    report = detect_overloads(TABLE, CAPACITY, threshold=0.8)
+
+    assert [(cell.profile, cell.week) for cell in report.overloads] == [
+        ("Développeur", "G"),
+        ("Développeur", "H"),
+        ("Testeur", "H"),
+    ]
+    with pytest.raises(ValueError):
+        detect_overloads(TABLE, CAPACITY, threshold=0)
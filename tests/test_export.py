@@ -2,19 +2,80 @@
 # -*- coding: utf-8 -*-
 """
 Module: test_export
-Description: 
+Description:
     Ce module fait partie du projet Analyseur de Charge de Travail.
-    [Ajouter une description spÃ©cifique du module ici]
+    Tests de ExportService.export_many : plusieurs formats écrits à partir
+    d'une même préparation, erreurs rapportées format par format.
 
-CrÃ©Ã© le 29/04/2025
+Créé le 29/04/2025
 """
 
 # Importations
+import os
+
+import pytest
+
+from src.data.data_models import AnalysisConfiguration, ExportConfiguration
+from src.data.excel_reader import ExcelReader
+from src.data.repository import WorkloadRepository
+from src.services.export_service import ExportService
 
 
 # Code du module
+@pytest.fixture
+def summary(gantt_workbook):
+    repository = WorkloadRepository(ExcelReader(gantt_workbook))
+    return repository.get_workload_summary(AnalysisConfiguration())
+
+
+def _read(file_path: str) -> bytes:
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("max_workers", [None, 1])
+def test_export_many_matches_single_exports(summary, tmp_path, max_workers):
+    service = ExportService()
+    configs = [
+        ExportConfiguration("txt", str(tmp_path / "charge.txt")),
+        ExportConfiguration("jsonl", str(tmp_path / "charge.jsonl")),
+        ExportConfiguration("xlsx", str(tmp_path / "charge.xlsx")),
+    ]
+
+    results = service.export_many(configs, summary, max_workers=max_workers)
+
+    assert [result.export_format for result in results] == ["txt", "jsonl", "xlsx"]
+    for config, result in zip(configs, results):
+        assert result.error is None
+        assert result.file_path == config.file_path
+        assert result.size == os.path.getsize(config.file_path) > 0
+
+    service.export_txt(str(tmp_path / "seul.txt"), summary)
+    service.export_jsonl(str(tmp_path / "seul.jsonl"), summary)
+    assert _read(configs[0].file_path) == _read(str(tmp_path / "seul.txt"))
+    assert _read(configs[1].file_path) == _read(str(tmp_path / "seul.jsonl"))
+
+
+def test_export_many_reports_errors_per_format(summary, tmp_path):
+    configs = [
+        ExportConfiguration("csv", str(tmp_path / "charge.csv")),
+        ExportConfiguration("txt", str(tmp_path / "absent" / "charge.txt")),
+        ExportConfiguration("txt", None),
+        ExportConfiguration("txt", str(tmp_path / "charge.txt")),
+    ]
+
+    results = ExportService().export_many(configs, summary)
+
+    assert all(result.error for result in results[:3])
+    assert results[3].error is None
+    assert os.path.getsize(configs[3].file_path) == results[3].size > 0
+    assert not os.path.exists(configs[0].file_path)
 
 
-if __name__ == "__main__":
-    # Code d'exÃ©cution directe si nÃ©cessaire
-    pass
+def test_export_many_rejects_invalid_worker_count(summary, tmp_path):
+    with pytest.raises(ValueError):
+        ExportService().export_many(
+            [ExportConfiguration("txt", str(tmp_path / "charge.txt"))],
+            summary,
+            max_workers=0,
+        )
@@ -0,0 +1,55 @@
+﻿#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module: test_extractor
+Description:
+    Ce module fait partie du projet Analyseur de Charge de Travail.
+    Tests de WorkloadExtractor : filtres évalués sur des index construits
+    une seule fois.
+
+Créé le 16/10/2026
+"""
+
+# Importations
+from src.core import extractor as extractor_module
+from src.core.extractor import WorkloadExtractor
+from src.data.data_models import AnalysisConfiguration
+from src.data.excel_reader import ExcelReader
+
+
+# Code du module
+def test_filters_reuse_entry_index(gantt_workbook, monkeypatch):
+    builds = []
+    entry_index = extractor_module.EntryIndex
+
+    def counting_index(entries):
+        builds.append(len(entries))
+        return entry_index(entries)
+
+    monkeypatch.setattr(extractor_module, "EntryIndex", counting_index)
+    extractor = WorkloadExtractor(ExcelReader(gantt_workbook))
+    config = AnalysisConfiguration()
+
+    entries = extractor.extract_workload_entries(config)
+    devops = extractor.extract_workload_entries(config, {"profiles": ["DevOps"]})
+    heavy = extractor.extract_workload_entries(config, {"min_workload": 40})
+    assert len(builds) == 1
+
+    assert devops == [entry for entry in entries if entry.profile == "DevOps"]
+    assert heavy == [entry for entry in entries if entry.workload >= 40]
+
+    # Une autre liste est indexée une fois, puis son index est réutilisé
+    subset = entries[::2]
+    filters = {"profiles": ["DevOps", "PMO"], "max_workload": 30}
+    first = extractor._apply_filters(subset, filters)
+    second = extractor._apply_filters(subset, filters)
+    assert len(builds) == 2
+    assert (
+        first
+        == second
+        == [
+            entry
+            for entry in subset
+            if entry.profile in ("DevOps", "PMO") and entry.workload <= 30
+        ]
+    )
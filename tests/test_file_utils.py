@@ -0,0 +1,49 @@
+﻿#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module: test_file_utils
+Description:
+    Ce module fait partie du projet Analyseur de Charge de Travail.
+    Tests de safe_file_name : noms de fichiers portables construits à partir
+    des libellés.
+
+Créé le 29/04/2025
+"""
+
+# Importations
+import pytest
+
+from src.utils.file_utils import safe_file_name
+
+
+# Code du module
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("Jean Dupont", "Jean_Dupont"),
+        ('a<b>c:d"e/f\\g|h?i*j', "a_b_c_d_e_f_g_h_i_j"),
+        (" .Chef. ", "Chef"),
+        ("", "sans_nom"),
+        ("...", "sans_nom"),
+    ],
+)
+def test_safe_file_name_replaces_forbidden_characters(name, expected):
+    assert safe_file_name(name) == expected
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("CON", "CON_"),
+        ("nul", "nul_"),
+        ("Aux", "Aux_"),
+        ("COM1", "COM1_"),
+        ("lpt9", "lpt9_"),
+        ("PRN.rapport", "PRN_.rapport"),
+        ("CONSOLE", "CONSOLE"),
+        ("COM10", "COM10"),
+        ("LPT0", "LPT0"),
+    ],
+)
+def test_safe_file_name_avoids_windows_reserved_names(name, expected):
+    assert safe_file_name(name) == expected
@@ -0,0 +1,67 @@
+﻿#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module: test_native_excel_reader
+Description:
+    Ce module fait partie du projet Analyseur de Charge de Travail.
+    Tests du lecteur XML natif : mêmes feuilles, étendue, profils, entrées et
+    tables que le chemin openpyxl, sur des classeurs générés à chaînes en
+    ligne et à chaînes partagées, avec cellules vides et plages variées.
+
+Créé le 16/10/2026
+"""
+
+# Importations
+import pytest
+
+from benchmarks.workbook_factory import (
+    generate_gantt_workbook,
+    convert_to_shared_strings,
+)
+from src.data.data_models import AnalysisConfiguration
+from src.data.excel_reader import ExcelReader
+from src.data.native_excel_reader import NativeExcelReader
+
+CONFIGS = [
+    AnalysisConfiguration(),
+    AnalysisConfiguration(end_row=400),
+    AnalysisConfiguration(end_row=400, selected_profiles=["PMO", "DevOps"]),
+    AnalysisConfiguration(start_column="G", end_column="M", end_row=150),
+    AnalysisConfiguration(end_column="AD", end_row=500),
+    AnalysisConfiguration(min_workload=20),
+]
+
+
+# Code du module
+@pytest.fixture(params=[0, 1, 2], ids=lambda seed: f"seed{seed}")
+def workbook(request, tmp_path):
+    return generate_gantt_workbook(
+        str(tmp_path / "gantt.xlsx"), rows=300, seed=request.param
+    )
+
+
+@pytest.mark.parametrize("shared_strings", [False, True], ids=["inline", "shared"])
+def test_native_reader_matches_openpyxl(workbook, tmp_path, shared_strings):
+    if shared_strings:
+        workbook = convert_to_shared_strings(
+            workbook, str(tmp_path / "gantt_shared.xlsx")
+        )
+    expected = ExcelReader(workbook)
+    actual = NativeExcelReader(workbook)
+    try:
+        assert actual.get_sheet_names() == expected.get_sheet_names()
+        assert actual.detect_data_extent() == expected.detect_data_extent()
+
+        for config in CONFIGS:
+            assert sorted(actual.extract_unique_profiles(config)) == sorted(
+                expected.extract_unique_profiles(config)
+            )
+            assert actual.read_workload_entries(
+                config
+            ) == expected.read_workload_entries(config)
+            assert (
+                actual.read_workload_table(config).to_entries()
+                == expected.read_workload_table(config).to_entries()
+            )
+    finally:
+        actual.close()
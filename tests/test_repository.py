@@ -0,0 +1,82 @@
+﻿#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module: test_repository
+Description:
+    Ce module fait partie du projet Analyseur de Charge de Travail.
+    Tests de WorkloadRepository : tables dérivées de la table hebdomadaire
+    mise en cache, sans relire la feuille.
+
+Créé le 29/04/2025
+"""
+
+# Importations
+import numpy as np
+import pytest
+
+from src.core.analyzer import WorkloadAnalyzer
+from src.data.data_models import AnalysisConfiguration
+from src.data.excel_reader import ExcelReader
+from src.data.repository import WorkloadRepository
+
+
+# Code du module
+@pytest.fixture
+def counted_repository(gantt_workbook):
+    reader = ExcelReader(gantt_workbook)
+    reads = []
+    read_workload_table = reader.read_workload_table
+
+    def counting_read(config):
+        reads.append(config)
+        return read_workload_table(config)
+
+    reader.read_workload_table = counting_read
+    return WorkloadRepository(reader), reads
+
+
+@pytest.mark.parametrize(
+    "config, min_workload",
+    [
+        (AnalysisConfiguration(start_column="G", end_column="Z"), None),
+        (AnalysisConfiguration(start_column="J", end_column="AC"), None),
+        (AnalysisConfiguration(start_column="AA", end_column="AB"), None),
+        (AnalysisConfiguration(selected_profiles=["Designer", "CTO"]), None),
+        (AnalysisConfiguration(start_column="G", end_column="R", min_workload=15), 8),
+    ],
+)
+def test_table_matches_direct_read(gantt_workbook, config, min_workload):
+    repository = WorkloadRepository(ExcelReader(gantt_workbook))
+    table = repository.get_workload_table(config, min_workload)
+
+    direct_config = AnalysisConfiguration(**vars(config))
+    if min_workload is not None:
+        direct_config.min_workload = min_workload
+    expected = ExcelReader(gantt_workbook).read_workload_table(direct_config)
+
+    assert table.week_columns == expected.week_columns
+    np.testing.assert_array_equal(table.hours, expected.hours)
+    assert table.to_entries() == expected.to_entries()
+
+
+def test_overlapping_queries_read_sheet_once(counted_repository):
+    repository, reads = counted_repository
+    analyzer = WorkloadAnalyzer(repository)
+    config = AnalysisConfiguration(start_column="G", end_column="Z")
+
+    analyzer.analyze_global_workload(config)
+    analyzer.analyze_detailed_workload(config)
+    analyzer.calculate_total_workload(config)
+    analyzer.filter_workload_by_profiles(config, ["DevOps"])
+    analyzer.filter_workload_by_profiles(config, ["PMO", "CTO"])
+    repository.get_profiles_workload(config, min_workload=10)
+    analyzer.analyze_global_workload(
+        AnalysisConfiguration(start_column="K", end_column="T")
+    )
+    analyzer.rewindow(AnalysisConfiguration(start_column="H", end_column="M"))
+
+    assert len(reads) == 1
+
+    # Autre plage de lignes : nouvelle lecture
+    repository.get_workload_table(AnalysisConfiguration(start_row=10))
+    assert len(reads) == 2
@@ -0,0 +1,115 @@
+﻿#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module: test_snapshot_store
+Description:
+    Ce module fait partie du projet Analyseur de Charge de Travail.
+    Tests de l'historique d'instantanés : lignes enregistrées par
+    différences et changements ligne à ligne.
+
+Créé le 16/10/2026
+"""
+
+# Importations
+import pytest
+
+from src.data.snapshot_store import SnapshotStore
+from src.data.workload_table import WorkloadTable
+from src.services.comparison_service import ComparisonService
+
+WEEKS = ["G", "H", "I"]
+
+
+# Code du module
+def _table(rows):
+    return WorkloadTable.from_rows(rows, WEEKS)
+
+
+@pytest.fixture
+def store():
+    store = SnapshotStore(":memory:")
+    yield store
+    store.close()
+
+
+def test_row_changes_match_entry_diff(store):
+    previous = _table(
+        [
+            ("Alice", "Alpha", "DevOps", "PRJ-1", [4.0, 4.0, 0.0]),
+            ("Alice", "Alpha", "Designer", None, [2.0, 0.0, 0.0]),
+            ("Bob", "Beta", "PMO", None, [1.0, 1.0, 1.0]),
+        ]
+    )
+    current = _table(
+        [
+            # Heures déplacées d'une semaine à l'autre, total inchangé
+            ("Alice", "Alpha", "DevOps", "PRJ-1", [0.0, 4.0, 4.0]),
+            ("Alice", "Alpha", "Designer", None, [2.0, 3.0, 0.0]),
+            ("Bob", "Gamma", "PMO", None, [5.0, 0.0, 0.0]),
+        ]
+    )
+    store.add_snapshot(previous, "2026-10-05")
+    store.add_snapshot(current, "2026-10-12")
+
+    changes = store.get_row_changes()
+
+    assert changes == ComparisonService().diff_workload_entries(
+        previous.to_entries(), current.to_entries()
+    )
+    assert [row["profile"] for row in changes["modified"]] == ["Designer"]
+    assert [row["project"] for row in changes["added"]] == ["Gamma"]
+    assert [row["project"] for row in changes["removed"]] == ["Beta"]
+
+
+def _week(shift):
+    """
+    Version d'une semaine : la charge de quelques lignes varie, une ligne
+    disparaît et une autre apparaît selon le décalage
+    """
+    rows = []
+    for index in range(12):
+        if index == shift:
+            continue
+        hours = [float((index * 3 + shift * (index % 4 == 0)) % 7), 1.0, 0.0]
+        rows.append((f"PM {index % 3}", f"Projet {index}", "DevOps", None, hours))
+    rows.append(("PM 9", f"Nouveau {shift}", "PMO", None, [2.0, 0.0, 0.0]))
+    return _table(rows)
+
+
+def _assert_same_rows(table, expected):
+    assert sorted(
+        (entry.project_manager, entry.project, entry.profile, entry.workload)
+        for entry in table.to_entries()
+    ) == sorted(
+        (entry.project_manager, entry.project, entry.profile, entry.workload)
+        for entry in expected.to_entries()
+    )
+
+
+@pytest.mark.parametrize("rebase_interval", [1, 2, 8])
+def test_round_trip_with_out_of_order_inserts(rebase_interval):
+    store = SnapshotStore(":memory:", rebase_interval=rebase_interval)
+    weeks = {
+        f"2026-09-{day:02d}": _week(shift) for shift, day in enumerate(range(1, 29, 7))
+    }
+    insert_order = ["2026-09-08", "2026-09-22", "2026-09-01", "2026-09-15"]
+
+    ids = {}
+    for taken_at in insert_order:
+        ids[taken_at] = store.add_snapshot(weeks[taken_at], taken_at).snapshot_id
+
+    dates = sorted(weeks)
+    assert [snapshot.taken_at for snapshot in store.list_snapshots()] == dates
+    for taken_at in dates:
+        _assert_same_rows(store.get_table(ids[taken_at]), weeks[taken_at])
+
+    # Changements de chaque semaine par rapport à la semaine qui la précède
+    service = ComparisonService()
+    assert store.get_row_changes(ids[dates[0]]) is None
+    for previous, current in zip(dates, dates[1:]):
+        assert store.get_row_changes(ids[current]) == service.diff_workload_entries(
+            store.get_table(ids[previous]).to_entries(),
+            store.get_table(ids[current]).to_entries(),
+        )
+    assert store.get_row_changes() == store.get_row_changes(ids[dates[-1]])
+    store.close()
@@ -0,0 +1,89 @@
+﻿#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module: test_statistics_accumulator
+Description:
+    Ce module fait partie du projet Analyseur de Charge de Travail.
+    Tests de WorkloadStatisticsAccumulator : fusion de lots (Welford / Chan)
+    et médiane approchée par histogramme.
+
+Créé le 29/04/2025
+"""
+
+# Importations
+import random
+
+import numpy as np
+import pytest
+
+from src.core.statistics_accumulator import WorkloadStatisticsAccumulator
+from src.data.data_models import WorkloadEntry
+
+
+# Code du module
+def _entries(count: int, seed: int, scale: float = 40.0):
+    rng = random.Random(seed)
+    return [
+        WorkloadEntry(
+            project_manager=f"Chef de projet {rng.randrange(5)}",
+            project=f"Projet {rng.randrange(30)}",
+            profile="DevOps",
+            workload=rng.expovariate(1 / scale),
+        )
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize("split", [1, 137, 500, 999])
+def test_merged_partials_match_single_pass(split):
+    entries = _entries(1000, seed=split)
+    workloads = np.asarray([entry.workload for entry in entries])
+
+    single = WorkloadStatisticsAccumulator().push(entries)
+    merged = (
+        WorkloadStatisticsAccumulator()
+        .push_all(entries[i : min(i + 50, split)] for i in range(0, split, 50))
+        .merge(WorkloadStatisticsAccumulator().push(entries[split:]))
+    )
+
+    for accumulator in (single, merged):
+        assert accumulator.count == len(entries)
+        assert accumulator.mean == pytest.approx(workloads.mean(), rel=1e-12)
+        assert accumulator.variance == pytest.approx(workloads.var(), rel=1e-12)
+        assert accumulator.minimum == workloads.min()
+        assert accumulator.maximum == workloads.max()
+
+    assert merged.histogram == single.histogram
+    assert merged.workload_by_project == pytest.approx(single.workload_by_project)
+    assert merged.workload_by_project_manager == pytest.approx(
+        single.workload_by_project_manager
+    )
+    assert merged.result()["median_workload"] == single.result()["median_workload"]
+
+
+def test_merge_with_empty_accumulator():
+    entries = _entries(200, seed=1)
+    accumulator = WorkloadStatisticsAccumulator().push(entries)
+    expected = accumulator.result()
+
+    assert accumulator.merge(WorkloadStatisticsAccumulator()).result() == expected
+    assert WorkloadStatisticsAccumulator().merge(accumulator).result() == expected
+
+
+def test_merge_rejects_other_bucket_width():
+    with pytest.raises(ValueError):
+        WorkloadStatisticsAccumulator(0.5).merge(
+            WorkloadStatisticsAccumulator(1.0).push(_entries(10, seed=2))
+        )
+
+
+@pytest.mark.parametrize("bucket_width", [0.25, 0.5, 2.0, 10.0])
+@pytest.mark.parametrize("count", [1, 2, 3, 101, 1000])
+def test_median_within_one_bucket(bucket_width, count):
+    entries = _entries(count, seed=count)
+    exact = float(np.median([entry.workload for entry in entries]))
+
+    accumulator = WorkloadStatisticsAccumulator(bucket_width)
+    accumulator.push_all(entries[i : i + 64] for i in range(0, count, 64))
+
+    assert abs(accumulator.quantile(0.5) - exact) <= bucket_width
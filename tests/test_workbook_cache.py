@@ -0,0 +1,115 @@
+﻿#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module: test_workbook_cache
+Description:
+    Ce module fait partie du projet Analyseur de Charge de Travail.
+    Tests du cache disque des classeurs : invalidation par empreinte,
+    éviction LRU, entrées corrompues et échecs d'écriture.
+
+Créé le 29/04/2025
+"""
+
+# Importations
+import errno
+import logging
+import os
+
+import numpy as np
+import pytest
+
+from benchmarks.workbook_factory import generate_gantt_workbook
+from src.data.data_models import AnalysisConfiguration
+from src.data.excel_reader import ExcelReader
+from src.data.workbook_cache import WorkbookCache
+
+# Code du module
+CONFIG = AnalysisConfiguration(start_column="G", end_column="Z")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return WorkbookCache(str(tmp_path / "cache"))
+
+
+def _entries(reader: ExcelReader):
+    return reader.read_workload_table(CONFIG).to_entries()
+
+
+def test_hit_does_not_open_workbook(gantt_workbook, cache):
+    expected = _entries(ExcelReader(gantt_workbook, cache=cache))
+
+    reader = ExcelReader(gantt_workbook, cache=cache)
+    assert _entries(reader) == expected
+    assert reader._workbook is None
+
+
+def test_modified_workbook_invalidates_entries(gantt_workbook, cache):
+    reader = ExcelReader(gantt_workbook, cache=cache)
+    before = _entries(reader)
+    key = cache.make_key(gantt_workbook, "table", CONFIG)
+
+    # Date de modification seule : nouvelle clé
+    stat = os.stat(gantt_workbook)
+    os.utime(gantt_workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.make_key(gantt_workbook, "table", CONFIG) != key
+
+    # Contenu et taille modifiés : les données relues sont les nouvelles
+    generate_gantt_workbook(gantt_workbook, rows=120, seed=7)
+    assert reader.has_changed()
+    reader.reload()
+    after = _entries(reader)
+
+    assert after != before
+    assert after == _entries(ExcelReader(gantt_workbook))
+
+
+def test_least_recently_used_entries_evicted(cache):
+    arrays = {"values": np.arange(1000)}
+    for key in ("a", "b", "c"):
+        cache.store_arrays(key, arrays)
+    paths = {key: cache._entry_path(key) for key in ("a", "b", "c")}
+    for seconds, key in enumerate(("a", "b", "c"), start=1):
+        os.utime(paths[key], ns=(seconds * 10**9, seconds * 10**9))
+
+    # Un accès rend « a » récent ; la place de deux entrées seulement reste
+    assert cache.load_arrays("a") is not None
+    cache.max_bytes = 2 * os.path.getsize(paths["a"])
+    cache.store_arrays("d", arrays)
+
+    assert cache.load_arrays("b") is None
+    assert cache.load_arrays("c") is None
+    assert cache.load_arrays("a") is not None
+    assert cache.load_arrays("d") is not None
+
+
+def test_corrupt_entry_is_discarded(gantt_workbook, cache):
+    expected = _entries(ExcelReader(gantt_workbook, cache=cache))
+    path = cache._entry_path(cache.make_key(gantt_workbook, "table", CONFIG))
+    with open(path, "wb") as f:
+        f.write(b"PK\x03\x04 truncated")
+
+    assert _entries(ExcelReader(gantt_workbook, cache=cache)) == expected
+    # Entrée réécrite par la relecture
+    assert _entries(ExcelReader(gantt_workbook, cache=cache)) == expected
+    assert ExcelReader(gantt_workbook, cache=cache)._workbook is None
+
+
+def test_write_failure_does_not_fail_read(gantt_workbook, cache, monkeypatch, caplog):
+    def disk_full(key, arrays):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(cache, "store_arrays", disk_full)
+    reader = ExcelReader(gantt_workbook, cache=cache)
+
+    with caplog.at_level(logging.WARNING, logger="src.data.excel_reader"):
+        entries = _entries(reader)
+        profiles = reader.extract_unique_profiles(CONFIG)
+        extent = reader.detect_data_extent()
+
+    uncached = ExcelReader(gantt_workbook)
+    assert entries == _entries(uncached)
+    assert profiles == uncached.extract_unique_profiles(CONFIG)
+    assert extent == uncached.detect_data_extent()
+    assert "cache" in caplog.text
+    assert not os.listdir(cache.cache_dir)